@@ -16,6 +16,10 @@ import subprocess
 from dataclasses import dataclass
 from typing import Literal
 
+# oxipng is a hard dependency and is already loaded transitively via
+# optimizers.png, so a module-level import costs nothing at startup and saves
+# the per-probe sys.modules lookup inside _png_sample_bpp.
+import oxipng
 from PIL import Image
 
 from config import settings
@@ -36,6 +40,7 @@ from optimizers.router import optimize_image
 from optimizers.utils import clamp_quality
 from schemas import EstimateResponse, OptimizationConfig
 from utils.format_detect import ImageFormat, detect_format
+from utils.subprocess_runner import tool_available
 
 logger = logging.getLogger("pare.estimation")
 
@@ -126,8 +131,6 @@ def _png_fitted_bpp_inner(
     orig_size: int = 0,
 ) -> FittedBpp | FittedFallback:
     """Inner implementation — called by ``_png_fitted_bpp`` which wraps in try/except."""
-    import math
-
     import numpy as np
 
     # 1. Feature extraction (pass orig_size for input_bpp)
@@ -613,6 +616,11 @@ if settings.enable_jxl:  # pragma: no cover
 
 SAMPLE_MAX_WIDTH = 800  # BMP/TIFF need 800px+ to capture full-resolution redundancy
 _PNG_SAMPLE_TIMEOUT = 10  # seconds — pngquant subprocess timeout for sample encoding
+
+# Module-local seam for the pngquant probe: tests stub this name instead of
+# patching the global subprocess.run, which would leak into every other caller
+# in the process (and is slower to patch than a plain module attribute).
+_run_subprocess = subprocess.run
 JPEG_SAMPLE_MAX_WIDTH = 1200  # JPEG needs larger samples for accurate BPP scaling
 LOSSY_SAMPLE_MAX_WIDTH = 800  # HEIC/AVIF/JXL also need larger samples
 EXACT_PIXEL_THRESHOLD = 150_000  # ~390x390 pixels
@@ -1215,8 +1223,6 @@ def _png_sample_bpp(
     decision must reflect the original image's pixel count so estimation matches
     what the real optimizer will produce, not the sample's much-smaller area.
     """
-    import oxipng
-
     sample = img.resize((sample_width, sample_height), Image.LANCZOS)
 
     # Lossy path: quantize to palette using actual pngquant (matching the optimizer)
@@ -1231,30 +1237,37 @@ def _png_sample_bpp(
         sample.save(buf, format="PNG", compress_level=6)
         png_data = buf.getvalue()
 
-        # Use actual pngquant for accurate palette quantization
-        # Sync intentionally — this helper runs inside asyncio.to_thread (see _bpp_to_estimate)
-        try:
-            proc = subprocess.run(
-                [
-                    "pngquant",
-                    str(max_colors),
-                    "--quality",
-                    f"1-{config.quality}",
-                    "--speed",
-                    str(speed),
-                    "-",
-                    "--output",
-                    "-",
-                ],
-                input=png_data,
-                capture_output=True,
-                timeout=_PNG_SAMPLE_TIMEOUT,
-            )
-            if proc.returncode == 0 and proc.stdout:
-                png_data = proc.stdout
-            # exit code 99 = quality threshold not met; keep original png_data
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            # pngquant not available — fall back to Pillow quantize
+        # Use actual pngquant for accurate palette quantization.
+        # Sync intentionally — this helper runs inside asyncio.to_thread (see _bpp_to_estimate).
+        # tool_available() jumps straight to the Pillow fallback when pngquant is not
+        # installed: one cached PATH lookup per process instead of a failed spawn per probe.
+        pngquant_ran = False
+        if tool_available("pngquant"):
+            try:
+                proc = _run_subprocess(
+                    [
+                        "pngquant",
+                        str(max_colors),
+                        "--quality",
+                        f"1-{config.quality}",
+                        "--speed",
+                        str(speed),
+                        "-",
+                        "--output",
+                        "-",
+                    ],
+                    input=png_data,
+                    capture_output=True,
+                    timeout=_PNG_SAMPLE_TIMEOUT,
+                )
+                if proc.returncode == 0 and proc.stdout:
+                    png_data = proc.stdout
+                # exit code 99 = quality threshold not met; keep original png_data
+                pngquant_ran = True
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pngquant_ran = False
+        if not pngquant_ran:
+            # pngquant unavailable (or timed out) — fall back to Pillow quantize
             if sample.mode == "RGBA":
                 quantized = sample.quantize(max_colors)
             elif sample.mode != "P":
@@ -8,7 +8,7 @@ from optimizers.base import BaseOptimizer
 from optimizers.utils import binary_search_quality
 from schemas import OptimizationConfig, OptimizeResult
 from utils.format_detect import ImageFormat
-from utils.subprocess_runner import run_tool
+from utils.subprocess_runner import run_tool, tool_available
 
 
 class JpegOptimizer(BaseOptimizer):
@@ -146,8 +146,12 @@ class JpegOptimizer(BaseOptimizer):
         """Run jpegtran for lossless Huffman table optimization.
 
         Returns original data if jpegtran is not installed, so the Pillow
-        path always wins the "pick smallest" comparison.
+        path always wins the "pick smallest" comparison. The availability
+        check is cached, so a missing binary costs one PATH lookup per
+        process instead of a failed fork/exec per request.
         """
+        if not tool_available("jpegtran"):
+            return data
         cmd = ["jpegtran", "-optimize", "-copy", "none"]
         if progressive:
             cmd.append("-progressive")
@@ -192,7 +196,12 @@ class JpegOptimizer(BaseOptimizer):
         original: bytes,
         config: OptimizationConfig,
     ) -> bytes:
-        """Binary search cjpeg quality to cap lossy reduction at max_reduction."""
+        """Search cjpeg quality to cap lossy reduction at max_reduction.
+
+        Mirrors binary_search_quality in optimizers/utils.py: a secant step
+        from the two endpoint probes narrows the range before the binary
+        loop, saving cjpeg invocations.
+        """
         target = config.max_reduction
         orig_size = len(original)
 
@@ -204,6 +213,21 @@ class JpegOptimizer(BaseOptimizer):
         lo, hi = config.quality, 100
         best_out = out_100
 
+        if hi - lo > 1:
+            out_lo = await self._run_cjpeg(bmp_data, lo, config.progressive_jpeg)
+            red_lo = (1 - len(out_lo) / orig_size) * 100
+            if red_lo <= target:
+                return out_lo  # Most aggressive quality already within cap
+            guess = lo + (red_lo - target) * (hi - lo) / (red_lo - red_100)
+            guess = min(hi - 1, max(lo + 1, round(guess)))
+            out_guess = await self._run_cjpeg(bmp_data, guess, config.progressive_jpeg)
+            red_guess = (1 - len(out_guess) / orig_size) * 100
+            if red_guess > target:
+                lo = guess
+            else:
+                hi = guess
+                best_out = out_guess
+
         for _ in range(5):
             if hi - lo <= 1:
                 break
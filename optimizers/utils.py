@@ -27,11 +27,14 @@ def binary_search_quality(
     hi: int,
     max_iters: int = 5,
 ) -> bytes | None:
-    """Binary search for the lowest quality whose output stays within a reduction cap.
+    """Find the lowest quality whose output stays within a reduction cap.
 
     Used by JPEG and WebP optimizers to enforce max_reduction. The search
     finds the lowest quality (= most compression) that doesn't exceed the
-    target reduction percentage.
+    target reduction percentage. Output size is roughly monotone in quality,
+    so a secant step from the two endpoint probes usually lands within a
+    step or two of the crossover; the binary-search loop then only has to
+    polish a narrow range, saving encode calls.
 
     Args:
         encode_fn: Callable(quality: int) -> bytes. Format-specific encoder.
@@ -51,6 +54,22 @@ def binary_search_quality(
 
     best_out = out_hi
 
+    if hi - lo > 1:
+        out_lo = encode_fn(lo)
+        red_lo = (1 - len(out_lo) / original_size) * 100
+        if red_lo <= target_reduction:
+            return out_lo  # Most aggressive quality already within cap
+        # red_lo > target >= red_hi, so the denominator is strictly positive
+        guess = lo + (red_lo - target_reduction) * (hi - lo) / (red_lo - red_hi)
+        guess = min(hi - 1, max(lo + 1, round(guess)))
+        out_guess = encode_fn(guess)
+        red_guess = (1 - len(out_guess) / original_size) * 100
+        if red_guess > target_reduction:
+            lo = guess
+        else:
+            hi = guess
+            best_out = out_guess
+
     for _ in range(max_iters):
         if hi - lo <= 1:
             break
@@ -0,0 +1,18 @@
+"""Cached OptimizationConfig factory shared across test modules.
+
+OptimizationConfig is a validated pydantic model that nothing in the pipeline
+mutates, so each distinct kwarg combination only needs to be constructed (and
+validated) once for the whole suite. Under pytest-xdist the cache is populated
+once per worker at import time; callers must treat the returned instances as
+immutable — a mutation would leak into every later test sharing that config.
+"""
+
+from functools import lru_cache
+
+from schemas import OptimizationConfig
+
+
+@lru_cache(maxsize=None)
+def cfg(**kw) -> OptimizationConfig:
+    """Return a shared OptimizationConfig for the given keyword arguments."""
+    return OptimizationConfig(**kw)
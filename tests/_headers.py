@@ -0,0 +1,36 @@
+"""Shared parsed-header prototypes for estimator tests.
+
+JpegHeader and PngHeader are frozen slots dataclasses. Instead of spelling out
+every field at each construction site, tests clone a prebuilt prototype via
+``dataclasses.replace`` and override only the fields under test — one base
+object per format, built once at import.
+"""
+
+from dataclasses import replace
+
+from estimation.jpeg_header import JpegHeader
+from estimation.png_header import PngHeader
+
+_BASE_JPEG_HEADER = JpegHeader(
+    width=800,
+    height=600,
+    components=3,
+    bit_depth=8,
+    subsampling="4:2:0",
+    progressive=False,
+    dqt_luma=[16] * 64,
+    dqt_chroma=[17] * 64,
+    app14_color_transform=None,
+    fallback_reason=None,
+)
+_BASE_PNG_HEADER = PngHeader(
+    width=800, height=600, bit_depth=8, color_type=2, has_alpha=False, is_palette=False
+)
+
+
+def jpeg_header(**kw) -> JpegHeader:
+    return replace(_BASE_JPEG_HEADER, **kw)
+
+
+def png_header(**kw) -> PngHeader:
+    return replace(_BASE_PNG_HEADER, **kw)
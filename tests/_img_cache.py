@@ -0,0 +1,21 @@
+"""Process-wide cache for Pillow-encoded test images.
+
+Encoding the same solid-color image over and over dominates the runtime of
+the format/estimation test modules. `encoded()` memoizes on the full
+(format, size, color, save-kwargs) tuple so each unique image is encoded
+exactly once per test session.
+"""
+
+import io
+from functools import lru_cache
+
+from PIL import Image
+
+
+@lru_cache(maxsize=64)
+def encoded(fmt: str, size: tuple[int, int] = (10, 10), color=(0, 0, 0), **save_kw) -> bytes:
+    """Return `fmt`-encoded bytes for a solid-color RGB image (cached)."""
+    img = Image.new("RGB", size, color)
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **save_kw)
+    return buf.getvalue()
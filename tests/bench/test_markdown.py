@@ -137,8 +137,8 @@ def test_rollup_median_and_worst():
     ]
     rollups = build_format_rollup(diffs)
     r = rollups[0]
-    assert r.median_delta_pct == pytest.approx(10.0)
-    assert r.worst_delta_pct == pytest.approx(15.0)
+    assert abs(r.median_delta_pct - 10.0) <= 1e-6
+    assert abs(r.worst_delta_pct - 15.0) <= 1e-6
 
 
 # ---------------------------------------------------------------------------
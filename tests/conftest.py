@@ -2,66 +2,75 @@ import io
 from pathlib import Path
 
 import pytest
-from fastapi.testclient import TestClient
-
-from main import app
 
 SAMPLE_DIR = Path(__file__).parent / "sample_images"
 
+# The FastAPI app (and the transitive optimizer/router/middleware imports it
+# drags in) is only loaded inside the client fixtures, so selective runs like
+# `pytest -k bmp` that never touch an endpoint skip the whole app import.
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def client():
     """FastAPI test client (does not raise server exceptions)."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
     return TestClient(app, raise_server_exceptions=False)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def strict_client():
     """FastAPI test client that raises server exceptions."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
     return TestClient(app, raise_server_exceptions=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_png():
     return (SAMPLE_DIR / "sample.png").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_jpeg():
     return (SAMPLE_DIR / "sample.jpg").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_webp():
     return (SAMPLE_DIR / "sample.webp").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_gif():
     return (SAMPLE_DIR / "sample.gif").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_svg():
     return (SAMPLE_DIR / "sample.svg").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def malicious_svg():
     return (SAMPLE_DIR / "malicious.svg").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_bmp():
     return (SAMPLE_DIR / "sample.bmp").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_tiff():
     return (SAMPLE_DIR / "sample.tiff").read_bytes()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tiny_png():
     return (SAMPLE_DIR / "tiny.png").read_bytes()
 
@@ -1,13 +1,15 @@
 """Tests for BMP optimizer quality tiers: lossless, palette, and RLE8."""
 
 import io
+from functools import lru_cache
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 from PIL import Image
 
 from optimizers.bmp import BmpOptimizer, _rle8_encode_row
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 
 @pytest.fixture
@@ -15,6 +17,7 @@ def bmp_optimizer():
     return BmpOptimizer()
 
 
+@lru_cache(maxsize=None)
 def _make_rgb_bmp(width=100, height=100, color=(0, 120, 215)):
     """Create a 24-bit RGB BMP."""
     img = Image.new("RGB", (width, height), color)
@@ -23,6 +26,7 @@ def _make_rgb_bmp(width=100, height=100, color=(0, 120, 215)):
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_rgba_bmp(width=100, height=100, color=(0, 120, 215, 255)):
     """Create a 32-bit RGBA BMP."""
     img = Image.new("RGBA", (width, height), color)
@@ -31,28 +35,23 @@ def _make_rgba_bmp(width=100, height=100, color=(0, 120, 215, 255)):
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_screenshot_bmp(width=100, height=100):
     """Create a BMP with large solid blocks (ideal for RLE8)."""
-    img = Image.new("RGB", (width, height), (0, 120, 215))
-    for x in range(width // 2, width):
-        for y in range(height):
-            img.putpixel((x, y), (255, 255, 255))
+    arr = np.full((height, width, 3), (0, 120, 215), dtype=np.uint8)
+    arr[:, width // 2 :] = (255, 255, 255)
+    img = Image.fromarray(arr, mode="RGB")
     buf = io.BytesIO()
     img.save(buf, format="BMP")
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_noisy_bmp(width=100, height=100):
     """Create a BMP with random pixel values (worst case for RLE8)."""
-    import random
-
-    random.seed(42)
-    img = Image.new("RGB", (width, height))
-    for x in range(width):
-        for y in range(height):
-            img.putpixel(
-                (x, y), (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
-            )
+    rng = np.random.default_rng(42)
+    arr = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    img = Image.fromarray(arr, mode="RGB")
     buf = io.BytesIO()
     img.save(buf, format="BMP")
     return buf.getvalue()
@@ -65,7 +64,7 @@ def _make_noisy_bmp(width=100, height=100):
 async def test_bmp_lossless_rgb_no_reduction(bmp_optimizer):
     """24-bit RGB BMP with many colors at quality>=70: no reduction."""
     data = _make_noisy_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=80))
+    result = await bmp_optimizer.optimize(data, cfg(quality=80))
     assert result.success
     assert result.optimized_size <= result.original_size
     assert result.method in ("none", "pillow-bmp")
@@ -75,7 +74,7 @@ async def test_bmp_lossless_rgb_no_reduction(bmp_optimizer):
 async def test_bmp_lossless_palette_solid(bmp_optimizer):
     """Solid-color BMP at quality>=70: lossless palette compression."""
     data = _make_rgb_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=80))
+    result = await bmp_optimizer.optimize(data, cfg(quality=80))
     assert result.success
     assert result.optimized_size < result.original_size
     assert result.method in ("bmp-palette-lossless", "bmp-rle8-lossless")
@@ -85,7 +84,7 @@ async def test_bmp_lossless_palette_solid(bmp_optimizer):
 async def test_bmp_lossless_rgba_downconvert(bmp_optimizer):
     """32-bit RGBA BMP at quality>=70: reduction via 32->24 bit or lossless palette."""
     data = _make_rgba_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=80))
+    result = await bmp_optimizer.optimize(data, cfg(quality=80))
     assert result.success
     assert result.optimized_size < result.original_size
     assert result.method in ("pillow-bmp", "bmp-palette-lossless", "bmp-rle8-lossless")
@@ -99,7 +98,7 @@ async def test_bmp_lossless_rgba_downconvert(bmp_optimizer):
 async def test_bmp_palette_quantization(bmp_optimizer):
     """quality 50-69: palette quantization gives ~66% reduction on many-color images."""
     data = _make_noisy_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=60))
+    result = await bmp_optimizer.optimize(data, cfg(quality=60))
     assert result.success
     assert result.method == "pillow-bmp-palette"
     assert result.reduction_percent > 50.0
@@ -109,7 +108,7 @@ async def test_bmp_palette_quantization(bmp_optimizer):
 async def test_bmp_palette_rgba(bmp_optimizer):
     """RGBA BMP at quality<70: palette or lossless palette beats 32->24 bit."""
     data = _make_rgba_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=60))
+    result = await bmp_optimizer.optimize(data, cfg(quality=60))
     assert result.success
     assert result.method in ("pillow-bmp-palette", "bmp-palette-lossless", "bmp-rle8-lossless")
     assert result.reduction_percent > 50.0
@@ -122,7 +121,7 @@ async def test_bmp_palette_rgba(bmp_optimizer):
 async def test_bmp_rle8_screenshot(bmp_optimizer):
     """quality<50 on screenshot: RLE8 gives huge savings."""
     data = _make_screenshot_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=30))
+    result = await bmp_optimizer.optimize(data, cfg(quality=30))
     assert result.success
     assert result.method in ("bmp-rle8", "bmp-rle8-lossless")
     assert result.reduction_percent > 80.0
@@ -132,7 +131,7 @@ async def test_bmp_rle8_screenshot(bmp_optimizer):
 async def test_bmp_rle8_noisy_falls_back_to_palette(bmp_optimizer):
     """quality<50 on noisy content: RLE8 is larger, palette wins."""
     data = _make_noisy_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=30))
+    result = await bmp_optimizer.optimize(data, cfg(quality=30))
     assert result.success
     # RLE8 inflates noisy data, so palette or palette should win
     assert result.method in ("pillow-bmp-palette", "bmp-rle8")
@@ -143,7 +142,7 @@ async def test_bmp_rle8_noisy_falls_back_to_palette(bmp_optimizer):
 async def test_bmp_rle8_decodes_correctly(bmp_optimizer):
     """RLE8 output is a valid BMP that Pillow can decode."""
     data = _make_screenshot_bmp()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=30))
+    result = await bmp_optimizer.optimize(data, cfg(quality=30))
     assert result.method in ("bmp-rle8", "bmp-rle8-lossless")
     # Verify Pillow can open and read the RLE8 BMP
     img = Image.open(io.BytesIO(result.optimized_bytes))
@@ -161,7 +160,7 @@ async def test_bmp_grayscale_mode(bmp_optimizer):
     buf = io.BytesIO()
     img.save(buf, format="BMP")
     data = buf.getvalue()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=60))
+    result = await bmp_optimizer.optimize(data, cfg(quality=60))
     assert result.success
 
 
@@ -173,7 +172,7 @@ async def test_bmp_already_palette_mode(bmp_optimizer):
     buf = io.BytesIO()
     img.save(buf, format="BMP")
     data = buf.getvalue()
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=60))
+    result = await bmp_optimizer.optimize(data, cfg(quality=60))
     assert result.success
 
 
@@ -185,7 +184,7 @@ async def test_bmp_rgba_non_opaque_alpha(bmp_optimizer):
     img.save(buf, format="BMP")
     data = buf.getvalue()
     # Should still process — convert to RGB for non-RGB modes
-    result = await bmp_optimizer.optimize(data, OptimizationConfig(quality=80))
+    result = await bmp_optimizer.optimize(data, cfg(quality=80))
     assert result.success
 
 
@@ -208,6 +207,11 @@ def test_quantize_to_palette_already_p():
 
 # --- _encode_rle8_bmp ---
 
+# RLE8 BMP geometry: 14-byte file header + 40-byte info header + 1024-byte
+# palette precede the pixel data; biCompression sits 16 bytes into the info header.
+_BMP_PIXEL_OFFSET = 14 + 40 + 1024
+_BMP_COMPRESSION_OFFSET = 14 + 16
+
 
 def test_encode_rle8_non_palette_returns_none():
     """Non-palette image returns None."""
@@ -217,14 +221,17 @@ def test_encode_rle8_non_palette_returns_none():
 
 def test_encode_rle8_valid_bmp_header():
     """RLE8 output has correct BMP header."""
+    import struct
+
     img = Image.new("RGB", (10, 10), (255, 0, 0)).quantize(colors=256)
     result = BmpOptimizer._encode_rle8_bmp(img)
     assert result is not None
     assert result[:2] == b"BM"
-    # BI_RLE8 compression = 1 at offset 30
-    import struct
-
-    compression = struct.unpack_from("<I", result, 30)[0]
+    # bfOffBits must point past the headers + palette
+    pixel_offset = struct.unpack_from("<I", result, 10)[0]
+    assert pixel_offset == _BMP_PIXEL_OFFSET
+    # biCompression = 1 (BI_RLE8)
+    compression = struct.unpack_from("<I", result, _BMP_COMPRESSION_OFFSET)[0]
     assert compression == 1
 
 
@@ -292,7 +299,7 @@ async def test_bmp_optimizer_rgba_opaque():
     data = buf.getvalue()
 
     with patch("optimizers.bmp.Image.open", return_value=img.copy()):
-        config = OptimizationConfig(quality=60)
+        config = cfg(quality=60)
         result = await opt.optimize(data, config)
         assert result.original_size == len(data)
 
@@ -308,7 +315,7 @@ async def test_bmp_optimizer_unusual_mode():
     data = buf.getvalue()
 
     with patch("optimizers.bmp.Image.open", return_value=img_i.copy()):
-        config = OptimizationConfig(quality=60)
+        config = cfg(quality=60)
         result = await opt.optimize(data, config)
         assert result.original_size == len(data)
 
@@ -21,6 +21,7 @@ Coverage targets (from fresh report):
 
 import io
 import subprocess
+from functools import lru_cache
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -34,13 +35,14 @@ from estimation.estimator import (
     _webp_sample_bpp,
     estimate,
 )
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_image(fmt: str, width: int, height: int, quality: int = 95, mode: str = "RGB") -> bytes:
     img = Image.new(mode, (width, height), color=(100, 150, 200) if mode == "RGB" else 128)
     buf = io.BytesIO()
@@ -53,6 +55,7 @@ def _make_image(fmt: str, width: int, height: int, quality: int = 95, mode: str
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_large_jpeg(width: int = 1000, height: int = 1000, quality: int = 95) -> bytes:
     """Return a JPEG that is >1MB so it takes the sample path."""
     import os
@@ -92,7 +95,7 @@ async def test_estimate_jxl_disabled_raises():
 
     with patch.object(settings, "enable_jxl", False):
         with pytest.raises(UnsupportedFormatError, match="JXL support is disabled"):
-            await estimate(jxl_data, OptimizationConfig(quality=60))
+            await estimate(jxl_data, cfg(quality=60))
 
 
 # ---------------------------------------------------------------------------
@@ -108,7 +111,7 @@ async def test_animated_webp_uses_exact_mode():
     frames[0].save(buf, format="WEBP", save_all=True, append_images=frames[1:], loop=0)
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=60))
+    result = await estimate(data, cfg(quality=60))
     assert result.original_format == "webp"
     assert result.confidence == "high"
     assert result.estimated_optimized_size <= result.original_size
@@ -142,7 +145,7 @@ async def test_bmp_estimate_already_optimized_propagated():
 
     # BMP goes through generic fallback → calls optimize_image on the sample
     with patch("estimation.estimator.optimize_image", return_value=mock_result):
-        result = await estimate(data, OptimizationConfig(quality=60))
+        result = await estimate(data, cfg(quality=60))
 
     assert result.estimated_reduction_percent == 0.0
     assert result.already_optimized is True
@@ -164,7 +167,7 @@ async def test_tiff_bpp_correction_applied():
     img.save(buf, format="TIFF", compression="raw")
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=80))
+    result = await estimate(data, cfg(quality=80))
     assert result.original_format == "tiff"
     # Correction reduces estimated BPP; result should be valid
     assert result.estimated_optimized_size <= result.original_size
@@ -179,7 +182,7 @@ async def test_tiff_bpp_correction_applied():
 def test_tiff_sample_bpp_lossy_path():
     """_tiff_sample_bpp includes tiff_jpeg candidate when quality < 70 and mode is RGB."""
     img = Image.new("RGB", (200, 200), color=(100, 150, 200))
-    config = OptimizationConfig(quality=60)  # < 70 → lossy branch
+    config = cfg(quality=60)  # < 70 → lossy branch
 
     bpp, method = _tiff_sample_bpp(img, 100, 100, config)
 
@@ -191,7 +194,7 @@ def test_tiff_sample_bpp_lossy_path():
 def test_tiff_sample_bpp_lossless_only_high_quality():
     """_tiff_sample_bpp uses only lossless methods when quality >= 70."""
     img = Image.new("RGB", (100, 100), color=(100, 150, 200))
-    config = OptimizationConfig(quality=80)  # >= 70 → lossless only
+    config = cfg(quality=80)  # >= 70 → lossless only
 
     bpp, method = _tiff_sample_bpp(img, 50, 50, config)
 
@@ -202,7 +205,7 @@ def test_tiff_sample_bpp_lossless_only_high_quality():
 def test_tiff_sample_bpp_l_mode_lossy():
     """_tiff_sample_bpp includes tiff_jpeg for grayscale (L mode) at low quality."""
     img = Image.new("L", (100, 100), color=128)
-    config = OptimizationConfig(quality=50)
+    config = cfg(quality=50)
 
     bpp, method = _tiff_sample_bpp(img, 50, 50, config)
 
@@ -213,7 +216,7 @@ def test_tiff_sample_bpp_l_mode_lossy():
 def test_tiff_sample_bpp_non_rgb_skips_jpeg():
     """_tiff_sample_bpp skips tiff_jpeg for palette mode (P)."""
     img = Image.new("P", (100, 100))
-    config = OptimizationConfig(quality=60)  # < 70 but mode not in (RGB, L)
+    config = cfg(quality=60)  # < 70 but mode not in (RGB, L)
 
     bpp, method = _tiff_sample_bpp(img, 50, 50, config)
 
@@ -230,7 +233,7 @@ def test_tiff_sample_bpp_empty_candidates_fallback():
     produce a valid result.
     """
     img = Image.new("RGB", (50, 50))
-    config = OptimizationConfig(quality=80)
+    config = cfg(quality=80)
 
     real_save = Image.Image.save
 
@@ -254,7 +257,7 @@ def test_tiff_sample_bpp_one_lossless_save_fails():
     tiff_adobe_deflate while tiff_lzw succeeds — the result should use tiff_lzw.
     """
     img = Image.new("RGB", (50, 50))
-    config = OptimizationConfig(quality=80)
+    config = cfg(quality=80)
 
     real_save = Image.Image.save
 
@@ -276,26 +279,22 @@ def test_tiff_sample_bpp_one_lossless_save_fails():
 # ---------------------------------------------------------------------------
 
 
-def test_webp_sample_bpp_high_quality_method4():
-    """_webp_sample_bpp uses method=4 when quality < 50 (HIGH preset)."""
-    img = Image.new("RGB", (200, 200), color=(100, 150, 200))
-    config = OptimizationConfig(quality=40)  # < 50 → method=4
-
-    bpp, method = _webp_sample_bpp(img, 100, 100, config)
-
-    assert bpp > 0
-    assert method == "pillow-m4"
-
-
-def test_webp_sample_bpp_medium_quality_method3():
-    """_webp_sample_bpp uses method=3 when quality >= 50 (MEDIUM/LOW preset)."""
+@pytest.mark.parametrize(
+    "quality,expected_method",
+    [
+        pytest.param(40, "pillow-m4", id="high-m4"),
+        pytest.param(60, "pillow-m3", id="medium-m3"),
+    ],
+)
+def test_webp_sample_bpp_method_by_quality(quality, expected_method):
+    """_webp_sample_bpp uses method=4 below quality 50 and method=3 at or above it."""
     img = Image.new("RGB", (200, 200), color=(100, 150, 200))
-    config = OptimizationConfig(quality=60)  # >= 50 → method=3
+    config = cfg(quality=quality)
 
     bpp, method = _webp_sample_bpp(img, 100, 100, config)
 
     assert bpp > 0
-    assert method == "pillow-m3"
+    assert method == expected_method
 
 
 def test_webp_sample_bpp_non_standard_mode_converted():
@@ -304,7 +303,7 @@ def test_webp_sample_bpp_non_standard_mode_converted():
     img = img.convert("RGB")  # simulate non-RGB by using a converted image
     # Actually test RGBA mode conversion path: CMYK not a valid webp mode
     img_la = Image.new("LA", (100, 100), (128, 255))
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     bpp, method = _webp_sample_bpp(img_la, 50, 50, config)
     assert bpp > 0
@@ -315,49 +314,56 @@ def test_webp_sample_bpp_non_standard_mode_converted():
 # ---------------------------------------------------------------------------
 
 
-def test_png_sample_bpp_pngquant_fallback_rgba():
-    """When pngquant raises FileNotFoundError, _png_sample_bpp falls back to
-    Pillow quantize. RGBA mode uses quantize() directly."""
-    img = Image.new("RGBA", (100, 100), (100, 150, 200, 255))
-    config = OptimizationConfig(quality=60, png_lossy=True)  # < 70 → pngquant path
-
-    with patch("subprocess.run", side_effect=FileNotFoundError("pngquant not found")):
-        bpp, method = _png_sample_bpp(img, 50, 50, config, 100, 100)
-
-    assert bpp > 0
-    assert method == "pngquant + oxipng"
-
+@pytest.mark.parametrize(
+    "mode,color,side_effect",
+    [
+        # RGBA mode uses quantize() directly
+        ("RGBA", (100, 150, 200, 255), FileNotFoundError("pngquant not found")),
+        # RGB mode → convert to RGB then quantize
+        ("RGB", (100, 150, 200), subprocess.TimeoutExpired(cmd=["pngquant"], timeout=10)),
+        # P (palette) mode → uses existing palette image directly
+        ("P", 0, FileNotFoundError("no pngquant")),
+    ],
+    ids=["rgba", "rgb", "palette"],
+)
+def test_png_sample_bpp_pngquant_fallback(monkeypatch, mode, color, side_effect):
+    """When pngquant fails (missing tool / timeout), _png_sample_bpp falls back
+    to Pillow quantize for every image mode."""
+    img = Image.new(mode, (100, 100), color)
+    config = cfg(quality=60, png_lossy=True)  # < 70 → pngquant path
 
-def test_png_sample_bpp_pngquant_fallback_rgb():
-    """pngquant TimeoutExpired fallback for RGB mode → convert to RGB then quantize."""
-    img = Image.new("RGB", (100, 100), (100, 150, 200))
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    def _fail(*_a, **_k):
+        raise side_effect
 
-    with patch(
-        "subprocess.run",
-        side_effect=subprocess.TimeoutExpired(cmd=["pngquant"], timeout=10),
-    ):
-        bpp, method = _png_sample_bpp(img, 50, 50, config, 100, 100)
+    # Pretend pngquant is on PATH so the mocked subprocess.run failure is reached
+    monkeypatch.setattr("estimation.estimator.tool_available", lambda _binary: True)
+    monkeypatch.setattr("estimation.estimator._run_subprocess", _fail)
+    bpp, method = _png_sample_bpp(img, 50, 50, config, 100, 100)
 
     assert bpp > 0
     assert method == "pngquant + oxipng"
 
 
-def test_png_sample_bpp_pngquant_fallback_palette_mode():
-    """pngquant fallback for P (palette) mode → uses existing palette image directly."""
-    img = Image.new("P", (100, 100))
-    config = OptimizationConfig(quality=60, png_lossy=True)
+# ---------------------------------------------------------------------------
+# PNG lossless photo-BPP cap (lines 674-684)
+# ---------------------------------------------------------------------------
 
-    with patch("subprocess.run", side_effect=FileNotFoundError("no pngquant")):
-        bpp, method = _png_sample_bpp(img, 50, 50, config, 100, 100)
 
-    assert bpp > 0
-    assert method == "pngquant + oxipng"
+@lru_cache(maxsize=2)
+def _noisy_png(width: int = 450, height: int = 350) -> bytes:
+    """Random-pixel PNG just above EXACT_PIXEL_THRESHOLD (high BPP, sample path).
 
+    Sized to the smallest image that still forces the sample path
+    (>150K pixels) so the encode cost stays low; cached so the lossless-cap
+    and lossy-no-cap tests share one encode.
+    """
+    import os
 
-# ---------------------------------------------------------------------------
-# PNG lossless photo-BPP cap (lines 674-684)
-# ---------------------------------------------------------------------------
+    raw = os.urandom(width * height * 3)
+    img = Image.frombytes("RGB", (width, height), raw)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=0)
+    return buf.getvalue()
 
 
 @pytest.mark.asyncio
@@ -367,21 +373,15 @@ async def test_png_lossless_photo_bpp_cap():
     The sample-resize smooths pixels, making oxipng look more effective than
     it really is on the full image. The cap prevents over-optimistic estimates.
     """
-    import os
-
     # Random pixel data → high BPP after PNG compression
-    raw = os.urandom(800 * 600 * 3)
-    img = Image.frombytes("RGB", (800, 600), raw)
-    buf = io.BytesIO()
-    img.save(buf, format="PNG", compress_level=0)
-    data = buf.getvalue()
+    data = _noisy_png()
 
     # Confirm high BPP
-    original_bpp = len(data) * 8 / (800 * 600)
+    original_bpp = len(data) * 8 / (450 * 350)
     assert original_bpp > 10.0, f"Expected high-BPP PNG for test, got {original_bpp:.2f}"
 
     # Lossless mode: png_lossy=False
-    result = await estimate(data, OptimizationConfig(quality=80, png_lossy=False))
+    result = await estimate(data, cfg(quality=80, png_lossy=False))
 
     assert result.original_format == "png"
     # The cap keeps reduction at or below 5%
@@ -394,16 +394,10 @@ async def test_png_lossless_photo_bpp_cap():
 @pytest.mark.asyncio
 async def test_png_lossy_photo_bpp_no_cap():
     """PNG in lossy mode with high BPP should NOT apply the 5% cap."""
-    import os
-
-    raw = os.urandom(800 * 600 * 3)
-    img = Image.frombytes("RGB", (800, 600), raw)
-    buf = io.BytesIO()
-    img.save(buf, format="PNG", compress_level=0)
-    data = buf.getvalue()
+    data = _noisy_png()
 
     # Lossy mode: png_lossy=True, quality < 70
-    result = await estimate(data, OptimizationConfig(quality=60, png_lossy=True))
+    result = await estimate(data, cfg(quality=60, png_lossy=True))
 
     assert result.original_format == "png"
     # Lossy pngquant should reduce more than the 5% lossless cap
@@ -446,7 +440,7 @@ def test_get_bit_depth_fallback_from_mode():
 def test_jpeg_sample_bpp_progressive():
     """_jpeg_sample_bpp enables progressive encoding when quality < 70."""
     img = Image.new("RGB", (200, 200), color=(100, 150, 200))
-    config = OptimizationConfig(quality=60)  # < 70 → progressive=True branch
+    config = cfg(quality=60)  # < 70 → progressive=True branch
 
     bpp, method = _jpeg_sample_bpp(img, 100, 100, config)
 
@@ -457,7 +451,7 @@ def test_jpeg_sample_bpp_progressive():
 def test_jpeg_sample_bpp_non_rgb_mode_converted():
     """_jpeg_sample_bpp converts non-RGB/L modes to RGB."""
     img = Image.new("RGBA", (100, 100), (100, 150, 200, 255))
-    config = OptimizationConfig(quality=80)
+    config = cfg(quality=80)
 
     bpp, method = _jpeg_sample_bpp(img, 50, 50, config)
 
@@ -470,6 +464,7 @@ def test_jpeg_sample_bpp_non_rgb_mode_converted():
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_large_webp_max_reduction_cap():
     """Large WebP (>1MB) estimate via direct-encode path respects max_reduction cap."""
@@ -493,7 +488,7 @@ async def test_large_webp_max_reduction_cap():
     if len(data) <= 1_000_000:
         pytest.skip("Cannot generate >1MB WebP in this environment")
 
-    capped = await estimate(data, OptimizationConfig(quality=40, max_reduction=10.0))
+    capped = await estimate(data, cfg(quality=40, max_reduction=10.0))
 
     assert capped.estimated_reduction_percent <= 10.0 + 0.01
 
@@ -536,7 +531,7 @@ def test_heic_sample_bpp_non_rgb_mode_converted():
     from estimation.estimator import _heic_sample_bpp
 
     img = Image.new("L", (100, 100), color=128)  # grayscale → not in (RGB, RGBA)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     bpp, method = _heic_sample_bpp(img, 50, 50, config)
 
@@ -550,7 +545,7 @@ def test_avif_sample_bpp_rgb_mode():
     from estimation.estimator import _avif_sample_bpp
 
     img = Image.new("RGB", (100, 100), color=(100, 150, 200))
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     bpp, method = _avif_sample_bpp(img, 50, 50, config)
 
@@ -564,7 +559,7 @@ def test_avif_sample_bpp_non_rgb_mode_converted():
     from estimation.estimator import _avif_sample_bpp
 
     img = Image.new("L", (100, 100), color=128)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     bpp, method = _avif_sample_bpp(img, 50, 50, config)
 
@@ -578,7 +573,7 @@ def test_jxl_sample_bpp_rgb_mode():
     from estimation.estimator import _jxl_sample_bpp
 
     img = Image.new("RGB", (100, 100), color=(100, 150, 200))
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     bpp, method = _jxl_sample_bpp(img, 50, 50, config)
 
@@ -593,7 +588,7 @@ def test_jxl_sample_bpp_non_standard_mode_converted():
 
     # Use a mode not in ("RGB", "RGBA", "L") — YCbCr is a good candidate
     img = Image.new("YCbCr", (100, 100))
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     bpp, method = _jxl_sample_bpp(img, 50, 50, config)
 
@@ -607,57 +602,28 @@ def test_jxl_sample_bpp_non_standard_mode_converted():
 # ---------------------------------------------------------------------------
 
 
-def test_create_sample_gif_non_palette_mode():
-    """_create_sample with GIF format and non-P mode → quantize(256) then save."""
-    from estimation.estimator import _create_sample
-    from utils.format_detect import ImageFormat
-
-    # RGB mode GIF → quantize branch (line 674-675)
-    img = Image.new("RGB", (100, 100), color=(100, 150, 200))
-    result = _create_sample(img, 50, 50, ImageFormat.GIF)
-
-    assert isinstance(result, bytes)
-    assert len(result) > 0
-
-
-def test_create_sample_gif_palette_mode():
-    """_create_sample with GIF format and P mode → save directly (no quantize)."""
-    from estimation.estimator import _create_sample
-    from utils.format_detect import ImageFormat
-
-    img = Image.new("P", (100, 100))
-    result = _create_sample(img, 50, 50, ImageFormat.GIF)
-
-    assert isinstance(result, bytes)
-    assert len(result) > 0
-
-
-def test_create_sample_bmp_non_standard_mode():
-    """_create_sample with BMP format and non-RGB/L/P mode → convert to RGB (line 681)."""
-    from estimation.estimator import _create_sample
-    from utils.format_detect import ImageFormat
-
-    # YCbCr is not in ("RGB", "L", "P") → convert to RGB branch
-    img = Image.new("YCbCr", (100, 100))
-    result = _create_sample(img, 50, 50, ImageFormat.BMP)
-
-    assert isinstance(result, bytes)
-    assert len(result) > 0
-
-
-def test_create_sample_unknown_format_falls_through():
-    """_create_sample with an unrecognized format falls through to PNG (line 684)."""
+@pytest.mark.parametrize(
+    "mode,fmt,expected_magic",
+    [
+        pytest.param("RGB", "gif", None, id="gif-quantize"),
+        pytest.param("P", "gif", None, id="gif-palette"),
+        pytest.param("YCbCr", "bmp", None, id="bmp-convert-rgb"),
+        # SVG is not GIF/TIFF/BMP -> falls through to the else branch (saves as PNG)
+        pytest.param("RGB", "svg", b"\x89PNG\r\n\x1a\n", id="unknown-falls-through-png"),
+    ],
+)
+def test_create_sample_mode_handling(mode, fmt, expected_magic):
+    """_create_sample converts modes per format and falls through to PNG otherwise."""
     from estimation.estimator import _create_sample
     from utils.format_detect import ImageFormat
 
-    # SVG is not GIF/TIFF/BMP → falls through to the else branch (saves as PNG)
-    img = Image.new("RGB", (50, 50), color=(100, 150, 200))
-    result = _create_sample(img, 25, 25, ImageFormat.SVG)
+    img = Image.new(mode, (100, 100))
+    result = _create_sample(img, 50, 50, ImageFormat(fmt))
 
     assert isinstance(result, bytes)
     assert len(result) > 0
-    # Output should be a PNG (magic bytes)
-    assert result[:8] == b"\x89PNG\r\n\x1a\n"
+    if expected_magic is not None:
+        assert result[:8] == expected_magic
 
 
 # ---------------------------------------------------------------------------
@@ -674,7 +640,7 @@ async def test_estimate_from_thumbnail_none_config():
     Image.new("RGB", (100, 80), color=(100, 150, 200)).save(buf, format="JPEG", quality=80)
     thumb_data = buf.getvalue()
 
-    # config=None → function creates OptimizationConfig() internally
+    # config=None → function creates cfg() internally
     result = await estimate_from_thumbnail(
         thumbnail_data=thumb_data,
         original_file_size=5_000_000,
@@ -693,7 +659,7 @@ async def test_estimate_from_thumbnail_already_optimized():
     """estimate_from_thumbnail when optimizer returns method='none' → returns 0% reduction
     with method='none' (line 719)."""
     from estimation.estimator import estimate_from_thumbnail
-    from schemas import OptimizationConfig, OptimizeResult
+    from schemas import OptimizeResult
 
     buf = io.BytesIO()
     Image.new("RGB", (100, 80)).save(buf, format="JPEG", quality=80)
@@ -715,7 +681,7 @@ async def test_estimate_from_thumbnail_already_optimized():
             original_file_size=5_000_000,
             original_width=1000,
             original_height=800,
-            config=OptimizationConfig(quality=80),
+            config=cfg(quality=80),
         )
 
     assert result.estimated_reduction_percent == 0.0
@@ -732,7 +698,7 @@ def test_tiff_sample_bpp_jpeg_compression_exception_logged():
     """_tiff_sample_bpp catches exception from tiff_jpeg save and falls back to lossless
     (lines 627-628)."""
     img = Image.new("RGB", (100, 100), color=(100, 150, 200))
-    config = OptimizationConfig(quality=60)  # < 70 → tries tiff_jpeg
+    config = cfg(quality=60)  # < 70 → tries tiff_jpeg
 
     real_save = Image.Image.save
 
@@ -758,10 +724,16 @@ def test_png_sample_bpp_non_standard_mode_in_lossy_path():
     """_png_sample_bpp converts non-RGB/RGBA/L/P mode to RGBA for pngquant input (line 538)."""
     # YCbCr mode is not in ("RGB", "RGBA", "L", "P") → convert("RGBA") branch
     img = Image.new("YCbCr", (100, 100))
-    config = OptimizationConfig(quality=60, png_lossy=True)  # < 70 → pngquant path
+    config = cfg(quality=60, png_lossy=True)  # < 70 → pngquant path
 
     # Run with pngquant fallback to avoid actually needing pngquant
-    with patch("subprocess.run", side_effect=FileNotFoundError("no pngquant")):
+    with (
+        patch("estimation.estimator.tool_available", return_value=True),
+        patch(
+            "estimation.estimator._run_subprocess",
+            side_effect=FileNotFoundError("no pngquant"),
+        ),
+    ):
         bpp, method = _png_sample_bpp(img, 50, 50, config, 100, 100)
 
     assert bpp > 0
@@ -1,13 +1,13 @@
 """Targeted tests for remaining coverage gaps across all modules."""
 
-import gzip
 import io
-import struct
 from unittest.mock import MagicMock, patch
 
 import pytest
 from PIL import Image
 
+from tests._cfg import cfg
+
 try:
     import pillow_avif  # noqa: F401
 
@@ -72,11 +72,12 @@ async def test_avif_reencode_real():
 
     opt = AvifOptimizer()
 
-    # Create a photo-like AVIF at high quality
-    img = Image.new("RGB", (100, 100))
-    for x in range(100):
-        for y in range(100):
-            img.putpixel((x, y), (x * 2, y * 2, (x + y)))
+    # Create a photo-like AVIF at high quality (smooth gradient via numpy)
+    import numpy as np
+
+    ys, xs = np.indices((100, 100), dtype=np.uint8)
+    arr = np.dstack([xs * 2, ys * 2, xs + ys])
+    img = Image.fromarray(arr, mode="RGB")
     buf = io.BytesIO()
     img.save(buf, format="AVIF", quality=90)
     original = buf.getvalue()
@@ -125,7 +126,7 @@ async def test_bmp_optimize_rgba_opaque():
     buf = io.BytesIO()
     img.save(buf, format="BMP")
     data = buf.getvalue()
-    result = await opt.optimize(data, __import__("schemas").OptimizationConfig(quality=80))
+    result = await opt.optimize(data, cfg(quality=80))
     assert result.success
 
 
@@ -141,7 +142,7 @@ async def test_bmp_optimize_non_standard_mode():
     buf = io.BytesIO()
     img_rgb.save(buf, format="BMP")
     data = buf.getvalue()
-    result = await opt.optimize(data, __import__("schemas").OptimizationConfig(quality=60))
+    result = await opt.optimize(data, cfg(quality=60))
     assert result.success
 
 
@@ -166,9 +167,7 @@ async def test_tiff_preserve_exif_and_icc():
     img.save(buf, format="TIFF", exif=exif.tobytes(), icc_profile=icc_data)
     data = buf.getvalue()
 
-    result = await opt.optimize(
-        data, __import__("schemas").OptimizationConfig(quality=80, strip_metadata=False)
-    )
+    result = await opt.optimize(data, cfg(quality=80, strip_metadata=False))
     assert result.success
 
 
@@ -183,73 +182,10 @@ async def test_tiff_jpeg_compression_fails():
     buf = io.BytesIO()
     img.save(buf, format="TIFF")
     data = buf.getvalue()
-    result = await opt.optimize(data, __import__("schemas").OptimizationConfig(quality=60))
+    result = await opt.optimize(data, cfg(quality=60))
     assert result.success
 
 
-# --- utils/format_detect.py: APNG detection, SVGZ edge cases ---
-
-
-def test_detect_apng():
-    """Detect APNG format from animated PNG data."""
-    from utils.format_detect import ImageFormat, detect_format
-
-    frames = [Image.new("RGB", (10, 10), (i * 50, 0, 0)) for i in range(2)]
-    buf = io.BytesIO()
-    frames[0].save(buf, format="PNG", save_all=True, append_images=frames[1:])
-    data = buf.getvalue()
-    assert detect_format(data) == ImageFormat.APNG
-
-
-def test_detect_gzip_non_svg_content():
-    """Gzip header with valid gzip but non-SVG content -> unsupported."""
-    from exceptions import UnsupportedFormatError
-    from utils.format_detect import detect_format
-
-    data = gzip.compress(b"<html>not svg</html>")
-    with pytest.raises(UnsupportedFormatError):
-        detect_format(data)
-
-
-def test_detect_gzip_corrupt():
-    """Corrupt gzip data -> falls through to unsupported."""
-    from exceptions import UnsupportedFormatError
-    from utils.format_detect import detect_format
-
-    # Gzip magic bytes but completely invalid after that
-    data = b"\x1f\x8b" + b"\xff" * 50
-    with pytest.raises(UnsupportedFormatError):
-        detect_format(data)
-
-
-def test_isobmff_compat_brand_heic_in_list():
-    """HEIC detected via compatible brands when major brand is unknown."""
-    from utils.format_detect import ImageFormat, detect_format
-
-    # Build ftyp box: major_brand="isom", compat_brands=["iso2", "heic"]
-    data = (
-        struct.pack(">I", 28)
-        + b"ftyp"
-        + b"isom"
-        + b"\x00\x00\x00\x00"
-        + b"iso2"
-        + b"heic"
-        + b"\x00" * 100
-    )
-    assert detect_format(data) == ImageFormat.HEIC
-
-
-def test_isobmff_unknown_compat_brands():
-    """ISO BMFF with unknown compat brands -> UnsupportedFormatError."""
-    from exceptions import UnsupportedFormatError
-    from utils.format_detect import detect_format
-
-    # Only unknown brands in compat list
-    data = struct.pack(">I", 24) + b"ftyp" + b"isom" + b"\x00\x00\x00\x00" + b"iso2" + b"\x00" * 100
-    with pytest.raises(UnsupportedFormatError):
-        detect_format(data)
-
-
 # --- routers/health.py: ImportError paths ---
 
 
@@ -12,6 +12,7 @@ Coverage targets:
 
 import asyncio
 import io
+from functools import lru_cache
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -19,12 +20,14 @@ from fastapi.testclient import TestClient
 from PIL import Image
 
 from main import app
+from tests._cfg import cfg
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_png_bytes(size=(50, 50), mode="RGB"):
     img = Image.new(mode, size, (128, 64, 32) if mode == "RGB" else 128)
     buf = io.BytesIO()
@@ -32,6 +35,7 @@ def _make_png_bytes(size=(50, 50), mode="RGB"):
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_jpeg_bytes(size=(50, 50)):
     img = Image.new("RGB", size)
     buf = io.BytesIO()
@@ -225,7 +229,6 @@ async def test_optimize_image_unsupported_format_raises():
 
     # Temporarily remove PNG from the registry to simulate unregistered format
     from optimizers.router import OPTIMIZERS, optimize_image
-    from schemas import OptimizationConfig
     from utils.format_detect import ImageFormat
 
     original = OPTIMIZERS.pop(ImageFormat.PNG)
@@ -235,7 +238,7 @@ async def test_optimize_image_unsupported_format_raises():
         data = buf.getvalue()
 
         with pytest.raises(UnsupportedFormatError):
-            await optimize_image(data, OptimizationConfig())
+            await optimize_image(data, cfg())
     finally:
         OPTIMIZERS[ImageFormat.PNG] = original
 
@@ -244,7 +247,6 @@ async def test_optimize_image_unsupported_format_raises():
 async def test_optimize_image_with_predetected_format():
     """optimize_image accepts a pre-detected format, skipping magic-byte scan (line 54-55)."""
     from optimizers.router import optimize_image
-    from schemas import OptimizationConfig
     from utils.format_detect import ImageFormat
 
     buf = io.BytesIO()
@@ -253,7 +255,7 @@ async def test_optimize_image_with_predetected_format():
 
     # Pass fmt explicitly — detect_format should NOT be called
     with patch("optimizers.router.detect_format") as mock_detect:
-        result = await optimize_image(data, OptimizationConfig(), fmt=ImageFormat.PNG)
+        result = await optimize_image(data, cfg(), fmt=ImageFormat.PNG)
         mock_detect.assert_not_called()
 
     assert result.success
@@ -269,7 +271,6 @@ async def test_tiff_optimizer_large_image_sequential():
     """TIFF optimizer with pixel_count >= PARALLEL_PIXEL_THRESHOLD runs methods
     sequentially (lines 66-71) instead of via asyncio.gather."""
     from optimizers.tiff import PARALLEL_PIXEL_THRESHOLD, TiffOptimizer
-    from schemas import OptimizationConfig
 
     # Create TIFF > 5MP
     width = 2500
@@ -282,7 +283,7 @@ async def test_tiff_optimizer_large_image_sequential():
     data = buf.getvalue()
 
     opt = TiffOptimizer()
-    config = OptimizationConfig(quality=80)
+    config = cfg(quality=80)
 
     result = await opt.optimize(data, config)
 
@@ -298,7 +299,6 @@ async def test_tiff_try_compression_saves_exif_directly():
     Calls _try_compression directly to bypass _decode (which doesn't extract exif from TIFF info).
     """
     from optimizers.tiff import TiffOptimizer
-    from schemas import OptimizationConfig
 
     opt = TiffOptimizer()
 
@@ -307,7 +307,7 @@ async def test_tiff_try_compression_saves_exif_directly():
 
     # Create minimal EXIF bytes (Exif header)
     exif_bytes = b"Exif\x00\x00MM\x00*\x00\x00\x00\x08\x00\x00"
-    config = OptimizationConfig(quality=80, strip_metadata=False)
+    config = cfg(quality=80, strip_metadata=False)
 
     # Call _try_compression directly with truthy exif_bytes
     result_bytes, method = opt._try_compression(img, "tiff_adobe_deflate", config, exif_bytes, None)
@@ -326,7 +326,6 @@ async def test_tiff_try_compression_saves_icc_directly():
     from PIL import ImageCms
 
     from optimizers.tiff import TiffOptimizer
-    from schemas import OptimizationConfig
 
     opt = TiffOptimizer()
 
@@ -336,7 +335,7 @@ async def test_tiff_try_compression_saves_icc_directly():
     img = Image.new("RGB", (50, 50), color=(100, 150, 200))
     img.load()
 
-    config = OptimizationConfig(quality=80, strip_metadata=False)
+    config = cfg(quality=80, strip_metadata=False)
 
     # Call _try_compression directly with truthy icc_profile
     result_bytes, method = opt._try_compression(img, "tiff_adobe_deflate", config, None, icc_data)
@@ -350,12 +349,11 @@ async def test_tiff_try_compression_saves_icc_directly():
 async def test_tiff_try_compression_exception_returns_none():
     """_try_compression returns (None, method) when save() raises Exception (lines 111-112)."""
     from optimizers.tiff import TiffOptimizer
-    from schemas import OptimizationConfig
 
     opt = TiffOptimizer()
     img = Image.new("RGB", (50, 50))
     img.load()
-    config = OptimizationConfig(quality=80, strip_metadata=True)
+    config = cfg(quality=80, strip_metadata=True)
 
     # Patch Image.Image.save to raise for any TIFF save
     with patch.object(Image.Image, "save", side_effect=Exception("forced save failure")):
@@ -508,6 +506,7 @@ def test_middleware_decompression_bomb_pixels_message(client):
 # ============================================================================
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_run_tool_probe_called_on_timeout():
     """When run_tool_probe is set and the tool times out, the probe is called
@@ -577,6 +576,7 @@ async def test_run_tool_probe_exception_is_silenced():
     assert rc == 0
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_run_tool_probe_exception_silenced_on_timeout():
     """If the probe raises during a timeout, run_tool silences it and still raises
@@ -12,6 +12,7 @@ from __future__ import annotations
 import io
 import json
 import shutil
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
@@ -31,6 +32,7 @@ def _copy_real_model(tmp_path: Path, filename: str) -> None:
         shutil.copy2(src, tmp_path / filename)
 
 
+@lru_cache(maxsize=None)
 def _make_large_png(mode: str = "RGB", width: int = 500, height: int = 500) -> bytes:
     """Create a large noisy PNG (>150K pixels) that forces the sample path.
 
@@ -54,6 +56,7 @@ def _make_large_png(mode: str = "RGB", width: int = 500, height: int = 500) -> b
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_large_png_i16(width: int = 500, height: int = 500) -> bytes:
     """Create a large I;16 PNG (unsupported mode for fitted estimator)."""
     # Create as I mode (32-bit), then save — PIL will encode as 16-bit PNG internally
@@ -139,9 +142,9 @@ async def test_png_fitted_active_returns_fitted_path(
 
     data = _make_large_png("RGB", 500, 500)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -172,9 +175,9 @@ async def test_png_fitted_off_returns_sample_path(monkeypatch: pytest.MonkeyPatc
 
     data = _make_large_png("RGB", 500, 500)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -218,9 +221,9 @@ async def test_png_fitted_unsupported_mode_falls_back(
 
     data = _make_large_png("RGB", 500, 500)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -256,9 +259,9 @@ async def test_png_fitted_model_load_failure_falls_back(
 
     data = _make_large_png("RGB", 500, 500)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -302,6 +305,7 @@ def test_resolve_strategy_reads_settings_at_call_time(
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.slow
 def test_prediction_disagreement_fires_on_implausible_ratio(tmp_path: Path) -> None:
     """_png_fitted_bpp returns FittedFallback(reason='prediction_disagreement') when
     the model predicts a compression ratio that is outside the content-aware bounds.
@@ -376,9 +380,9 @@ async def test_png_fitted_internal_error_falls_back(
 
     data = _make_large_png("RGB", 500, 500)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -398,6 +402,7 @@ async def test_png_fitted_internal_error_falls_back(
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_very_large_jpeg(width: int = 1000, height: int = 1200) -> bytes:
     """Create a large noisy JPEG (> 1 MB) that forces _estimate_by_sample."""
     import numpy as np
@@ -423,10 +428,10 @@ async def test_jpeg_header_only_dispatch_in_estimate_by_sample(
     models_mod.load_jpeg_header_model.cache_clear()
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
     data = _make_very_large_jpeg(1000, 1200)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -450,10 +455,10 @@ async def test_jpeg_dispatch_parse_fails_fallback(
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", lambda _: None)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
     data = _make_very_large_jpeg(1000, 1200)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -482,10 +487,10 @@ async def test_jpeg_dispatch_parse_raises_exception_fallback(
 
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", _explode)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
     data = _make_very_large_jpeg(1000, 1200)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -503,31 +508,28 @@ async def test_jpeg_dispatch_fallback_reason_flagged(
     """When jpeg_header.fallback_reason is set, dispatch falls through to direct_encode_sample."""
     import estimation.estimator as estimator_mod
     import estimation.models as models_mod
-    from estimation.jpeg_header import JpegHeader
+    from tests._headers import jpeg_header
 
     _copy_real_model(tmp_path, "jpeg_header_v1.json")
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
     models_mod.load_jpeg_header_model.cache_clear()
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
 
-    lossless_header = JpegHeader(
+    lossless_header = jpeg_header(
         width=1000,
         height=1200,
         components=1,
-        bit_depth=8,
         subsampling="grayscale",
-        progressive=False,
         dqt_luma=[1] * 64,
         dqt_chroma=None,
-        app14_color_transform=None,
         fallback_reason="lossless_jpeg",
     )
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", lambda _: lossless_header)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
     data = _make_very_large_jpeg(1000, 1200)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -557,10 +559,10 @@ async def test_jpeg_dispatch_header_only_fallback_falls_to_sample(
 
     monkeypatch.setattr(estimator_mod, "_jpeg_header_only_bpp", _always_fallback)
 
-    from schemas import OptimizationConfig
+    from tests._cfg import cfg
 
     data = _make_very_large_jpeg(1000, 1200)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     result = await estimator_mod.estimate(data, config)
 
@@ -1,13 +1,12 @@
 """Tests for format detection via magic bytes."""
 
 import gzip
-import io
 import struct
 
 import pytest
-from PIL import Image
 
 from exceptions import UnsupportedFormatError
+from tests._img_cache import encoded
 from utils.format_detect import (
     ImageFormat,
     _is_svg_content,
@@ -15,49 +14,31 @@ from utils.format_detect import (
     is_apng,
 )
 
-# --- detect_format ---
-
-
-def test_detect_png():
-    img = Image.new("RGB", (10, 10))
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    assert detect_format(buf.getvalue()) == ImageFormat.PNG
-
-
-def test_detect_jpeg():
-    img = Image.new("RGB", (10, 10))
-    buf = io.BytesIO()
-    img.save(buf, format="JPEG")
-    assert detect_format(buf.getvalue()) == ImageFormat.JPEG
-
-
-def test_detect_gif():
-    img = Image.new("RGB", (10, 10))
-    buf = io.BytesIO()
-    img.save(buf, format="GIF")
-    assert detect_format(buf.getvalue()) == ImageFormat.GIF
+# Gzip-compressed sample payloads (built once at import time — gzip.compress
+# runs a full deflate even on tiny inputs).
+_SVGZ_RECT = gzip.compress(b'<svg xmlns="http://www.w3.org/2000/svg"><rect/></svg>')
+_GZIP_NON_SVG = gzip.compress(b"not an svg at all, just text")
 
+# Pre-packed minimal JXL ISO BMFF headers (built once at import time).
+_JXL_ISOBMFF_MAJOR = b"\x00\x00\x00\x14ftypjxl \x00\x00\x00\x00" + b"\x00" * 100
+_JXL_ISOBMFF_COMPAT = b"\x00\x00\x00\x18ftypunkn\x00\x00\x00\x00jxl " + b"\x00" * 100
 
-def test_detect_webp():
-    img = Image.new("RGB", (10, 10))
-    buf = io.BytesIO()
-    img.save(buf, format="WEBP")
-    assert detect_format(buf.getvalue()) == ImageFormat.WEBP
+# --- detect_format ---
 
 
-def test_detect_bmp():
-    img = Image.new("RGB", (10, 10))
-    buf = io.BytesIO()
-    img.save(buf, format="BMP")
-    assert detect_format(buf.getvalue()) == ImageFormat.BMP
+PILLOW_CASES = [
+    ("PNG", ImageFormat.PNG),
+    ("JPEG", ImageFormat.JPEG),
+    ("GIF", ImageFormat.GIF),
+    ("WEBP", ImageFormat.WEBP),
+    ("BMP", ImageFormat.BMP),
+    ("TIFF", ImageFormat.TIFF),
+]
 
 
-def test_detect_tiff_little_endian():
-    img = Image.new("RGB", (10, 10))
-    buf = io.BytesIO()
-    img.save(buf, format="TIFF")
-    assert detect_format(buf.getvalue()) == ImageFormat.TIFF
+@pytest.mark.parametrize("pillow_format,expected", PILLOW_CASES)
+def test_detect_pillow_format(pillow_format, expected):
+    assert detect_format(encoded(pillow_format)) == expected
 
 
 def test_detect_tiff_big_endian():
@@ -82,16 +63,13 @@ def test_detect_svg_with_bom():
 
 
 def test_detect_svgz():
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><rect/></svg>'
-    compressed = gzip.compress(svg)
-    assert detect_format(compressed) == ImageFormat.SVGZ
+    assert detect_format(_SVGZ_RECT) == ImageFormat.SVGZ
 
 
 def test_detect_gzip_non_svg():
     """Gzip data that is not SVG should raise."""
-    compressed = gzip.compress(b"not an svg at all, just text")
     with pytest.raises(UnsupportedFormatError):
-        detect_format(compressed)
+        detect_format(_GZIP_NON_SVG)
 
 
 def test_detect_too_small():
@@ -107,42 +85,35 @@ def test_detect_unknown():
 # --- AVIF/HEIC via ISO BMFF ---
 
 
-def test_detect_avif():
-    # ftyp box: size(4) + "ftyp"(4) + brand(4) = 12 bytes
-    data = struct.pack(">I", 20) + b"ftyp" + b"avif" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.AVIF
-
-
-def test_detect_avif_avis():
-    data = struct.pack(">I", 20) + b"ftyp" + b"avis" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.AVIF
-
+# ftyp box: size(4) + "ftyp"(4) + brand(4) = 12 bytes
+FTYP_CASES = [
+    (b"avif", ImageFormat.AVIF),
+    (b"avis", ImageFormat.AVIF),
+    (b"heic", ImageFormat.HEIC),
+    (b"mif1", ImageFormat.HEIC),
+    (b"heix", ImageFormat.HEIC),
+    (b"jxl ", ImageFormat.JXL),
+]
 
-def test_detect_heic():
-    data = struct.pack(">I", 20) + b"ftyp" + b"heic" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.HEIC
-
-
-def test_detect_heic_mif1():
-    data = struct.pack(">I", 20) + b"ftyp" + b"mif1" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.HEIC
 
+@pytest.mark.parametrize("brand,expected", FTYP_CASES)
+def test_detect_ftyp_major(brand, expected):
+    data = struct.pack(">I", 20) + b"ftyp" + brand + b"\x00" * 100
+    assert detect_format(data) == expected
 
-def test_detect_heic_heix():
-    data = struct.pack(">I", 20) + b"ftyp" + b"heix" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.HEIC
 
+COMPAT_CASES = [
+    (b"avif", ImageFormat.AVIF),
+    (b"heic", ImageFormat.HEIC),
+    (b"jxl ", ImageFormat.JXL),
+]
 
-def test_detect_avif_compatible_brand():
-    """AVIF in compatible brands list, not major brand."""
-    data = struct.pack(">I", 24) + b"ftyp" + b"isom" + b"\x00\x00\x00\x00" + b"avif" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.AVIF
 
-
-def test_detect_heic_compatible_brand():
-    """HEIC in compatible brands list."""
-    data = struct.pack(">I", 24) + b"ftyp" + b"isom" + b"\x00\x00\x00\x00" + b"heic" + b"\x00" * 100
-    assert detect_format(data) == ImageFormat.HEIC
+@pytest.mark.parametrize("brand,expected", COMPAT_CASES)
+def test_detect_ftyp_compatible_brand(brand, expected):
+    """Brand in the compatible-brands list, not the major brand."""
+    data = struct.pack(">I", 24) + b"ftyp" + b"isom" + b"\x00\x00\x00\x00" + brand + b"\x00" * 100
+    assert detect_format(data) == expected
 
 
 def test_detect_isobmff_unknown_brand():
@@ -200,27 +171,10 @@ def test_detect_jxl_bare_codestream():
     assert detect_format(data) == ImageFormat.JXL
 
 
-def test_detect_jxl_isobmff_major():
-    """Cover JXL ISO BMFF major brand detection."""
-    box_size = struct.pack(">I", 20)
-    ftyp = b"ftyp"
-    major_brand = b"jxl "
-    minor_version = b"\x00\x00\x00\x00"
-    data = box_size + ftyp + major_brand + minor_version + b"\x00" * 100
-
-    assert detect_format(data) == ImageFormat.JXL
-
-
-def test_detect_jxl_isobmff_compat():
-    """Cover JXL ISO BMFF compatible brand detection."""
-    box_size = struct.pack(">I", 24)
-    ftyp = b"ftyp"
-    major_brand = b"unkn"
-    minor_version = b"\x00\x00\x00\x00"
-    compat_brand = b"jxl "
-    data = box_size + ftyp + major_brand + minor_version + compat_brand + b"\x00" * 100
-
-    assert detect_format(data) == ImageFormat.JXL
+def test_detect_jxl_isobmff_prepacked():
+    """Cover JXL ISO BMFF detection via the pre-packed headers."""
+    assert detect_format(_JXL_ISOBMFF_MAJOR) == ImageFormat.JXL
+    assert detect_format(_JXL_ISOBMFF_COMPAT) == ImageFormat.JXL
 
 
 def test_is_apng_truncated_chunk():
@@ -231,3 +185,46 @@ def test_is_apng_truncated_chunk():
 
     result = is_apng(data)
     assert result is False
+
+
+def test_detect_apng():
+    """Detect APNG format from animated PNG data."""
+    import io
+
+    from PIL import Image
+
+    frames = [Image.new("RGB", (10, 10), (i * 50, 0, 0)) for i in range(2)]
+    buf = io.BytesIO()
+    frames[0].save(buf, format="PNG", save_all=True, append_images=frames[1:])
+    assert detect_format(buf.getvalue()) == ImageFormat.APNG
+
+
+def test_detect_gzip_corrupt():
+    """Corrupt gzip data -> falls through to unsupported."""
+    # Gzip magic bytes but completely invalid after that
+    data = b"\x1f\x8b" + b"\xff" * 50
+    with pytest.raises(UnsupportedFormatError):
+        detect_format(data)
+
+
+def test_isobmff_compat_brand_heic_in_list():
+    """HEIC detected via compatible brands when major brand is unknown."""
+    # Build ftyp box: major_brand="isom", compat_brands=["iso2", "heic"]
+    data = (
+        struct.pack(">I", 28)
+        + b"ftyp"
+        + b"isom"
+        + b"\x00\x00\x00\x00"
+        + b"iso2"
+        + b"heic"
+        + b"\x00" * 100
+    )
+    assert detect_format(data) == ImageFormat.HEIC
+
+
+def test_isobmff_unknown_compat_brands():
+    """ISO BMFF with unknown compat brands -> UnsupportedFormatError."""
+    # Only unknown brands in compat list
+    data = struct.pack(">I", 24) + b"ftyp" + b"isom" + b"\x00\x00\x00\x00" + b"iso2" + b"\x00" * 100
+    with pytest.raises(UnsupportedFormatError):
+        detect_format(data)
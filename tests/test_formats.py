@@ -5,76 +5,80 @@ are skipped on Windows where these tools are not installed. These tests will
 pass in the Docker container where all tools are available.
 """
 
+import functools
 import shutil
 
 import pytest
 
 from config import settings
 from optimizers.router import optimize_image
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 
+@functools.lru_cache(maxsize=None)
 def has_tool(name: str) -> bool:
     return shutil.which(name) is not None
 
 
-@pytest.mark.asyncio
-async def test_format_png_oxipng(sample_png):
-    """PNG lossless optimization via oxipng (pure Python)."""
-    config = OptimizationConfig(png_lossy=False)
-    result = await optimize_image(sample_png, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "png"
+# One row per format pipeline: (sample fixture, config kwargs, expected format,
+# required method substring or None). CLI-tool dependencies become skip marks.
+FORMAT_CASES = [
+    pytest.param("sample_png", {"png_lossy": False}, "png", None, id="png-oxipng"),
+    pytest.param(
+        "sample_png",
+        {"png_lossy": True, "quality": 80},
+        "png",
+        None,
+        id="png-lossy",
+        marks=pytest.mark.skipif(not has_tool("pngquant"), reason="pngquant not installed"),
+    ),
+    pytest.param(
+        "sample_jpeg",
+        {"quality": 80},
+        "jpeg",
+        None,
+        id="jpeg",
+        marks=pytest.mark.skipif(not has_tool("cjpeg"), reason="cjpeg not installed"),
+    ),
+    pytest.param(
+        "sample_gif",
+        {},
+        "gif",
+        None,
+        id="gif",
+        marks=pytest.mark.skipif(not has_tool("gifsicle"), reason="gifsicle not installed"),
+    ),
+    pytest.param("sample_svg", {}, "svg", "scour", id="svg"),
+    pytest.param("sample_webp", {"quality": 80}, "webp", None, id="webp"),
+    pytest.param("sample_bmp", {}, "bmp", None, id="bmp"),
+    pytest.param(
+        "sample_jxl",
+        {"quality": 60},
+        "jxl",
+        None,
+        id="jxl",
+        marks=pytest.mark.skipif(not settings.enable_jxl, reason="JXL support disabled"),
+    ),
+]
 
 
 @pytest.mark.asyncio
-@pytest.mark.skipif(not has_tool("pngquant"), reason="pngquant not installed")
-async def test_format_png_lossy(sample_png):
-    """PNG lossy optimization via pngquant + oxipng."""
-    config = OptimizationConfig(png_lossy=True, quality=80)
-    result = await optimize_image(sample_png, config)
+@pytest.mark.parametrize("sample,cfg_kw,expected_fmt,method_substr", FORMAT_CASES)
+async def test_format_roundtrip(request, sample, cfg_kw, expected_fmt, method_substr):
+    """Each format pipeline succeeds, never grows the file, and reports its format."""
+    data = request.getfixturevalue(sample)
+    result = await optimize_image(data, cfg(**cfg_kw))
     assert result.success
     assert result.optimized_size <= result.original_size
-
-
-@pytest.mark.asyncio
-@pytest.mark.skipif(not has_tool("cjpeg"), reason="cjpeg not installed")
-async def test_format_jpeg_reduction(sample_jpeg):
-    """JPEG optimization via MozJPEG."""
-    config = OptimizationConfig(quality=80)
-    result = await optimize_image(sample_jpeg, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "jpeg"
-
-
-@pytest.mark.asyncio
-@pytest.mark.skipif(not has_tool("gifsicle"), reason="gifsicle not installed")
-async def test_format_gif_reduction(sample_gif):
-    """GIF optimization via gifsicle."""
-    config = OptimizationConfig()
-    result = await optimize_image(sample_gif, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "gif"
-
-
-@pytest.mark.asyncio
-async def test_format_svg_reduction(sample_svg):
-    """SVG optimization via scour (pure Python)."""
-    config = OptimizationConfig()
-    result = await optimize_image(sample_svg, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "svg"
-    assert "scour" in result.method
+    assert result.format == expected_fmt
+    if method_substr is not None:
+        assert method_substr in result.method
 
 
 @pytest.mark.asyncio
 async def test_format_svg_sanitized(malicious_svg):
     """Malicious SVG is sanitized before optimization."""
-    config = OptimizationConfig()
+    config = cfg()
     result = await optimize_image(malicious_svg, config)
     assert result.success
     out = result.optimized_bytes
@@ -84,30 +88,10 @@ async def test_format_svg_sanitized(malicious_svg):
     assert b"foreignObject" not in out and b"foreignobject" not in out.lower()
 
 
-@pytest.mark.asyncio
-async def test_format_webp(sample_webp):
-    """WebP optimization via Pillow."""
-    config = OptimizationConfig(quality=80)
-    result = await optimize_image(sample_webp, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "webp"
-
-
-@pytest.mark.asyncio
-async def test_format_bmp(sample_bmp):
-    """BMP optimization via Pillow re-encode."""
-    config = OptimizationConfig()
-    result = await optimize_image(sample_bmp, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "bmp"
-
-
 @pytest.mark.asyncio
 async def test_format_tiff(sample_tiff):
     """TIFF optimization via multi-compression trial."""
-    config = OptimizationConfig()
+    config = cfg()
     result = await optimize_image(sample_tiff, config)
     assert result.success
     assert result.optimized_size <= result.original_size
@@ -116,23 +100,12 @@ async def test_format_tiff(sample_tiff):
     assert result.method in ("tiff_adobe_deflate", "tiff_lzw", "none")
 
 
-@pytest.mark.asyncio
-@pytest.mark.skipif(not settings.enable_jxl, reason="JXL support disabled")
-async def test_format_jxl(sample_jxl):
-    """JXL optimization via jxlpy re-encoding."""
-    config = OptimizationConfig(quality=60)
-    result = await optimize_image(sample_jxl, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.format == "jxl"
-
-
 @pytest.mark.asyncio
 async def test_all_formats_never_larger(
     sample_png, sample_jpeg, sample_svg, sample_webp, sample_gif, sample_bmp, sample_tiff, tiny_png
 ):
     """No format ever returns output larger than input (optimization guarantee)."""
-    config = OptimizationConfig(png_lossy=False)
+    config = cfg(png_lossy=False)
     samples = [
         ("png", sample_png),
         ("svg", sample_svg),
@@ -153,15 +126,14 @@ async def test_all_formats_never_larger(
 
 def test_bmp_lossless_palette_photographic():
     """Photographic BMP (>256 colors) returns None quickly without full scan."""
+    # Create an image with >256 unique colors (gradient via numpy)
+    import numpy as np
     from PIL import Image
 
     from optimizers.bmp import BmpOptimizer
 
-    # Create an image with >256 unique colors (gradient)
-    img = Image.new("RGB", (100, 100))
-    for x in range(100):
-        for y in range(100):
-            img.putpixel((x, y), (x * 2, y * 2, (x + y) % 256))
+    ys, xs = np.indices((100, 100), dtype=np.uint8)
+    img = Image.fromarray(np.dstack([xs * 2, ys * 2, xs + ys]), mode="RGB")
 
     result = BmpOptimizer._try_lossless_palette(img)
     assert result is None  # Too many colors
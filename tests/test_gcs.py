@@ -1,8 +1,10 @@
 """Tests for GCS upload integration (mocked)."""
 
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
+from google.cloud.storage import Blob, Bucket, Client
 
 from schemas import StorageConfig
 from storage.gcs import GCSUploader
@@ -27,24 +29,30 @@ def public_storage_config():
     )
 
 
-@pytest.mark.asyncio
-async def test_gcs_upload_mock(storage_config):
-    """Upload bytes to mocked GCS -> correct bucket/path."""
+@pytest.fixture
+def gcs_mocks():
+    """A GCSUploader wired to a fresh mock client/bucket/blob chain."""
     uploader = GCSUploader()
 
-    mock_blob = MagicMock()
-    mock_bucket = MagicMock()
-    mock_bucket.blob.return_value = mock_blob
+    blob = Mock(spec=Blob)
+    bucket = Mock(spec=Bucket)
+    bucket.blob.return_value = blob
 
-    mock_client = MagicMock()
-    mock_client.bucket.return_value = mock_bucket
-    uploader._client = mock_client
+    client = Mock(spec=Client)
+    client.bucket.return_value = bucket
+    uploader._client = client
 
-    result = await uploader.upload(b"fake image data", "png", storage_config)
+    return SimpleNamespace(uploader=uploader, client=client, bucket=bucket, blob=blob)
 
-    mock_client.bucket.assert_called_once_with("test-bucket", user_project=None)
-    mock_bucket.blob.assert_called_once_with("images/optimized.png")
-    mock_blob.upload_from_string.assert_called_once_with(
+
+@pytest.mark.asyncio
+async def test_gcs_upload_mock(gcs_mocks, storage_config):
+    """Upload bytes to mocked GCS -> correct bucket/path."""
+    result = await gcs_mocks.uploader.upload(b"fake image data", "png", storage_config)
+
+    gcs_mocks.client.bucket.assert_called_once_with("test-bucket", user_project=None)
+    gcs_mocks.bucket.blob.assert_called_once_with("images/optimized.png")
+    gcs_mocks.blob.upload_from_string.assert_called_once_with(
         b"fake image data", content_type="image/png"
     )
     assert result.provider == "gcs"
@@ -53,45 +61,25 @@ async def test_gcs_upload_mock(storage_config):
 
 
 @pytest.mark.asyncio
-async def test_gcs_upload_public(public_storage_config):
+async def test_gcs_upload_public(gcs_mocks, public_storage_config):
     """public=True -> blob.make_public() called, public_url returned."""
-    uploader = GCSUploader()
-
-    mock_blob = MagicMock()
-    mock_bucket = MagicMock()
-    mock_bucket.blob.return_value = mock_blob
-
-    mock_client = MagicMock()
-    mock_client.bucket.return_value = mock_bucket
-    uploader._client = mock_client
-
-    result = await uploader.upload(b"fake image data", "png", public_storage_config)
+    result = await gcs_mocks.uploader.upload(b"fake image data", "png", public_storage_config)
 
-    mock_blob.make_public.assert_called_once()
+    gcs_mocks.blob.make_public.assert_called_once()
     assert result.public_url == "https://storage.googleapis.com/test-bucket/images/optimized.png"
 
 
 @pytest.mark.asyncio
-async def test_gcs_upload_private(storage_config):
+async def test_gcs_upload_private(gcs_mocks, storage_config):
     """public=False -> no public_url in result."""
-    uploader = GCSUploader()
-
-    mock_blob = MagicMock()
-    mock_bucket = MagicMock()
-    mock_bucket.blob.return_value = mock_blob
-
-    mock_client = MagicMock()
-    mock_client.bucket.return_value = mock_bucket
-    uploader._client = mock_client
+    result = await gcs_mocks.uploader.upload(b"fake image data", "png", storage_config)
 
-    result = await uploader.upload(b"fake image data", "png", storage_config)
-
-    mock_blob.make_public.assert_not_called()
+    gcs_mocks.blob.make_public.assert_not_called()
     assert result.public_url is None
 
 
 @pytest.mark.asyncio
-async def test_gcs_upload_custom_project():
+async def test_gcs_upload_custom_project(gcs_mocks):
     """project field passed to GCS client."""
     config = StorageConfig(
         provider="gcs",
@@ -99,31 +87,17 @@ async def test_gcs_upload_custom_project():
         path="images/opt.png",
         project="my-gcp-project",
     )
-    uploader = GCSUploader()
+    await gcs_mocks.uploader.upload(b"data", "png", config)
 
-    mock_blob = MagicMock()
-    mock_bucket = MagicMock()
-    mock_bucket.blob.return_value = mock_blob
-
-    mock_client = MagicMock()
-    mock_client.bucket.return_value = mock_bucket
-    uploader._client = mock_client
-
-    await uploader.upload(b"data", "png", config)
-
-    mock_client.bucket.assert_called_once_with("test-bucket", user_project="my-gcp-project")
+    gcs_mocks.client.bucket.assert_called_once_with("test-bucket", user_project="my-gcp-project")
 
 
 @pytest.mark.asyncio
-async def test_gcs_upload_failure_handling(storage_config):
+async def test_gcs_upload_failure_handling(gcs_mocks, storage_config):
     """GCS error -> PareError raised with details."""
-    uploader = GCSUploader()
-
-    mock_client = MagicMock()
-    mock_client.bucket.side_effect = Exception("Bucket not found")
-    uploader._client = mock_client
+    gcs_mocks.client.bucket.side_effect = Exception("Bucket not found")
 
     from exceptions import PareError
 
     with pytest.raises(PareError, match="GCS upload failed"):
-        await uploader.upload(b"data", "png", storage_config)
+        await gcs_mocks.uploader.upload(b"data", "png", storage_config)
@@ -10,10 +10,15 @@ from __future__ import annotations
 import io
 import shutil
 import struct
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
 
+from tests._cfg import cfg
+from tests._headers import jpeg_header as _jpeg_header
+from tests._headers import png_header as _png_header
+
 _REAL_MODELS_DIR = Path(__file__).parent.parent / "estimation" / "models"
 
 
@@ -28,6 +33,7 @@ def _copy_real_model(tmp_path: Path, filename: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_large_png_rgb(width: int = 500, height: int = 500) -> bytes:
     """Create a large noisy RGB PNG that forces the sample path (>150K pixels, BPP>2.0)."""
     import numpy as np
@@ -41,6 +47,7 @@ def _make_large_png_rgb(width: int = 500, height: int = 500) -> bytes:
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_large_png_rgba(width: int = 500, height: int = 500) -> bytes:
     """Create a large noisy RGBA PNG."""
     import numpy as np
@@ -59,6 +66,7 @@ def _make_large_png_rgba(width: int = 500, height: int = 500) -> bytes:
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_large_jpeg_rgb(width: int = 600, height: int = 400) -> bytes:
     """Create a standard YCbCr JPEG (q=85, 4:2:0) that forces sample path."""
     import numpy as np
@@ -72,6 +80,7 @@ def _make_large_jpeg_rgb(width: int = 600, height: int = 400) -> bytes:
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_lossless_jpeg(width: int = 64, height: int = 64) -> bytes:
     """Build a minimal SOF3 (lossless JPEG) byte stream."""
     # Craft a minimal JPEG with SOF3 marker
@@ -86,6 +95,7 @@ def _make_lossless_jpeg(width: int = 64, height: int = 64) -> bytes:
     return soi + sof3 + eoi
 
 
+@lru_cache(maxsize=None)
 def _make_jpeg_uniform_qtable(width: int = 800, height: int = 600) -> bytes:
     """Create a JPEG with a non-standard (uniform) quantization table.
 
@@ -120,6 +130,7 @@ def _make_jpeg_uniform_qtable(width: int = 800, height: int = 600) -> bytes:
     return bytes(data)
 
 
+@lru_cache(maxsize=None)
 def _make_cmyk_jpeg(width: int = 64, height: int = 64) -> bytes:
     """Synthesize a minimal JPEG with APP14 color_transform=2 (YCCK)."""
     from PIL import Image
@@ -155,10 +166,8 @@ async def test_png_header_only_active_returns_header_path(
     models_mod.load_png_header_model.cache_clear()
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
 
-    from schemas import OptimizationConfig
-
     data = _make_large_png_rgb(500, 500)
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
     result = await estimator_mod.estimate(data, config)
 
     assert result.path in (
@@ -185,10 +194,8 @@ async def test_png_header_only_off_returns_sample_path(
 
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "off")
 
-    from schemas import OptimizationConfig
-
     data = _make_large_png_rgb(500, 500)
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
     result = await estimator_mod.estimate(data, config)
 
     assert result.path == "direct_encode_sample", f"Unexpected path {result.path!r}"
@@ -207,7 +214,6 @@ async def test_png_header_only_oob_falls_back(
     """PNG with inflated file size (input_bpp > 64) → fallback path with feature_oob."""
     import estimation.estimator as estimator_mod
     import estimation.models as models_mod
-    from estimation.png_header import PngHeader
 
     _copy_real_model(tmp_path, "png_header_v1.json")
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
@@ -218,17 +224,13 @@ async def test_png_header_only_oob_falls_back(
     # and large file size. We achieve this by patching parse_png_header to return
     # a tiny header, then passing the large file data.
     # A 1×1 PNG with 1MB file = 8M bpp >> 64 bpp cap
-    tiny_header = PngHeader(
-        width=1, height=1, bit_depth=8, color_type=2, has_alpha=False, is_palette=False
-    )
+    tiny_header = _png_header(width=1, height=1)
     monkeypatch.setattr(estimator_mod, "parse_png_header", lambda _: tiny_header)
 
     # file_size ≫ MAX_INPUT_BPP * 1px = large enough to exceed 64 bpp
     data = _make_large_png_rgb(500, 500)  # ~750KB; 1×1 px → bpp >> 64
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
     result = await estimator_mod.estimate(data, config)
 
     assert result.path in ("direct_encode_sample", "exact"), f"Unexpected path {result.path!r}"
@@ -263,10 +265,8 @@ async def test_png_header_only_internal_error_falls_back(
 
     monkeypatch.setattr(estimator_mod, "parse_png_header", _raise)
 
-    from schemas import OptimizationConfig
-
     data = _make_large_png_rgb(500, 500)
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
     result = await estimator_mod.estimate(data, config)
 
     assert result.path in ("direct_encode_sample", "exact"), f"Unexpected path {result.path!r}"
@@ -297,10 +297,8 @@ async def test_png_header_only_model_load_failure_falls_back(
     models_mod.load_png_header_model.cache_clear()
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
 
-    from schemas import OptimizationConfig
-
     data = _make_large_png_rgb(500, 500)
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
     result = await estimator_mod.estimate(data, config)
 
     assert result.path in ("direct_encode_sample", "exact"), f"Unexpected path {result.path!r}"
@@ -330,10 +328,8 @@ async def test_jpeg_header_only_active_returns_header_path(
     models_mod.load_jpeg_header_model.cache_clear()
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
 
-    from schemas import OptimizationConfig
-
     data = _make_large_jpeg_rgb(600, 400)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate(data, config)
 
     assert result.path in (
@@ -357,7 +353,6 @@ async def test_jpeg_header_only_lossless_falls_back(
     """SOF3 JPEG → parse_jpeg_header.fallback_reason='lossless_jpeg' → direct_encode_sample."""
     import estimation.estimator as estimator_mod
     import estimation.models as models_mod
-    from estimation.jpeg_header import JpegHeader
 
     _copy_real_model(tmp_path, "jpeg_header_v1.json")
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
@@ -365,16 +360,13 @@ async def test_jpeg_header_only_lossless_falls_back(
     monkeypatch.setattr(estimator_mod.settings, "fitted_estimator_mode", "active")
 
     # Patch parse_jpeg_header to return a lossless header
-    lossless_header = JpegHeader(
+    lossless_header = _jpeg_header(
         width=64,
         height=64,
         components=1,
-        bit_depth=8,
         subsampling="grayscale",
-        progressive=False,
         dqt_luma=[1] * 64,
         dqt_chroma=None,
-        app14_color_transform=None,
         fallback_reason="lossless_jpeg",
     )
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", lambda _: lossless_header)
@@ -382,9 +374,7 @@ async def test_jpeg_header_only_lossless_falls_back(
     # Use a real JPEG to pass format detection
     data = _make_large_jpeg_rgb(800, 600)
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate(data, config)
 
     # lossless_jpeg fallback reason → routes to direct_encode_sample
@@ -429,9 +419,7 @@ async def test_jpeg_header_only_low_nse_falls_back(
     if nse >= 0.85:
         pytest.skip(f"NSE={nse:.3f} >= 0.85 — Q-table patching did not create a non-standard table")
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate(data, config)
 
     if result.path == "direct_encode_sample":
@@ -469,9 +457,7 @@ async def test_jpeg_header_only_cmyk_falls_back(
     if header is None or header.fallback_reason != "non_default_color_transform":
         pytest.skip("CMYK JPEG synthesis did not produce expected fallback_reason")
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate(data, config)
 
     # Small image → may go exact mode; if sample path, fallback_reason should be set
@@ -500,12 +486,12 @@ async def test_estimate_from_header_bytes_png_returns_response(
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
     models_mod.load_png_header_model.cache_clear()
 
-    from schemas import EstimateResponse, OptimizationConfig
+    from schemas import EstimateResponse
     from utils.format_detect import ImageFormat
 
     data = _make_large_png_rgb(500, 500)
     total_size = len(data)
-    config = OptimizationConfig(quality=60, png_lossy=True)
+    config = cfg(quality=60, png_lossy=True)
 
     result = await estimator_mod.estimate_from_header_bytes(
         data, total_size, ImageFormat.PNG, config
@@ -536,12 +522,12 @@ async def test_estimate_from_header_bytes_jpeg_returns_response(
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
     models_mod.load_jpeg_header_model.cache_clear()
 
-    from schemas import EstimateResponse, OptimizationConfig
+    from schemas import EstimateResponse
     from utils.format_detect import ImageFormat
 
     data = _make_large_jpeg_rgb(800, 600)
     total_size = len(data)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     result = await estimator_mod.estimate_from_header_bytes(
         data, total_size, ImageFormat.JPEG, config
@@ -563,10 +549,9 @@ async def test_estimate_from_header_bytes_jpeg_returns_response(
 async def test_estimate_from_header_bytes_unsupported_format_returns_none() -> None:
     """estimate_from_header_bytes for WebP (unsupported) returns None."""
     import estimation.estimator as estimator_mod
-    from schemas import OptimizationConfig
     from utils.format_detect import ImageFormat
 
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate_from_header_bytes(
         b"RIFF\x00\x00\x00\x00WEBPVP8 ", 50000, ImageFormat.WEBP, config
     )
@@ -588,9 +573,7 @@ async def test_estimate_from_header_bytes_png_parse_fails_returns_none(
 
     monkeypatch.setattr(estimator_mod, "parse_png_header", lambda _: None)
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate_from_header_bytes(
         b"\x89PNG\r\n\x1a\n" + b"\x00" * 500, 100000, ImageFormat.PNG, config
     )
@@ -609,23 +592,19 @@ async def test_estimate_from_header_bytes_png_fallback_returns_none(
     """When header-only model returns HeaderOnlyFallback, estimate_from_header_bytes returns None."""
     import estimation.estimator as estimator_mod
     import estimation.models as models_mod
-    from estimation.png_header import PngHeader
 
     _copy_real_model(tmp_path, "png_header_v1.json")
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
     models_mod.load_png_header_model.cache_clear()
 
-    from schemas import OptimizationConfig
     from utils.format_detect import ImageFormat
 
     # 1×1 PNG with massive file size → input_bpp >> 64 cap → HeaderOnlyFallback("feature_oob")
-    tiny_header = PngHeader(
-        width=1, height=1, bit_depth=8, color_type=2, has_alpha=False, is_palette=False
-    )
+    tiny_header = _png_header(width=1, height=1)
     monkeypatch.setattr(estimator_mod, "parse_png_header", lambda _: tiny_header)
 
     data = _make_large_png_rgb(500, 500)  # large file; 1×1 pixels → bpp >> 64
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate_from_header_bytes(
         data, len(data), ImageFormat.PNG, config
     )
@@ -649,9 +628,7 @@ async def test_estimate_from_header_bytes_jpeg_parse_fails_returns_none(
 
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", lambda _: None)
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     data = _make_large_jpeg_rgb(800, 600)
     result = await estimator_mod.estimate_from_header_bytes(
         data, len(data), ImageFormat.JPEG, config
@@ -670,26 +647,20 @@ async def test_estimate_from_header_bytes_jpeg_fallback_reason_returns_none(
 ) -> None:
     """When parse_jpeg_header returns header with fallback_reason, returns None."""
     import estimation.estimator as estimator_mod
-    from estimation.jpeg_header import JpegHeader
     from utils.format_detect import ImageFormat
 
-    lossless_header = JpegHeader(
+    lossless_header = _jpeg_header(
         width=64,
         height=64,
         components=1,
-        bit_depth=8,
         subsampling="grayscale",
-        progressive=False,
         dqt_luma=[1] * 64,
         dqt_chroma=None,
-        app14_color_transform=None,
         fallback_reason="lossless_jpeg",
     )
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", lambda _: lossless_header)
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     data = _make_large_jpeg_rgb(800, 600)
     result = await estimator_mod.estimate_from_header_bytes(
         data, len(data), ImageFormat.JPEG, config
@@ -715,9 +686,7 @@ async def test_estimate_from_header_bytes_exception_returns_none(
 
     monkeypatch.setattr(estimator_mod, "_estimate_from_png_header", _explode)
 
-    from schemas import OptimizationConfig
-
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     data = _make_large_png_rgb(500, 500)
     result = await estimator_mod.estimate_from_header_bytes(
         data, len(data), ImageFormat.PNG, config
@@ -777,20 +746,7 @@ def test_jpeg_header_only_bpp_internal_error_returns_fallback(
 
     monkeypatch.setattr(estimator_mod, "_jpeg_header_only_bpp_inner", _explode)
 
-    from estimation.jpeg_header import JpegHeader
-
-    header = JpegHeader(
-        width=100,
-        height=100,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=[16] * 64,
-        dqt_chroma=[17] * 64,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    header = _jpeg_header(width=100, height=100)
     result = _jpeg_header_only_bpp(header, 50000, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
     assert result.reason == "internal_error"
@@ -803,8 +759,11 @@ def test_jpeg_header_only_bpp_internal_error_returns_fallback(
 # ---------------------------------------------------------------------------
 
 
+@pytest.mark.parametrize(
+    "reason", ["lossless_jpeg", "non_standard_components", "missing_chroma_table"]
+)
 def test_jpeg_header_only_bpp_inner_fallback_reason_valid(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, reason: str
 ) -> None:
     """_jpeg_header_only_bpp_inner returns HeaderOnlyFallback when header.fallback_reason is valid."""
     import estimation.models as models_mod
@@ -814,24 +773,11 @@ def test_jpeg_header_only_bpp_inner_fallback_reason_valid(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader
-
-    for reason in ("lossless_jpeg", "non_standard_components", "missing_chroma_table"):
-        header = JpegHeader(
-            width=100,
-            height=100,
-            components=3,
-            bit_depth=8,
-            subsampling="4:2:0",
-            progressive=False,
-            dqt_luma=[16] * 64,
-            dqt_chroma=[17] * 64,
-            app14_color_transform=None,
-            fallback_reason=reason,
-        )
-        result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
-        assert isinstance(result, HeaderOnlyFallback)
-        assert result.reason == reason
+
+    header = _jpeg_header(width=100, height=100, fallback_reason=reason)
+    result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
+    assert isinstance(result, HeaderOnlyFallback)
+    assert result.reason == reason
 
     models_mod.load_jpeg_header_model.cache_clear()
 
@@ -847,22 +793,10 @@ def test_jpeg_header_only_bpp_inner_fallback_reason_unknown(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader
 
     # "custom_quantization" is a valid HeaderOnlyFallback reason string but NOT in
     # the valid_reasons set inside _jpeg_header_only_bpp_inner, so it routes to header_parse_error.
-    header = JpegHeader(
-        width=100,
-        height=100,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=[16] * 64,
-        dqt_chroma=[17] * 64,
-        app14_color_transform=None,
-        fallback_reason="custom_quantization",
-    )
+    header = _jpeg_header(width=100, height=100, fallback_reason="custom_quantization")
     result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
     assert result.reason == "header_parse_error"
@@ -881,21 +815,9 @@ def test_jpeg_header_only_bpp_inner_feature_oob(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader
 
     # 1×1 pixel with very large file_size → input_bpp >> 24 cap
-    header = JpegHeader(
-        width=1,
-        height=1,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=[16] * 64,
-        dqt_chroma=[17] * 64,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    header = _jpeg_header(width=1, height=1)
     result = _jpeg_header_only_bpp_inner(header, 10_000_000, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
     assert result.reason == "feature_oob"
@@ -914,20 +836,8 @@ def test_jpeg_header_only_bpp_inner_empty_dqt_luma(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader
-
-    header = JpegHeader(
-        width=800,
-        height=600,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=[],  # empty luma table
-        dqt_chroma=[17] * 64,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+
+    header = _jpeg_header(dqt_luma=[])
     result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
     assert result.reason == "header_parse_error"
@@ -946,7 +856,7 @@ def test_jpeg_header_only_bpp_inner_model_load_failed(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader, parse_jpeg_header
+    from estimation.jpeg_header import parse_jpeg_header
 
     # Use a real JPEG's DQT table (Annex-K tables → NSE ≥ 0.85) to pass the NSE gate
     # so the test reaches the model-load check.
@@ -956,18 +866,7 @@ def test_jpeg_header_only_bpp_inner_model_load_failed(
     assert real_header.dqt_luma and len(real_header.dqt_luma) == 64
 
     # Reuse real DQT tables but pass a huge file_size so input_bpp stays in range
-    header = JpegHeader(
-        width=800,
-        height=600,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=real_header.dqt_luma,
-        dqt_chroma=real_header.dqt_chroma,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    header = _jpeg_header(dqt_luma=real_header.dqt_luma, dqt_chroma=real_header.dqt_chroma)
     result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
     # Either model_load_failed (if NSE passes) or custom_quantization (NSE gate)
@@ -983,13 +882,12 @@ def test_jpeg_header_only_bpp_inner_model_load_failed(
 
 def test_min_ratio_for_quality_all_branches() -> None:
     """_min_ratio_for_quality returns correct values for all quality regimes."""
-    import pytest
 
     from estimation.estimator import _min_ratio_for_quality
 
-    assert _min_ratio_for_quality(40) == pytest.approx(0.05)  # q < 50
-    assert _min_ratio_for_quality(60) == pytest.approx(0.10)  # 50 <= q < 70
-    assert _min_ratio_for_quality(75) == pytest.approx(0.40)  # q >= 70
+    assert abs(_min_ratio_for_quality(40) - 0.05) <= 1e-6  # q < 50
+    assert abs(_min_ratio_for_quality(60) - 0.10) <= 1e-6  # 50 <= q < 70
+    assert abs(_min_ratio_for_quality(75) - 0.40) <= 1e-6  # q >= 70
 
 
 # ---------------------------------------------------------------------------
@@ -1037,28 +935,15 @@ async def test_estimate_from_jpeg_header_grayscale_color_type(
     monkeypatch.setattr(models_mod, "_MODELS_DIR", tmp_path)
     models_mod.load_jpeg_header_model.cache_clear()
 
-    from estimation.jpeg_header import JpegHeader
-
     # Grayscale JPEG header (1 component)
-    grayscale_header = JpegHeader(
-        width=800,
-        height=600,
-        components=1,
-        bit_depth=8,
-        subsampling="grayscale",
-        progressive=False,
-        dqt_luma=[16] * 64,
-        dqt_chroma=None,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    grayscale_header = _jpeg_header(components=1, subsampling="grayscale", dqt_chroma=None)
     monkeypatch.setattr(estimator_mod, "parse_jpeg_header", lambda _: grayscale_header)
 
-    from schemas import EstimateResponse, OptimizationConfig
+    from schemas import EstimateResponse
     from utils.format_detect import ImageFormat
 
     data = _make_large_jpeg_rgb(800, 600)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimator_mod.estimate_from_header_bytes(
         data, len(data), ImageFormat.JPEG, config
     )
@@ -1085,7 +970,7 @@ def test_jpeg_header_only_bpp_inner_grayscale_no_chroma_stats(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyBpp, HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader, parse_jpeg_header
+    from estimation.jpeg_header import parse_jpeg_header
 
     # Use real Annex-K DQT luma table from a real JPEG
     real_data = _make_large_jpeg_rgb(400, 300)
@@ -1093,17 +978,11 @@ def test_jpeg_header_only_bpp_inner_grayscale_no_chroma_stats(
     assert real_header is not None
 
     # Grayscale header — dqt_chroma=None triggers the else branch (lines 429-430)
-    header = JpegHeader(
-        width=800,
-        height=600,
+    header = _jpeg_header(
         components=1,
-        bit_depth=8,
         subsampling="grayscale",
-        progressive=False,
         dqt_luma=real_header.dqt_luma,
         dqt_chroma=None,
-        app14_color_transform=None,
-        fallback_reason=None,
     )
     result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
     # Either HeaderOnlyBpp or HeaderOnlyFallback — both are valid
@@ -1150,24 +1029,13 @@ def test_jpeg_header_only_bpp_inner_prediction_oob_from_model(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader, parse_jpeg_header
+    from estimation.jpeg_header import parse_jpeg_header
 
     real_data = _make_large_jpeg_rgb(400, 300)
     real_header = parse_jpeg_header(real_data)
     assert real_header is not None
 
-    header = JpegHeader(
-        width=800,
-        height=600,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=real_header.dqt_luma,
-        dqt_chroma=real_header.dqt_chroma,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    header = _jpeg_header(dqt_luma=real_header.dqt_luma, dqt_chroma=real_header.dqt_chroma)
     result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
     # Either custom_quantization (NSE gate) or prediction_oob (model gate)
@@ -1209,24 +1077,13 @@ def test_jpeg_header_only_bpp_inner_ratio_gate_oob(
     models_mod.load_jpeg_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader, parse_jpeg_header
+    from estimation.jpeg_header import parse_jpeg_header
 
     real_data = _make_large_jpeg_rgb(400, 300)
     real_header = parse_jpeg_header(real_data)
     assert real_header is not None
 
-    header = JpegHeader(
-        width=800,
-        height=600,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=real_header.dqt_luma,
-        dqt_chroma=real_header.dqt_chroma,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    header = _jpeg_header(dqt_luma=real_header.dqt_luma, dqt_chroma=real_header.dqt_chroma)
     # file_size = 50000 bytes → input_bpp = 50000*8/(800*600) ≈ 0.83 bpp
     # predicted = 0.001; min_ratio(q=60) = 0.10; 0.001 < 0.10*0.83 → prediction_oob
     result = _jpeg_header_only_bpp_inner(header, 50000, 60, False)
@@ -1407,11 +1264,8 @@ def test_png_header_only_bpp_inner_prediction_oob_via_high_intercept(
     models_mod.load_png_header_model.cache_clear()
 
     from estimation.estimator import HeaderOnlyFallback, _png_header_only_bpp_inner
-    from estimation.png_header import PngHeader
 
-    header = PngHeader(
-        width=800, height=600, bit_depth=8, color_type=2, has_alpha=False, is_palette=False
-    )
+    header = _png_header()
     # file_size = 50000 → input_bpp = 50000*8/(800*600) ≈ 0.83 bpp (in range)
     # predicted = 100.0 >> 32 → prediction_oob
     result = _png_header_only_bpp_inner(header, 50000, 60)
@@ -1493,14 +1347,11 @@ def test_png_fitted_bpp_inner_feature_index_valueerror(
 def test_png_header_only_pixel_cap_falls_back(monkeypatch: pytest.MonkeyPatch) -> None:
     """PNG header with width=20000, height=20000 (400 MP > 100 MP cap) → feature_oob."""
     from estimation.estimator import HeaderOnlyFallback, _png_header_only_bpp_inner
-    from estimation.png_header import PngHeader
 
     monkeypatch.setattr("estimation.estimator.settings.max_image_pixels", 100_000_000)
 
     # 20000 × 20000 = 400 megapixels > 100 MP cap
-    header = PngHeader(
-        width=20_000, height=20_000, bit_depth=8, color_type=2, has_alpha=False, is_palette=False
-    )
+    header = _png_header(width=20_000, height=20_000)
     # file_size large enough so input_bpp would be in normal range if pixels weren't capped
     file_size = 20_000 * 20_000 * 3  # 3 bpp uncompressed ~ 1.2 GB (irrelevant — cap fires first)
     result = _png_header_only_bpp_inner(header, file_size, 60)
@@ -1516,23 +1367,11 @@ def test_png_header_only_pixel_cap_falls_back(monkeypatch: pytest.MonkeyPatch) -
 def test_jpeg_header_only_pixel_cap_falls_back(monkeypatch: pytest.MonkeyPatch) -> None:
     """JPEG header with width=20000, height=20000 (400 MP > 100 MP cap) → feature_oob."""
     from estimation.estimator import HeaderOnlyFallback, _jpeg_header_only_bpp_inner
-    from estimation.jpeg_header import JpegHeader
 
     monkeypatch.setattr("estimation.estimator.settings.max_image_pixels", 100_000_000)
 
     # 20000 × 20000 = 400 megapixels > 100 MP cap
-    header = JpegHeader(
-        width=20_000,
-        height=20_000,
-        components=3,
-        bit_depth=8,
-        subsampling="4:2:0",
-        progressive=False,
-        dqt_luma=[16] * 64,
-        dqt_chroma=[17] * 64,
-        app14_color_transform=None,
-        fallback_reason=None,
-    )
+    header = _jpeg_header(width=20_000, height=20_000)
     file_size = 20_000 * 20_000 * 3  # large but irrelevant — pixel cap fires before input_bpp check
     result = _jpeg_header_only_bpp_inner(header, file_size, 60, False)
     assert isinstance(result, HeaderOnlyFallback)
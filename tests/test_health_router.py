@@ -1,6 +1,6 @@
 """Tests for /health endpoint and check_tools utility."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -35,12 +35,14 @@ def test_check_tools_python_libs():
     assert "pillow_heif" in results
 
 
-def test_check_tools_oxipng_missing():
+def test_check_tools_oxipng_missing(monkeypatch):
     """oxipng import failure -> oxipng=False."""
-    with patch("shutil.which", return_value=None):
-        with patch.dict("sys.modules", {"oxipng": None}):
-            with patch("builtins.__import__", side_effect=_mock_import_no_oxipng):
-                results = check_tools()
+    import sys
+
+    monkeypatch.setattr("shutil.which", lambda _: None)
+    # None in sys.modules makes the import machinery raise ImportError directly.
+    monkeypatch.setitem(sys.modules, "oxipng", None)
+    results = check_tools()
     assert results["oxipng"] is False
 
 
@@ -83,12 +85,6 @@ def test_health_endpoint_all_ok(client):
     assert data["status"] == "ok"
 
 
-def _mock_import_no_oxipng(name, *args, **kwargs):
-    if name == "oxipng":
-        raise ImportError("no oxipng")
-    return MagicMock()
-
-
 # --- check_tools coverage ---
 
 
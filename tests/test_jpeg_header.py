@@ -7,6 +7,7 @@ pure-bytes parser to verify correctness.
 from __future__ import annotations
 
 import io
+from functools import lru_cache
 
 import pytest
 from PIL import Image
@@ -21,6 +22,7 @@ _PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
 _SOI = b"\xff\xd8"
 
 
+@lru_cache(maxsize=None)
 def _make_jpeg(
     width: int = 64,
     height: int = 48,
@@ -28,9 +30,12 @@ def _make_jpeg(
     quality: int = 75,
     progressive: bool = False,
     subsampling: int = -1,  # -1 = Pillow default
-    qtables: list | None = None,
+    qtables: tuple[tuple[int, ...], ...] | None = None,
 ) -> bytes:
-    """Create a JPEG in memory using Pillow."""
+    """Create a JPEG in memory using Pillow.
+
+    Memoized — returns shared immutable bytes, so repeated encodes hit a dict lookup.
+    """
     img = Image.new(mode, (width, height), color=128)
     buf = io.BytesIO()
     kwargs: dict = {"format": "JPEG", "quality": quality}
@@ -39,7 +44,7 @@ def _make_jpeg(
     if subsampling >= 0:
         kwargs["subsampling"] = subsampling
     if qtables is not None:
-        kwargs["qtables"] = qtables
+        kwargs["qtables"] = [list(t) for t in qtables]
     img.save(buf, **kwargs)
     return buf.getvalue()
 
@@ -121,25 +126,16 @@ class TestGrayscaleJpeg:
 
 
 class TestSubsampling:
-    def test_444(self):
-        data = _make_jpeg(subsampling=0)  # Pillow: 0=4:4:4
+    # Pillow subsampling codes: 0=4:4:4, 1=4:2:2, 2=4:2:0
+    @pytest.mark.parametrize(
+        "pillow_code,expected",
+        [(0, "4:4:4"), (1, "4:2:2"), (2, "4:2:0")],
+    )
+    def test_subsampling_variant(self, pillow_code: int, expected: str):
+        data = _make_jpeg(subsampling=pillow_code)
         hdr = parse_jpeg_header(data)
         assert hdr is not None
-        assert hdr.subsampling == "4:4:4"
-        assert hdr.fallback_reason is None
-
-    def test_422(self):
-        data = _make_jpeg(subsampling=1)  # Pillow: 1=4:2:2
-        hdr = parse_jpeg_header(data)
-        assert hdr is not None
-        assert hdr.subsampling == "4:2:2"
-        assert hdr.fallback_reason is None
-
-    def test_420(self):
-        data = _make_jpeg(subsampling=2)  # Pillow: 2=4:2:0
-        hdr = parse_jpeg_header(data)
-        assert hdr is not None
-        assert hdr.subsampling == "4:2:0"
+        assert hdr.subsampling == expected
         assert hdr.fallback_reason is None
 
 
@@ -170,19 +166,19 @@ class TestTruncated:
         result = parse_jpeg_header(truncated)
         assert result is None or isinstance(result, JpegHeader)
 
-    def test_wrong_magic_returns_none(self):
-        # PNG bytes
-        png_data = _PNG_MAGIC + b"\x00" * 200
-        assert parse_jpeg_header(png_data) is None
-
-    def test_empty_bytes_returns_none(self):
-        assert parse_jpeg_header(b"") is None
-
-    def test_too_short_returns_none(self):
-        assert parse_jpeg_header(b"\xff\xd8") is None
-
-    def test_all_zeros_returns_none(self):
-        assert parse_jpeg_header(b"\x00" * 64) is None
+    @pytest.mark.parametrize(
+        "data",
+        [
+            _PNG_MAGIC + b"\x00" * 200,  # wrong magic (PNG)
+            b"",  # empty
+            b"\xff\xd8",  # too short (SOI only)
+            b"\x00" * 64,  # all zeros
+            _SOI + b"\xff\xd9",  # SOI + EOI, no SOF
+        ],
+        ids=["wrong_magic", "empty", "too_short", "all_zeros", "just_soi"],
+    )
+    def test_bad_data_returns_none(self, data: bytes):
+        assert parse_jpeg_header(data) is None
 
     def test_random_bytes_no_crash(self):
         import os
@@ -191,10 +187,6 @@ class TestTruncated:
         result = parse_jpeg_header(rng_bytes)
         assert result is None or isinstance(result, JpegHeader)
 
-    def test_just_soi_returns_none(self):
-        # SOI only — no SOF → None
-        assert parse_jpeg_header(_SOI + b"\xff\xd9") is None  # SOI + EOI
-
 
 # ---------------------------------------------------------------------------
 # APP14 Adobe
@@ -7,6 +7,7 @@ and feeds the DQT tables to estimate_source_quality_lsm().
 from __future__ import annotations
 
 import io
+from functools import lru_cache
 
 import pytest
 from PIL import Image
@@ -14,18 +15,19 @@ from PIL import Image
 from estimation.jpeg_header import estimate_source_quality_lsm, parse_jpeg_header
 
 
+@lru_cache(maxsize=None)
 def _make_jpeg(
     width: int = 128,
     height: int = 96,
     mode: str = "RGB",
     quality: int = 75,
-    qtables: list | None = None,
+    qtables: tuple[tuple[int, ...], ...] | None = None,
 ) -> bytes:
     img = Image.new(mode, (width, height), color=100)
     buf = io.BytesIO()
     kwargs: dict = {"format": "JPEG", "quality": quality}
     if qtables is not None:
-        kwargs["qtables"] = qtables
+        kwargs["qtables"] = [list(t) for t in qtables]
     img.save(buf, **kwargs)
     return buf.getvalue()
 
@@ -69,8 +71,8 @@ class TestCustomQuantization:
     def test_custom_uniform_qtables_low_nse(self):
         """Uniform Q-table (not Annex K) → NSE < 0.95 (fallback signal)."""
         # Uniform table with all 16 — definitely not Annex K scaled
-        custom_qtable = [16] * 64
-        data = _make_jpeg(qtables=[custom_qtable, custom_qtable])
+        custom_qtable = (16,) * 64
+        data = _make_jpeg(qtables=(custom_qtable, custom_qtable))
         hdr = parse_jpeg_header(data)
         assert hdr is not None
         if hdr.dqt_luma and hdr.dqt_chroma:
@@ -88,7 +90,7 @@ class TestDegenerateInputs:
         """All-zero DQT → nse=0, no crash."""
         luma = [0] * 64
         q_est, nse = estimate_source_quality_lsm(luma, None)
-        assert nse == pytest.approx(0.0)
+        assert abs(nse - 0.0) <= 1e-6
         assert 1 <= q_est <= 100
 
     def test_constant_dqt_no_crash(self):
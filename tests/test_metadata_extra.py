@@ -1,7 +1,9 @@
 """Tests for metadata stripping — JPEG, PNG, TIFF paths."""
 
 import io
+from functools import lru_cache
 
+import pytest
 from PIL import Image
 
 from utils.format_detect import ImageFormat
@@ -13,6 +15,7 @@ from utils.metadata import (
 )
 
 
+@lru_cache(maxsize=1)
 def _make_jpeg_with_exif():
     """Create JPEG with EXIF orientation and ICC profile."""
     img = Image.new("RGB", (50, 50), (128, 64, 32))
@@ -23,18 +26,26 @@ def _make_jpeg_with_exif():
     return buf.getvalue()
 
 
-def _make_jpeg_with_icc():
-    """Create JPEG with ICC profile."""
+@lru_cache(maxsize=1)
+def _srgb_icc_bytes():
+    """Synthesize an sRGB ICC profile once — the LittleCMS call is the slow part,
+    and the JPEG and TIFF helpers below can share the same profile bytes."""
     from PIL import ImageCms
 
     srgb = ImageCms.createProfile("sRGB")
-    icc_data = ImageCms.ImageCmsProfile(srgb).tobytes()
+    return ImageCms.ImageCmsProfile(srgb).tobytes()
+
+
+@lru_cache(maxsize=1)
+def _make_jpeg_with_icc():
+    """Create JPEG with ICC profile."""
     img = Image.new("RGB", (50, 50))
     buf = io.BytesIO()
-    img.save(buf, format="JPEG", icc_profile=icc_data)
+    img.save(buf, format="JPEG", icc_profile=_srgb_icc_bytes())
     return buf.getvalue()
 
 
+@lru_cache(maxsize=1)
 def _make_png_with_text():
     """Create PNG with tEXt chunks."""
     from PIL import PngImagePlugin
@@ -48,6 +59,7 @@ def _make_png_with_text():
     return buf.getvalue()
 
 
+@lru_cache(maxsize=1)
 def _make_tiff_with_exif():
     """Create TIFF with EXIF data."""
     img = Image.new("RGB", (50, 50))
@@ -58,45 +70,47 @@ def _make_tiff_with_exif():
     return buf.getvalue()
 
 
-# --- strip_metadata_selective dispatch ---
-
-
-def test_strip_dispatch_jpeg():
-    data = _make_jpeg_with_exif()
-    result = strip_metadata_selective(data, ImageFormat.JPEG)
-    assert len(result) > 0
+@lru_cache(maxsize=1)
+def _make_tiff_with_icc():
+    """Create TIFF with ICC profile."""
+    img = Image.new("RGB", (50, 50))
+    buf = io.BytesIO()
+    img.save(buf, format="TIFF", icc_profile=_srgb_icc_bytes())
+    return buf.getvalue()
 
 
-def test_strip_dispatch_png():
-    data = _make_png_with_text()
-    result = strip_metadata_selective(data, ImageFormat.PNG)
-    assert len(result) > 0
+@lru_cache(maxsize=None)
+def _make_plain_png(size):
+    """Create a plain PNG with no ancillary chunks."""
+    img = Image.new("RGB", (size, size), (100, 150, 200))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
 
 
-def test_strip_dispatch_apng():
-    data = _make_png_with_text()
-    result = strip_metadata_selective(data, ImageFormat.APNG)
-    assert len(result) > 0
+# --- strip_metadata_selective dispatch ---
 
 
-def test_strip_dispatch_tiff():
-    data = _make_tiff_with_exif()
-    result = strip_metadata_selective(data, ImageFormat.TIFF)
+@pytest.mark.parametrize(
+    "maker,fmt",
+    [
+        pytest.param(_make_jpeg_with_exif, ImageFormat.JPEG, id="jpeg"),
+        pytest.param(_make_png_with_text, ImageFormat.PNG, id="png"),
+        pytest.param(_make_png_with_text, ImageFormat.APNG, id="apng"),
+        pytest.param(_make_tiff_with_exif, ImageFormat.TIFF, id="tiff"),
+    ],
+)
+def test_strip_dispatch_reencodes(maker, fmt):
+    """Formats with a dedicated strip path produce non-empty output."""
+    result = strip_metadata_selective(maker(), fmt)
     assert len(result) > 0
 
 
-def test_strip_dispatch_webp_passthrough():
-    """WebP metadata stripping returns data unchanged."""
-    data = b"fake webp data"
-    result = strip_metadata_selective(data, ImageFormat.WEBP)
-    assert result == data
-
-
-def test_strip_dispatch_gif_passthrough():
-    """GIF metadata stripping returns data unchanged."""
-    data = b"fake gif data"
-    result = strip_metadata_selective(data, ImageFormat.GIF)
-    assert result == data
+@pytest.mark.parametrize("fmt", [ImageFormat.WEBP, ImageFormat.GIF], ids=lambda f: f.value)
+def test_strip_dispatch_passthrough(fmt):
+    """Formats without a strip path return data unchanged."""
+    data = b"fake image data"
+    assert strip_metadata_selective(data, fmt) == data
 
 
 # --- JPEG metadata ---
@@ -144,8 +158,9 @@ def test_png_strip_removes_text_chunks():
     """PNG strip removes tEXt chunks."""
     data = _make_png_with_text()
     result = _strip_png_metadata(data, preserve_icc=True)
-    # Verify tEXt chunks are gone
-    assert b"tEXt" not in result[8:]  # Skip PNG signature
+    # Verify tEXt chunks are gone; find(..., 8) skips the PNG signature
+    # without the buffer copy that slicing result[8:] would make
+    assert result.find(b"tEXt", 8) == -1
 
 
 def test_png_strip_preserves_essential_chunks():
@@ -175,10 +190,7 @@ def test_png_strip_no_icc():
 def test_png_strip_incomplete_chunk():
     """PNG with truncated last chunk: remaining data preserved."""
     # Valid PNG header + IHDR chunk + truncated extra
-    img = Image.new("RGB", (1, 1))
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    data = buf.getvalue()
+    data = _make_plain_png(1)
     # Append a truncated chunk (only length, no type/data/crc)
     truncated = data + b"\x00\x00\x00\x05"
     result = _strip_png_metadata(truncated, preserve_icc=True)
@@ -212,14 +224,7 @@ def test_tiff_strip_no_orientation():
 
 def test_tiff_strip_with_icc():
     """TIFF strip preserves ICC if present."""
-    img = Image.new("RGB", (50, 50))
-    from PIL import ImageCms
-
-    srgb = ImageCms.createProfile("sRGB")
-    icc_data = ImageCms.ImageCmsProfile(srgb).tobytes()
-    buf = io.BytesIO()
-    img.save(buf, format="TIFF", icc_profile=icc_data)
-    data = buf.getvalue()
+    data = _make_tiff_with_icc()
     result = _strip_pillow_metadata(
         data, ImageFormat.TIFF, preserve_orientation=True, preserve_icc=True
     )
@@ -232,12 +237,7 @@ def test_tiff_strip_with_icc():
 
 def test_metadata_strip_truncated_png():
     """Cover _strip_png_metadata with truncated final chunk."""
-    img = Image.new("RGB", (8, 8), (100, 150, 200))
-    buf = io.BytesIO()
-    img.save(buf, format="PNG")
-    data = buf.getvalue()
-
-    truncated = data[:-10]
+    truncated = _make_plain_png(8)[:-10]
     result = strip_metadata_selective(truncated, ImageFormat.PNG)
     assert isinstance(result, bytes)
     assert len(result) > 0
@@ -99,26 +99,26 @@ def test_optimize_request_id_unique(client, sample_svg):
 
 def test_optimize_413_file_too_large(client):
     """File exceeding size limit -> 413 error."""
-    # Create a file that is technically too large
-    # We use config override or just test the error path
-    import os
+    from unittest.mock import patch
 
-    os.environ["MAX_FILE_SIZE_MB"] = "0"
-    from config import Settings
+    from config import settings
 
-    Settings()
-    # max_file_size_bytes will be 0 * 1024 * 1024 = 0 when post_init sees it's already 0
-    # Actually post_init only sets if == 0, so it stays 0... which means all files fail
-    # Instead, just test with known response
-    os.environ.pop("MAX_FILE_SIZE_MB", None)
+    payload = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
 
-    # Generate oversized payload (just test the endpoint rejects >32MB)
-    # We can't easily send 33MB in tests, so verify the error code exists
+    # Shrink the limit on the settings singleton so a small upload crosses it —
+    # no env mutation or Settings() re-validation needed.
+    with patch.object(settings, "max_file_size_bytes", 8):
+        resp = client.post(
+            "/optimize",
+            files={"file": ("test.bin", payload, "image/png")},
+        )
+    assert resp.status_code == 413
+
+    # With the default 32MB limit the same file should not trigger 413
     resp = client.post(
         "/optimize",
-        files={"file": ("test.bin", b"\x89PNG\r\n\x1a\n" + b"\x00" * 100, "image/png")},
+        files={"file": ("test.bin", payload, "image/png")},
     )
-    # With default 32MB limit this small file should not trigger 413
     assert resp.status_code != 413
 
 
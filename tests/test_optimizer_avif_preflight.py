@@ -13,7 +13,7 @@ from unittest.mock import patch
 import pytest
 
 from optimizers.avif import AvifOptimizer, _parse_avif_metadata, _should_skip_avif_optimization
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 try:
     import pillow_avif  # noqa: F401
@@ -231,7 +231,7 @@ class TestShouldSkipAvifOptimization:
     # --- HIGH preset (quality < 50) --- always False
     def test_high_preset_never_skips(self):
         data = _minimal_avif(1000, 1000)
-        config = OptimizationConfig(quality=40)
+        config = cfg(quality=40)
         assert _should_skip_avif_optimization(data, config) is False
 
     # --- MEDIUM preset (50 <= quality < 70) --- skip if bpp < 0.5
@@ -242,7 +242,7 @@ class TestShouldSkipAvifOptimization:
         # Build fake bytes big enough to hit that size
         header = _minimal_avif(1920, 1080)
         data = header + b"\x00" * max(0, file_bytes - len(header))
-        config = OptimizationConfig(quality=60)
+        config = cfg(quality=60)
         assert _should_skip_avif_optimization(data, config) is True
 
     def test_medium_does_not_skip_when_high_bpp(self):
@@ -251,25 +251,25 @@ class TestShouldSkipAvifOptimization:
         file_bytes = int(n_pixels * 5 / 8)  # 5 bpp → 6250 bytes
         header = _minimal_avif(100, 100)
         data = header + b"\x00" * max(0, file_bytes - len(header))
-        config = OptimizationConfig(quality=60)
+        config = cfg(quality=60)
         assert _should_skip_avif_optimization(data, config) is False
 
     def test_medium_parse_failure_does_not_skip(self):
         # Parse failure → should fall back to decode, not skip
-        config = OptimizationConfig(quality=60)
+        config = cfg(quality=60)
         assert _should_skip_avif_optimization(b"garbage", config) is False
 
     # --- LOW preset (quality >= 70) --- skip if meta_bytes < 500
     def test_low_skips_when_no_metadata(self):
         data = _minimal_avif(100, 100)  # no metadata boxes
-        config = OptimizationConfig(quality=80, strip_metadata=True)
+        config = cfg(quality=80, strip_metadata=True)
         assert _should_skip_avif_optimization(data, config) is True
 
     def test_low_does_not_skip_when_large_strippable_metadata(self):
         # 604-byte Exif box (8+596 = 604) — genuinely strippable, above threshold
         exif_box = _box(b"Exif", b"\x00" * 596)
         data = _minimal_avif(100, 100, extra_boxes=exif_box)
-        config = OptimizationConfig(quality=80, strip_metadata=True)
+        config = cfg(quality=80, strip_metadata=True)
         assert _should_skip_avif_optimization(data, config) is False
 
     def test_low_skips_when_only_icc_profile(self):
@@ -280,20 +280,20 @@ class TestShouldSkipAvifOptimization:
         # returning "none" after wasted CPU.
         prof_colr = _colr_box(b"prof", b"\x00" * 3140)  # ~3KB ICC, like Earth_Apollo_17
         data = _minimal_avif(100, 100, extra_boxes=prof_colr)
-        config = OptimizationConfig(quality=80, strip_metadata=True)
+        config = cfg(quality=80, strip_metadata=True)
         assert _should_skip_avif_optimization(data, config) is True
 
     def test_low_skips_when_small_metadata(self):
         # 400 bytes of metadata — below the 500 B threshold
         exif_box = _box(b"Exif", b"\x00" * 392)  # 8+392 = 400
         data = _minimal_avif(100, 100, extra_boxes=exif_box)
-        config = OptimizationConfig(quality=80, strip_metadata=True)
+        config = cfg(quality=80, strip_metadata=True)
         assert _should_skip_avif_optimization(data, config) is True
 
     def test_low_skips_when_strip_metadata_false(self):
         # strip_metadata=False + LOW preset → optimizer would no-op anyway
         data = _minimal_avif(100, 100)
-        config = OptimizationConfig(quality=80, strip_metadata=False)
+        config = cfg(quality=80, strip_metadata=False)
         assert _should_skip_avif_optimization(data, config) is True
 
 
@@ -312,7 +312,7 @@ async def test_preflight_prevents_decode_on_skip():
     # Ensure the file is reasonably sized but below any bpp concern for LOW
     data = header + b"\x00" * 500
 
-    config = OptimizationConfig(quality=80, strip_metadata=True)
+    config = cfg(quality=80, strip_metadata=True)
 
     with patch.object(opt, "_open_image", side_effect=AssertionError("_open_image called")):
         result = await opt.optimize(data, config)
@@ -335,7 +335,7 @@ async def test_preflight_does_not_block_high_preset():
     header = _minimal_avif(100, 100)
     data = header + b"\x00" * 500
 
-    config = OptimizationConfig(quality=40)
+    config = cfg(quality=40)
 
     decode_called = []
 
@@ -365,7 +365,7 @@ async def test_preflight_real_avif_medium_already_compressed():
     data = buf.getvalue()
 
     bpp = (len(data) * 8) / (1000 * 1000)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     if bpp < 0.5:
         # Should be skipped without decode
@@ -390,7 +390,7 @@ async def test_preflight_real_avif_low_no_metadata():
     img.save(buf, format="AVIF", quality=80)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=80, strip_metadata=True)
+    config = cfg(quality=80, strip_metadata=True)
 
     with patch.object(opt, "_open_image", side_effect=AssertionError("decode called")):
         result = await opt.optimize(data, config)
@@ -411,7 +411,7 @@ async def test_existing_avif_tests_still_pass_high_preset():
     img.save(buf, format="AVIF", quality=95)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=40)
+    config = cfg(quality=40)
     result = await opt.optimize(data, config)
     assert result.success
     assert result.optimized_size <= result.original_size
@@ -1,29 +1,39 @@
 """Tests for GIF optimizer — quality tiers, lossless, lossy."""
 
 import io
+from functools import lru_cache
 
 import pytest
 from PIL import Image
 
 from optimizers.gif import GifOptimizer
-from schemas import OptimizationConfig
-from utils.subprocess_runner import run_tool
+from tests._cfg import cfg
+from utils.subprocess_runner import tool_available
 
-# Check if gifsicle is available
-try:
-    import asyncio
+# Cached PATH lookup — no subprocess spawn or event loop during collection
+HAS_GIFSICLE = tool_available("gifsicle")
 
-    asyncio.get_event_loop().run_until_complete(run_tool(["gifsicle", "--version"], b""))
-    HAS_GIFSICLE = True
-except (FileNotFoundError, OSError, Exception):
-    HAS_GIFSICLE = False
 
-
-@pytest.fixture
+@pytest.fixture(scope="session")
 def gif_optimizer():
     return GifOptimizer()
 
 
+# Hand-crafted minimal animated GIF: GIF89a header, 2-color GCT, two 1x1
+# image descriptors sharing one LZW-coded pixel, trailer. Pillow reports
+# n_frames=2 / is_animated=True without ever invoking its GIF encoder.
+_FRAME = b"," + b"\x00\x00\x00\x00\x01\x00\x01\x00\x00" + b"\x02" + b"\x02D\x01" + b"\x00"
+_MIN_ANIM_GIF = (
+    b"GIF89a"
+    + b"\x01\x00\x01\x00"
+    + b"\x80\x00\x00"
+    + b"\x00\x00\x00\xff\xff\xff"
+    + _FRAME * 2
+    + b";"
+)
+
+
+@lru_cache(maxsize=None)
 def _make_gif(width=100, height=100, colors=64, frames=1):
     """Create a test GIF image."""
     imgs = []
@@ -40,46 +50,29 @@ def _make_gif(width=100, height=100, colors=64, frames=1):
 
 @pytest.mark.asyncio
 @pytest.mark.skipif(not HAS_GIFSICLE, reason="gifsicle not available")
-async def test_gif_lossless_optimization(gif_optimizer):
-    """quality >= 70: lossless gifsicle --optimize=3 only."""
-    data = _make_gif()
-    config = OptimizationConfig(quality=80)
-    result = await gif_optimizer.optimize(data, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert result.method == "gifsicle"
-
-
-@pytest.mark.asyncio
-@pytest.mark.skipif(not HAS_GIFSICLE, reason="gifsicle not available")
-async def test_gif_moderate_lossy(gif_optimizer):
-    """quality 50-69: gifsicle --lossy=30 --colors=192."""
-    data = _make_gif(width=200, height=200, colors=256)
-    config = OptimizationConfig(quality=60)
-    result = await gif_optimizer.optimize(data, config)
-    assert result.success
-    assert result.optimized_size <= result.original_size
-    assert "lossy=30" in result.method
-
-
-@pytest.mark.asyncio
-@pytest.mark.skipif(not HAS_GIFSICLE, reason="gifsicle not available")
-async def test_gif_aggressive_lossy(gif_optimizer):
-    """quality < 50: gifsicle --lossy=80 --colors=128."""
-    data = _make_gif(width=200, height=200, colors=256)
-    config = OptimizationConfig(quality=30)
-    result = await gif_optimizer.optimize(data, config)
+@pytest.mark.parametrize(
+    "quality,gif_kwargs,expected_method",
+    [
+        pytest.param(80, {}, "gifsicle", id="lossless"),
+        pytest.param(60, {"width": 200, "height": 200, "colors": 256}, "lossy=30", id="moderate"),
+        pytest.param(30, {"width": 200, "height": 200, "colors": 256}, "lossy=80", id="aggressive"),
+    ],
+)
+async def test_gif_quality_tier_method(gif_optimizer, quality, gif_kwargs, expected_method):
+    """quality>=70 lossless --optimize=3, 50-69 --lossy=30, <50 --lossy=80."""
+    data = _make_gif(**gif_kwargs)
+    result = await gif_optimizer.optimize(data, cfg(quality=quality))
     assert result.success
     assert result.optimized_size <= result.original_size
-    assert "lossy=80" in result.method
+    assert expected_method in result.method
 
 
 @pytest.mark.asyncio
 @pytest.mark.skipif(not HAS_GIFSICLE, reason="gifsicle not available")
 async def test_gif_animated(gif_optimizer):
     """Animated GIF is optimized without breaking frames."""
-    data = _make_gif(frames=3)
-    config = OptimizationConfig(quality=60)
+    data = _MIN_ANIM_GIF
+    config = cfg(quality=60)
     result = await gif_optimizer.optimize(data, config)
     assert result.success
     assert result.optimized_size <= result.original_size
@@ -93,8 +86,8 @@ async def test_gif_animated(gif_optimizer):
 async def test_gif_quality_tiers(gif_optimizer):
     """Aggressive quality produces smaller or equal output."""
     data = _make_gif(width=200, height=200, colors=256)
-    result_high = await gif_optimizer.optimize(data, OptimizationConfig(quality=30))
-    result_low = await gif_optimizer.optimize(data, OptimizationConfig(quality=80))
+    result_high = await gif_optimizer.optimize(data, cfg(quality=30))
+    result_low = await gif_optimizer.optimize(data, cfg(quality=80))
     assert result_high.optimized_size <= result_low.optimized_size or (
         result_high.method == "none" and result_low.method == "none"
     )
@@ -9,12 +9,13 @@ Covers:
 
 import io
 import struct
+from functools import lru_cache
 
 import pytest
 from PIL import Image
 
 from optimizers.gif import _LARGE_ANIM_PIXEL_FRAMES, GifOptimizer, _count_gif_pixel_frames
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 from utils.subprocess_runner import run_tool
 
 # ---------------------------------------------------------------------------
@@ -228,6 +229,7 @@ def gif_optimizer():
     return GifOptimizer()
 
 
+@lru_cache(maxsize=None)
 def _make_real_gif(width: int = 100, height: int = 100, frames: int = 1) -> bytes:
     """Create a real GIF using Pillow (gifsicle can process it)."""
     imgs = []
@@ -252,7 +254,7 @@ async def test_small_gif_high_preset_includes_colors(gif_optimizer):
     w, h, f = _count_gif_pixel_frames(data)
     assert w * h * f < _LARGE_ANIM_PIXEL_FRAMES
 
-    config = OptimizationConfig(quality=30)  # HIGH preset
+    config = cfg(quality=30)  # HIGH preset
     result = await gif_optimizer.optimize(data, config)
     assert result.success
     # Either --colors was used (method contains it) or the optimizer returned "none"
@@ -265,7 +267,7 @@ async def test_small_gif_high_preset_includes_colors(gif_optimizer):
 async def test_small_gif_medium_preset_includes_colors(gif_optimizer):
     """Small GIF: MEDIUM preset must not trigger the palette-skip path."""
     data = _make_real_gif(width=100, height=100, frames=2)
-    config = OptimizationConfig(quality=60)  # MEDIUM preset
+    config = cfg(quality=60)  # MEDIUM preset
     result = await gif_optimizer.optimize(data, config)
     assert result.success
     assert "palette skipped" not in result.method
@@ -293,7 +295,7 @@ async def test_large_anim_high_preset_skips_colors(gif_optimizer):
     w, h, f = _count_gif_pixel_frames(data_large)
     assert w * h * f > _LARGE_ANIM_PIXEL_FRAMES
 
-    config = OptimizationConfig(quality=30)  # HIGH preset
+    config = cfg(quality=30)  # HIGH preset
     result = await gif_optimizer.optimize(data_large, config)
     assert result.success
     assert "palette skipped: large animation" in result.method
@@ -309,7 +311,7 @@ async def test_large_anim_medium_preset_skips_colors(gif_optimizer):
     struct.pack_into("<H", patched, 8, 10000)
     data_large = bytes(patched)
 
-    config = OptimizationConfig(quality=60)  # MEDIUM preset
+    config = cfg(quality=60)  # MEDIUM preset
     result = await gif_optimizer.optimize(data_large, config)
     assert result.success
     assert "palette skipped: large animation" in result.method
@@ -325,7 +327,7 @@ async def test_large_anim_low_preset_unaffected(gif_optimizer):
     struct.pack_into("<H", patched, 8, 10000)
     data_large = bytes(patched)
 
-    config = OptimizationConfig(quality=80)  # LOW preset
+    config = cfg(quality=80)  # LOW preset
     result = await gif_optimizer.optimize(data_large, config)
     assert result.success
     # LOW preset uses lossless-only path; "palette skipped" must never appear
@@ -2,20 +2,31 @@
 
 import io
 import shutil
+from contextlib import contextmanager
+from functools import lru_cache
 from unittest.mock import patch
 
 import pytest
 from PIL import Image
 
+from config import settings
 from optimizers.jpeg import JpegOptimizer
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _jpegtran_on_path():
+    """Pretend jpegtran is installed so the mocked run_tool path is exercised."""
+    with patch("optimizers.jpeg.tool_available", return_value=True):
+        yield
+
+
+@pytest.fixture(scope="session")
 def jpeg_optimizer():
     return JpegOptimizer()
 
 
+@lru_cache(maxsize=None)
 def _make_jpeg(quality=85, mode="RGB", size=(100, 80)):
     img = Image.new(mode, size, (128, 64, 32))
     buf = io.BytesIO()
@@ -23,6 +34,18 @@ def _make_jpeg(quality=85, mode="RGB", size=(100, 80)):
     return buf.getvalue()
 
 
+@lru_cache(maxsize=1)
+def _make_jpeg_with_exif():
+    """Create JPEG with a non-empty EXIF block (camera make tag)."""
+    img = Image.new("RGB", (20, 20), (128, 64, 32))
+    exif = img.getexif()
+    exif[0x010F] = "TestCamera"  # ImageIFD.Make
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=85, exif=exif.tobytes())
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=None)
 def _make_jpeg_rgba(size=(50, 50)):
     """Create JPEG from RGBA source (converted internally)."""
     img = Image.new("RGBA", size, (128, 64, 32, 255))
@@ -53,56 +76,54 @@ def _mock_pillow_encode_larger(self, img, quality, progressive, icc_profile, exi
     return buf.getvalue()
 
 
-@pytest.mark.asyncio
-async def test_jpeg_optimize_basic(jpeg_optimizer):
-    """Basic JPEG optimization: picks smallest of jpegli vs jpegtran."""
-    data = _make_jpeg(quality=95)
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", _mock_pillow_encode_smaller),
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        result = await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60))
-    assert result.success
-    assert result.method in ("jpegli", "jpegtran")
+# Captured once at import, before any patch.object can wrap the method — the
+# wrapper factories below always delegate to the genuine encoder.
+_PILLOW_ENCODE_ORIG = JpegOptimizer._pillow_encode
 
 
-@pytest.mark.asyncio
-async def test_jpeg_optimize_progressive(jpeg_optimizer):
-    """Progressive flag passed to Pillow encode and jpegtran."""
-    data = _make_jpeg()
-    jpegtran_calls = []
+def _recording_encode(record):
+    """Real Pillow encode that first calls record(...) with the encode arguments."""
 
-    async def capture_run_tool(cmd, data_in, **kwargs):
-        jpegtran_calls.append(cmd)
-        return data_in[: max(1, int(len(data_in) * 0.8))], b"", 0
+    def encode(self, img, quality, progressive, icc_profile, exif_bytes):
+        record(quality=quality, progressive=progressive, icc_profile=icc_profile, exif=exif_bytes)
+        return _PILLOW_ENCODE_ORIG(self, img, quality, progressive, icc_profile, exif_bytes)
+
+    return encode
 
-    pillow_calls = []
-    original_encode = JpegOptimizer._pillow_encode
 
-    def capture_pillow_encode(self, img, quality, progressive, icc_profile, exif_bytes):
-        pillow_calls.append(progressive)
-        return original_encode(self, img, quality, progressive, icc_profile, exif_bytes)
+@contextmanager
+def _pipeline(run_tool=_mock_run_tool_jpegtran, pillow_encode=None, encoder="pillow"):
+    """Patch the JPEG pipeline seams in one place.
 
+    Overrides settings.jpeg_encoder on the real singleton, stubs
+    optimizers.jpeg.run_tool, and optionally swaps _pillow_encode — the same
+    three patches every test here was chaining by hand.
+    """
     with (
-        patch.object(JpegOptimizer, "_pillow_encode", capture_pillow_encode),
-        patch("optimizers.jpeg.run_tool", side_effect=capture_run_tool),
-        patch("optimizers.jpeg.settings") as mock_settings,
+        patch.object(settings, "jpeg_encoder", encoder),
+        patch("optimizers.jpeg.run_tool", side_effect=run_tool),
     ):
-        mock_settings.jpeg_encoder = "pillow"
-        await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60, progressive_jpeg=True))
+        if pillow_encode is None:
+            yield
+        else:
+            with patch.object(JpegOptimizer, "_pillow_encode", pillow_encode):
+                yield
 
-    # Pillow should get progressive=True
-    assert any(p is True for p in pillow_calls)
-    # jpegtran should have -progressive flag
-    for call in jpegtran_calls:
-        assert "-progressive" in call
+
+@pytest.mark.asyncio
+async def test_jpeg_optimize_basic(jpeg_optimizer):
+    """Basic JPEG optimization: picks smallest of jpegli vs jpegtran."""
+    data = _make_jpeg(quality=95)
+    with _pipeline(pillow_encode=_mock_pillow_encode_smaller):
+        result = await jpeg_optimizer.optimize(data, cfg(quality=60))
+    assert result.success
+    assert result.method in ("jpegli", "jpegtran")
 
 
 @pytest.mark.asyncio
-async def test_jpeg_optimize_no_progressive(jpeg_optimizer):
-    """No progressive flag when progressive_jpeg=False."""
+@pytest.mark.parametrize("progressive", [True, False], ids=["progressive", "baseline"])
+async def test_jpeg_optimize_progressive_flag(jpeg_optimizer, progressive):
+    """progressive_jpeg reaches both the Pillow encode and the jpegtran command."""
     data = _make_jpeg()
     jpegtran_calls = []
 
@@ -111,23 +132,15 @@ async def test_jpeg_optimize_no_progressive(jpeg_optimizer):
         return data_in[: max(1, int(len(data_in) * 0.8))], b"", 0
 
     pillow_calls = []
-    original_encode = JpegOptimizer._pillow_encode
+    capture_pillow_encode = _recording_encode(lambda **kw: pillow_calls.append(kw["progressive"]))
 
-    def capture_pillow_encode(self, img, quality, progressive, icc_profile, exif_bytes):
-        pillow_calls.append(progressive)
-        return original_encode(self, img, quality, progressive, icc_profile, exif_bytes)
+    with _pipeline(run_tool=capture_run_tool, pillow_encode=capture_pillow_encode):
+        await jpeg_optimizer.optimize(data, cfg(quality=60, progressive_jpeg=progressive))
 
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", capture_pillow_encode),
-        patch("optimizers.jpeg.run_tool", side_effect=capture_run_tool),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60, progressive_jpeg=False))
-
-    assert all(p is False for p in pillow_calls)
+    assert pillow_calls and all(p is progressive for p in pillow_calls)
+    assert jpegtran_calls
     for call in jpegtran_calls:
-        assert "-progressive" not in call
+        assert ("-progressive" in call) is progressive
 
 
 @pytest.mark.asyncio
@@ -135,22 +148,10 @@ async def test_jpeg_max_reduction_triggers_cap(jpeg_optimizer):
     """max_reduction caps Pillow lossy when reduction exceeds limit."""
     data = _make_jpeg(quality=95, size=(200, 200))
     encode_calls = []
+    counting_encode = _recording_encode(lambda **kw: encode_calls.append(kw["quality"]))
 
-    original_encode = JpegOptimizer._pillow_encode
-
-    def counting_encode(self, img, quality, progressive, icc_profile, exif_bytes):
-        encode_calls.append(quality)
-        return original_encode(self, img, quality, progressive, icc_profile, exif_bytes)
-
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", counting_encode),
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        result = await jpeg_optimizer.optimize(
-            data, OptimizationConfig(quality=60, max_reduction=5.0)
-        )
+    with _pipeline(pillow_encode=counting_encode):
+        result = await jpeg_optimizer.optimize(data, cfg(quality=60, max_reduction=5.0))
     assert result.success
     # Binary search should trigger additional encodes (initial 1 + cap search)
     assert len(encode_calls) > 1
@@ -161,15 +162,8 @@ async def test_jpeg_max_reduction_q100_exceeds_cap(jpeg_optimizer):
     """max_reduction: even q=100 exceeds cap -> returns original data."""
     data = _make_jpeg(quality=95, size=(200, 200))
 
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", _mock_pillow_encode_smaller),
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        result = await jpeg_optimizer.optimize(
-            data, OptimizationConfig(quality=60, max_reduction=0.1)
-        )
+    with _pipeline(pillow_encode=_mock_pillow_encode_smaller):
+        result = await jpeg_optimizer.optimize(data, cfg(quality=60, max_reduction=0.1))
     assert result.success
 
 
@@ -183,13 +177,8 @@ async def test_jpeg_jpegtran_wins(jpeg_optimizer):
             return data_in[: max(1, int(len(data_in) * 0.5))], b"", 0  # Much smaller
         return data_in, b"", 0
 
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", _mock_pillow_encode_larger),
-        patch("optimizers.jpeg.run_tool", side_effect=mock_run_tool),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        result = await jpeg_optimizer.optimize(data, OptimizationConfig(quality=80))
+    with _pipeline(run_tool=mock_run_tool, pillow_encode=_mock_pillow_encode_larger):
+        result = await jpeg_optimizer.optimize(data, cfg(quality=80))
     assert result.method == "jpegtran"
 
 
@@ -202,12 +191,8 @@ async def test_jpeg_mode_conversion_rgba(jpeg_optimizer):
     img.convert("RGB").save(buf, format="JPEG", quality=85)
     data = buf.getvalue()
 
-    with (
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        result = await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60))
+    with _pipeline():
+        result = await jpeg_optimizer.optimize(data, cfg(quality=60))
     assert result.success
 
 
@@ -220,42 +205,23 @@ async def test_jpeg_mode_conversion_cmyk(jpeg_optimizer):
     img.convert("RGB").save(buf, format="JPEG", quality=85)
     data = buf.getvalue()
 
-    with (
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        result = await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60))
+    with _pipeline():
+        result = await jpeg_optimizer.optimize(data, cfg(quality=60))
     assert result.success
 
 
 @pytest.mark.asyncio
 async def test_jpeg_metadata_preserved(jpeg_optimizer):
     """Metadata preserved when strip_metadata=False."""
-    # Create JPEG with EXIF data using Pillow's built-in Exif class
-    img = Image.new("RGB", (20, 20), (128, 64, 32))
-    exif = img.getexif()
-    exif[0x010F] = "TestCamera"  # ImageIFD.Make
-    exif_bytes = exif.tobytes()
-
-    buf = io.BytesIO()
-    img.save(buf, format="JPEG", quality=85, exif=exif_bytes)
-    data = buf.getvalue()
+    data = _make_jpeg_with_exif()
 
     encode_kwargs = []
-    original_encode = JpegOptimizer._pillow_encode
-
-    def capture_encode(self, img, quality, progressive, icc_profile, exif_b):
-        encode_kwargs.append({"icc_profile": icc_profile, "exif": exif_b})
-        return original_encode(self, img, quality, progressive, icc_profile, exif_b)
+    capture_encode = _recording_encode(
+        lambda **kw: encode_kwargs.append({"icc_profile": kw["icc_profile"], "exif": kw["exif"]})
+    )
 
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", capture_encode),
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60, strip_metadata=False))
+    with _pipeline(pillow_encode=capture_encode):
+        await jpeg_optimizer.optimize(data, cfg(quality=60, strip_metadata=False))
 
     # EXIF bytes should have been passed to encoder
     assert any(kw["exif"] is not None for kw in encode_kwargs)
@@ -264,25 +230,15 @@ async def test_jpeg_metadata_preserved(jpeg_optimizer):
 @pytest.mark.asyncio
 async def test_jpeg_metadata_stripped(jpeg_optimizer):
     """Metadata stripped when strip_metadata=True (default)."""
-    img = Image.new("RGB", (20, 20), (128, 64, 32))
-    buf = io.BytesIO()
-    img.save(buf, format="JPEG", quality=85)
-    data = buf.getvalue()
+    data = _make_jpeg(quality=85, size=(20, 20))
 
     encode_kwargs = []
-    original_encode = JpegOptimizer._pillow_encode
+    capture_encode = _recording_encode(
+        lambda **kw: encode_kwargs.append({"icc_profile": kw["icc_profile"], "exif": kw["exif"]})
+    )
 
-    def capture_encode(self, img, quality, progressive, icc_profile, exif_b):
-        encode_kwargs.append({"icc_profile": icc_profile, "exif": exif_b})
-        return original_encode(self, img, quality, progressive, icc_profile, exif_b)
-
-    with (
-        patch.object(JpegOptimizer, "_pillow_encode", capture_encode),
-        patch("optimizers.jpeg.run_tool", side_effect=_mock_run_tool_jpegtran),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "pillow"
-        await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60, strip_metadata=True))
+    with _pipeline(pillow_encode=capture_encode):
+        await jpeg_optimizer.optimize(data, cfg(quality=60, strip_metadata=True))
 
     # No metadata should be passed
     assert all(kw["icc_profile"] is None for kw in encode_kwargs)
@@ -301,12 +257,8 @@ async def test_jpeg_cjpeg_fallback(jpeg_optimizer):
             return data_in[: max(1, int(len(data_in) * 0.9))], b"", 0
         return data_in, b"", 0
 
-    with (
-        patch("optimizers.jpeg.run_tool", side_effect=mock_run_tool),
-        patch("optimizers.jpeg.settings") as mock_settings,
-    ):
-        mock_settings.jpeg_encoder = "cjpeg"
-        result = await jpeg_optimizer.optimize(data, OptimizationConfig(quality=60))
+    with _pipeline(run_tool=mock_run_tool, encoder="cjpeg"):
+        result = await jpeg_optimizer.optimize(data, cfg(quality=60))
     assert result.success
     assert result.method in ("mozjpeg", "jpegtran")
 
@@ -314,12 +266,11 @@ async def test_jpeg_cjpeg_fallback(jpeg_optimizer):
 # --- Additional JPEG coverage tests ---
 
 
-def _jpeg_from_img(img: Image.Image, quality: int = 90) -> bytes:
-    """Helper: save a Pillow image as JPEG bytes."""
+@lru_cache(maxsize=None)
+def _jpeg_from_img(size=(64, 64), color=(100, 150, 200), quality=90):
+    """Encode a flat RGB test image as JPEG bytes, once per argument combination."""
     buf = io.BytesIO()
-    if img.mode not in ("RGB", "L", "CMYK"):
-        img = img.convert("RGB")
-    img.save(buf, format="JPEG", quality=quality)
+    Image.new("RGB", size, color).save(buf, format="JPEG", quality=quality)
     return buf.getvalue()
 
 
@@ -333,7 +284,7 @@ async def test_jpeg_optimizer_cmyk_mode():
     img.save(buf, format="JPEG")
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
 
@@ -357,7 +308,7 @@ async def test_jpeg_optimizer_icc_profile_preservation():
     img.save(buf, format="JPEG", icc_profile=icc_data)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=60, strip_metadata=False)
+    config = cfg(quality=60, strip_metadata=False)
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
 
@@ -373,7 +324,7 @@ async def test_jpeg_optimizer_max_reduction_cap():
     img.save(buf, format="JPEG", quality=95)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=30, max_reduction=10.0)
+    config = cfg(quality=30, max_reduction=10.0)
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
 
@@ -389,7 +340,7 @@ async def test_jpeg_optimizer_max_reduction_exceeds_cap():
     img.save(buf, format="JPEG", quality=100)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=10, max_reduction=0.01)
+    config = cfg(quality=10, max_reduction=0.01)
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
 
@@ -399,19 +350,16 @@ async def test_jpeg_optimizer_cjpeg_path():
     """Cover the cjpeg legacy pipeline."""
     opt = JpegOptimizer()
 
-    img = Image.new("RGB", (64, 64), (100, 150, 200))
-    data = _jpeg_from_img(img, quality=90)
-    small_jpeg = _jpeg_from_img(img, quality=50)
+    data = _jpeg_from_img(quality=90)
+    small_jpeg = _jpeg_from_img(quality=50)
 
     async def mock_run_tool(cmd, input_data, **kwargs):
         return small_jpeg, b"", 0
 
-    config = OptimizationConfig(quality=60)
-    with patch("optimizers.jpeg.settings") as mock_settings:
-        mock_settings.jpeg_encoder = "cjpeg"
-        with patch("optimizers.jpeg.run_tool", side_effect=mock_run_tool):
-            result = await opt._optimize_cjpeg(data, config)
-            assert result.original_size == len(data)
+    config = cfg(quality=60)
+    with _pipeline(run_tool=mock_run_tool, encoder="cjpeg"):
+        result = await opt._optimize_cjpeg(data, config)
+        assert result.original_size == len(data)
 
 
 @pytest.mark.asyncio
@@ -419,8 +367,7 @@ async def test_jpeg_optimizer_cjpeg_max_reduction():
     """Cover cjpeg _cap_mozjpeg binary search."""
     opt = JpegOptimizer()
 
-    img = Image.new("RGB", (128, 128), (200, 100, 50))
-    data = _jpeg_from_img(img, quality=95)
+    data = _jpeg_from_img(size=(128, 128), color=(200, 100, 50), quality=95)
 
     async def mock_run_tool(cmd, input_data, **kwargs):
         if "cjpeg" in cmd:
@@ -431,12 +378,10 @@ async def test_jpeg_optimizer_cjpeg_max_reduction():
             return data[: max(size, 100)], b"", 0
         return data, b"", 0
 
-    config = OptimizationConfig(quality=30, max_reduction=5.0)
-    with patch("optimizers.jpeg.settings") as mock_settings:
-        mock_settings.jpeg_encoder = "cjpeg"
-        with patch("optimizers.jpeg.run_tool", side_effect=mock_run_tool):
-            result = await opt._optimize_cjpeg(data, config)
-            assert result.original_size == len(data)
+    config = cfg(quality=30, max_reduction=5.0)
+    with _pipeline(run_tool=mock_run_tool, encoder="cjpeg"):
+        result = await opt._optimize_cjpeg(data, config)
+        assert result.original_size == len(data)
 
 
 @pytest.mark.asyncio
@@ -444,8 +389,7 @@ async def test_jpeg_cjpeg_progressive():
     """Cover cjpeg progressive flag."""
     opt = JpegOptimizer()
 
-    img = Image.new("RGB", (64, 64), (100, 150, 200))
-    data = _jpeg_from_img(img, quality=90)
+    data = _jpeg_from_img(quality=90)
 
     called_with_progressive = [False]
 
@@ -454,20 +398,17 @@ async def test_jpeg_cjpeg_progressive():
             called_with_progressive[0] = True
         return data, b"", 0
 
-    config = OptimizationConfig(quality=60, progressive_jpeg=True)
-    with patch("optimizers.jpeg.settings") as mock_settings:
-        mock_settings.jpeg_encoder = "cjpeg"
-        with patch("optimizers.jpeg.run_tool", side_effect=mock_run_tool):
-            await opt._optimize_cjpeg(data, config)
-            assert called_with_progressive[0]
+    config = cfg(quality=60, progressive_jpeg=True)
+    with _pipeline(run_tool=mock_run_tool, encoder="cjpeg"):
+        await opt._optimize_cjpeg(data, config)
+        assert called_with_progressive[0]
 
 
 def test_jpeg_decode_to_bmp_rgba():
     """Cover _decode_to_bmp RGBA conversion."""
     opt = JpegOptimizer()
 
-    img = Image.new("RGB", (32, 32), (100, 150, 200))
-    data = _jpeg_from_img(img)
+    data = _jpeg_from_img(size=(32, 32))
 
     with patch("optimizers.jpeg.Image.open") as mock_open:
         mock_open.return_value = Image.new("RGBA", (32, 32), (100, 150, 200, 255))
@@ -480,8 +421,7 @@ def test_jpeg_decode_to_bmp_unusual_mode():
     """Cover _decode_to_bmp unusual mode conversion."""
     opt = JpegOptimizer()
 
-    img = Image.new("RGB", (32, 32), (100, 150, 200))
-    data = _jpeg_from_img(img)
+    data = _jpeg_from_img(size=(32, 32))
 
     with patch("optimizers.jpeg.Image.open") as mock_open:
         mock_open.return_value = Image.new("CMYK", (32, 32), (0, 0, 0, 0))
@@ -1,10 +1,13 @@
 """Tests for JXL optimizer — basic optimization, metadata strip, quality tiers."""
 
 import io
+from functools import lru_cache
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tests._cfg import cfg
+
 try:
     try:
         import pillow_jxl  # noqa: F401
@@ -22,7 +25,6 @@ except (ImportError, KeyError, Exception):
 from PIL import Image
 
 from optimizers.jxl import JxlOptimizer
-from schemas import OptimizationConfig
 
 
 @pytest.fixture
@@ -30,6 +32,7 @@ def jxl_optimizer():
     return JxlOptimizer()
 
 
+@lru_cache(maxsize=None)
 def _make_jxl(quality=90, size=(100, 100)):
     img = Image.new("RGB", size, (100, 150, 200))
     buf = io.BytesIO()
@@ -42,7 +45,7 @@ def _make_jxl(quality=90, size=(100, 100)):
 async def test_jxl_basic_optimization(jxl_optimizer):
     """JXL optimizer produces valid output not larger than input."""
     data = _make_jxl(quality=95)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await jxl_optimizer.optimize(data, config)
     assert result.success
     assert result.optimized_size <= result.original_size
@@ -54,7 +57,7 @@ async def test_jxl_basic_optimization(jxl_optimizer):
 async def test_jxl_metadata_strip(jxl_optimizer):
     """JXL metadata strip path runs without error."""
     data = _make_jxl(quality=90)
-    config = OptimizationConfig(quality=80, strip_metadata=True)
+    config = cfg(quality=80, strip_metadata=True)
     result = await jxl_optimizer.optimize(data, config)
     assert result.success
     assert result.optimized_size <= result.original_size
@@ -65,8 +68,8 @@ async def test_jxl_metadata_strip(jxl_optimizer):
 async def test_jxl_quality_tiers(jxl_optimizer):
     """Higher quality (lower aggressiveness) produces larger or equal output."""
     data = _make_jxl(quality=95, size=(200, 200))
-    result_high = await jxl_optimizer.optimize(data, OptimizationConfig(quality=40))
-    result_low = await jxl_optimizer.optimize(data, OptimizationConfig(quality=80))
+    result_high = await jxl_optimizer.optimize(data, cfg(quality=40))
+    result_low = await jxl_optimizer.optimize(data, cfg(quality=80))
     # Aggressive quality should produce smaller or equal output
     assert result_high.optimized_size <= result_low.optimized_size or (
         result_high.method == "none" and result_low.method == "none"
@@ -78,7 +81,7 @@ async def test_jxl_quality_tiers(jxl_optimizer):
 async def test_jxl_already_optimized(jxl_optimizer):
     """Low-quality JXL at conservative settings returns original."""
     data = _make_jxl(quality=30, size=(64, 64))
-    config = OptimizationConfig(quality=80)
+    config = cfg(quality=80)
     result = await jxl_optimizer.optimize(data, config)
     assert result.success
     # Output should not be larger than input (guarantee)
@@ -130,7 +133,7 @@ async def test_jxl_optimizer_both_fail():
     with patch.object(opt, "_open_image", return_value=mock_img):
         with patch.object(opt, "_strip_metadata_from_img", side_effect=Exception("fail")):
             with patch.object(opt, "_reencode_from_img", side_effect=Exception("fail")):
-                config = OptimizationConfig(quality=60, strip_metadata=True)
+                config = cfg(quality=60, strip_metadata=True)
                 result = await opt.optimize(data, config)
                 assert result.method == "none"
 
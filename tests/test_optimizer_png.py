@@ -10,17 +10,20 @@ Covers:
 
 import struct
 import zlib
+from functools import lru_cache
 from unittest.mock import patch
 
 import pytest
 
 from optimizers.png import LARGE_MP_THRESHOLD, _read_apng_frame_count, _read_png_dimensions
+from tests._cfg import cfg
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_png(width: int, height: int, color: tuple = (128, 0, 0)) -> bytes:
     """Build a minimal valid RGB PNG (single solid color, no compression tricks)."""
     sig = b"\x89PNG\r\n\x1a\n"
@@ -107,12 +110,11 @@ def test_large_mp_threshold_boundary():
 async def test_png_lossless_always_level2():
     """quality >= 70 always uses oxipng level 2, regardless of image size."""
     from optimizers.png import PngOptimizer
-    from schemas import OptimizationConfig
 
     # Small PNG, lossless quality
     png = _make_png(10, 10)
     opt = PngOptimizer()
-    result = await opt.optimize(png, OptimizationConfig(quality=80, png_lossy=False))
+    result = await opt.optimize(png, cfg(quality=80, png_lossy=False))
     assert result.format in ("png", "apng")
     assert result.optimized_size <= len(png)
 
@@ -121,12 +123,11 @@ async def test_png_lossless_always_level2():
 async def test_png_small_lossy_path_succeeds():
     """Small PNG (well under LARGE_MP_THRESHOLD) on aggressive quality uses level 4 path."""
     from optimizers.png import PngOptimizer
-    from schemas import OptimizationConfig
 
     # 100x100 = 10K pixels — tiny, should use level 4 (no cap)
     png = _make_png(100, 100)
     opt = PngOptimizer()
-    result = await opt.optimize(png, OptimizationConfig(quality=40, png_lossy=True))
+    result = await opt.optimize(png, cfg(quality=40, png_lossy=True))
     assert result.format in ("png", "apng")
     # Result must never be larger than input (output guarantee)
     assert result.optimized_size <= len(png)
@@ -142,7 +143,6 @@ async def test_png_large_synthetic_uses_level2():
     the level argument while still returning valid oxipng output.
     """
     from optimizers.png import PngOptimizer
-    from schemas import OptimizationConfig
 
     # A tiny real PNG — oxipng can process it without error
     png = _make_png(10, 10)
@@ -160,7 +160,7 @@ async def test_png_large_synthetic_uses_level2():
         patch("optimizers.png._read_png_dimensions", return_value=(2001, 2001)),
         patch.object(opt, "_run_oxipng", side_effect=capture),
     ):
-        result = await opt.optimize(png, OptimizationConfig(quality=40, png_lossy=False))
+        result = await opt.optimize(png, cfg(quality=40, png_lossy=False))
 
     assert result.format in ("png", "apng")
     assert levels_called == [2], f"expected [2], got {levels_called}"
@@ -237,6 +237,7 @@ def _chunk(t: bytes, d: bytes) -> bytes:
     return length + t + d + crc
 
 
+@lru_cache(maxsize=None)
 def _make_apng_bytes(width: int, height: int, num_frames: int) -> bytes:
     """Build a minimal but structurally valid APNG with acTL chunk.
 
@@ -258,6 +259,7 @@ def _make_apng_bytes(width: int, height: int, num_frames: int) -> bytes:
     return sig + ihdr + actl + idat + iend
 
 
+@lru_cache(maxsize=None)
 def _make_pillow_apng(width: int, height: int, num_frames: int) -> bytes:
     """Build a real APNG using Pillow (valid IDAT + fcTL + fdAT structure)."""
     import io
@@ -309,7 +311,6 @@ def test_read_apng_frame_count_pillow_apng():
 async def test_apng_small_uses_level_4_high_preset():
     """Small APNG at quality=40 (HIGH) must use oxipng level 4."""
     from optimizers.png import PngOptimizer
-    from schemas import OptimizationConfig
 
     # 10x10 x 2 frames = 200 total pixel-frames, well under 4M budget
     apng = _make_pillow_apng(10, 10, 2)
@@ -323,7 +324,7 @@ async def test_apng_small_uses_level_4_high_preset():
         return original_run(data, level)
 
     with patch.object(opt, "_run_oxipng", side_effect=capture):
-        result = await opt.optimize(apng, OptimizationConfig(quality=40, png_lossy=True))
+        result = await opt.optimize(apng, cfg(quality=40, png_lossy=True))
 
     assert result.format == "apng"
     assert levels_called == [4], f"expected [4], got {levels_called}"
@@ -333,7 +334,6 @@ async def test_apng_small_uses_level_4_high_preset():
 async def test_apng_large_uses_level_2_high_preset():
     """APNG whose total pixel-frames exceed 4M must use oxipng level 2 even at quality=40."""
     from optimizers.png import PngOptimizer
-    from schemas import OptimizationConfig
 
     # Use a small synthetic APNG but mock _read_apng_frame_count to simulate a large animation.
     # 100x100 * 500 frames = 5_000_000 total pixel-frames (> LARGE_MP_THRESHOLD)
@@ -352,7 +352,7 @@ async def test_apng_large_uses_level_2_high_preset():
         patch("optimizers.png._read_apng_frame_count", return_value=500),
         patch.object(opt, "_run_oxipng", side_effect=capture),
     ):
-        result = await opt.optimize(apng, OptimizationConfig(quality=40, png_lossy=True))
+        result = await opt.optimize(apng, cfg(quality=40, png_lossy=True))
 
     assert result.format == "apng"
     assert levels_called == [2], f"expected [2], got {levels_called}"
@@ -362,7 +362,6 @@ async def test_apng_large_uses_level_2_high_preset():
 async def test_apng_lossless_quality_uses_level_2():
     """quality >= 70 (LOW preset) must always use level 2 regardless of APNG size."""
     from optimizers.png import PngOptimizer
-    from schemas import OptimizationConfig
 
     # Small APNG — would qualify for level 4 by size, but quality=80 overrides
     apng = _make_pillow_apng(10, 10, 2)
@@ -376,7 +375,7 @@ async def test_apng_lossless_quality_uses_level_2():
         return original_run(data, level)
 
     with patch.object(opt, "_run_oxipng", side_effect=capture):
-        result = await opt.optimize(apng, OptimizationConfig(quality=80, png_lossy=False))
+        result = await opt.optimize(apng, cfg(quality=80, png_lossy=False))
 
     assert result.format == "apng"
     assert levels_called == [2], f"expected [2], got {levels_called}"
@@ -1,13 +1,14 @@
 """Tests for PNG optimizer with mocked CLI tools (pngquant, oxipng)."""
 
 import io
+from functools import lru_cache
 from unittest.mock import patch
 
 import pytest
 from PIL import Image
 
 from optimizers.png import PngOptimizer
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 from utils.format_detect import ImageFormat
 
 
@@ -16,6 +17,7 @@ def png_optimizer():
     return PngOptimizer()
 
 
+@lru_cache(maxsize=None)
 def _make_png(mode="RGB", size=(100, 100), color=(128, 64, 32)):
     img = Image.new(mode, size, color)
     buf = io.BytesIO()
@@ -23,6 +25,7 @@ def _make_png(mode="RGB", size=(100, 100), color=(128, 64, 32)):
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_apng():
     """Create a minimal APNG (contains acTL chunk)."""
     frames = [Image.new("RGB", (10, 10), (i * 50, 0, 0)) for i in range(2)]
@@ -40,7 +43,7 @@ async def test_png_lossless_path(png_optimizer):
         return d[: max(1, int(len(d) * 0.9))]
 
     with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-        result = await png_optimizer.optimize(data, OptimizationConfig(quality=80, png_lossy=False))
+        result = await png_optimizer.optimize(data, cfg(quality=80, png_lossy=False))
     assert result.success
     assert result.method == "oxipng"
 
@@ -56,7 +59,7 @@ async def test_png_lossless_with_strip_metadata(png_optimizer):
     with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
         with patch("optimizers.png.strip_metadata_selective", return_value=data):
             result = await png_optimizer.optimize(
-                data, OptimizationConfig(quality=80, png_lossy=False, strip_metadata=True)
+                data, cfg(quality=80, png_lossy=False, strip_metadata=True)
             )
     assert result.success
 
@@ -75,9 +78,7 @@ async def test_png_lossy_pngquant_success(png_optimizer):
 
     with patch.object(png_optimizer, "_run_pngquant", side_effect=mock_pngquant):
         with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-            result = await png_optimizer.optimize(
-                data, OptimizationConfig(quality=60, png_lossy=True)
-            )
+            result = await png_optimizer.optimize(data, cfg(quality=60, png_lossy=True))
     assert result.success
 
 
@@ -94,9 +95,7 @@ async def test_png_lossy_pngquant_fail_exit99(png_optimizer):
 
     with patch.object(png_optimizer, "_run_pngquant", side_effect=mock_pngquant):
         with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-            result = await png_optimizer.optimize(
-                data, OptimizationConfig(quality=60, png_lossy=True)
-            )
+            result = await png_optimizer.optimize(data, cfg(quality=60, png_lossy=True))
     assert result.success
     assert result.method == "oxipng"
 
@@ -118,9 +117,7 @@ async def test_png_lossy_oxipng_wins_over_pngquant(png_optimizer):
 
     with patch.object(png_optimizer, "_run_pngquant", side_effect=mock_pngquant):
         with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-            result = await png_optimizer.optimize(
-                data, OptimizationConfig(quality=60, png_lossy=True)
-            )
+            result = await png_optimizer.optimize(data, cfg(quality=60, png_lossy=True))
     assert result.method == "oxipng"
 
 
@@ -139,7 +136,7 @@ async def test_png_quality_aggressive_settings(png_optimizer):
 
     with patch.object(png_optimizer, "_run_pngquant", side_effect=mock_pngquant):
         with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-            await png_optimizer.optimize(data, OptimizationConfig(quality=40, png_lossy=True))
+            await png_optimizer.optimize(data, cfg(quality=40, png_lossy=True))
     assert pngquant_calls[0]["max_colors"] == 64
     assert pngquant_calls[0]["speed"] == 3
 
@@ -159,7 +156,7 @@ async def test_png_quality_moderate_settings(png_optimizer):
 
     with patch.object(png_optimizer, "_run_pngquant", side_effect=mock_pngquant):
         with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-            await png_optimizer.optimize(data, OptimizationConfig(quality=60, png_lossy=True))
+            await png_optimizer.optimize(data, cfg(quality=60, png_lossy=True))
     assert pngquant_calls[0]["max_colors"] == 256
     assert pngquant_calls[0]["speed"] == 4
 
@@ -173,7 +170,7 @@ async def test_png_apng_uses_oxipng_only(png_optimizer):
         return d[: max(1, int(len(d) * 0.9))]
 
     with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
-        result = await png_optimizer.optimize(data, OptimizationConfig(quality=60, png_lossy=True))
+        result = await png_optimizer.optimize(data, cfg(quality=60, png_lossy=True))
     assert result.method == "oxipng"
     assert png_optimizer.format == ImageFormat.APNG
 
@@ -217,7 +214,7 @@ async def test_png_strip_metadata_not_lossy(png_optimizer):
     with patch("optimizers.png.strip_metadata_selective", return_value=data) as mock_strip:
         with patch.object(png_optimizer, "_run_oxipng", side_effect=mock_oxipng):
             result = await png_optimizer.optimize(
-                data, OptimizationConfig(quality=80, png_lossy=False, strip_metadata=True)
+                data, cfg(quality=80, png_lossy=False, strip_metadata=True)
             )
     mock_strip.assert_called_once()
     assert result.success
@@ -228,6 +225,6 @@ async def test_png_optimizer_no_strip_metadata(png_optimizer):
     """Cover PngOptimizer with strip_metadata=False."""
     data = _make_png()
 
-    config = OptimizationConfig(quality=60, strip_metadata=False)
+    config = cfg(quality=60, strip_metadata=False)
     result = await png_optimizer.optimize(data, config)
     assert result.original_size == len(data)
@@ -62,5 +62,5 @@ def test_binary_search_max_iterations():
         return b"x" * max(1, size)
 
     binary_search_quality(encode_fn, 1000, target_reduction=30.0, lo=1, hi=100, max_iters=3)
-    # 1 call for q=100 check + up to 3 iterations
-    assert call_count <= 4
+    # 1 call for q=100 check + up to 2 for the secant step + up to 3 iterations
+    assert call_count <= 6
@@ -1,13 +1,14 @@
 """Tests for WebP optimizer — binary search cap, max_reduction, and method routing."""
 
 import io
+from functools import lru_cache
 from unittest.mock import patch
 
 import pytest
 from PIL import Image
 
 from optimizers.webp import WebpOptimizer
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 
 @pytest.fixture
@@ -15,6 +16,7 @@ def webp_optimizer():
     return WebpOptimizer()
 
 
+@lru_cache(maxsize=None)
 def _make_webp(quality=95, size=(100, 100)):
     img = Image.new("RGB", size, (255, 0, 0))
     buf = io.BytesIO()
@@ -26,7 +28,7 @@ def test_find_capped_quality_uses_predecoded_image(webp_optimizer):
     """_find_capped_quality uses a pre-decoded image, no Image.open calls."""
     data = _make_webp(quality=95, size=(200, 200))
     img, is_animated = webp_optimizer._decode_image(data)
-    config = OptimizationConfig(quality=60, max_reduction=5.0)
+    config = cfg(quality=60, max_reduction=5.0)
 
     with patch("optimizers.webp.Image.open") as mock_open:
         webp_optimizer._find_capped_quality(img, is_animated, data, config, enc_method=3)
@@ -39,7 +41,7 @@ async def test_webp_find_capped_quality_binary_search(webp_optimizer):
     """Binary search finds quality within max_reduction cap."""
     data = _make_webp(quality=95, size=(200, 200))
     img, is_animated = webp_optimizer._decode_image(data)
-    config = OptimizationConfig(quality=60, max_reduction=5.0)
+    config = cfg(quality=60, max_reduction=5.0)
 
     result = webp_optimizer._find_capped_quality(img, is_animated, data, config, enc_method=3)
     # Should return some bytes (binary search found a quality)
@@ -57,7 +59,7 @@ async def test_webp_find_capped_quality_q100_exceeds(webp_optimizer):
     data = buf.getvalue()
 
     decoded_img, is_animated = webp_optimizer._decode_image(data)
-    config = OptimizationConfig(quality=1, max_reduction=0.001)
+    config = cfg(quality=1, max_reduction=0.001)
 
     with patch.object(webp_optimizer, "_encode_webp") as mock_enc:
         # q=100 produces output that's 10% of input -> 90% reduction > 0.001%
@@ -79,9 +81,7 @@ async def test_webp_max_reduction_triggers_find_capped(webp_optimizer):
         with patch.object(
             webp_optimizer, "_find_capped_quality", return_value=b"capped"
         ) as mock_cap:
-            result = await webp_optimizer.optimize(
-                data, OptimizationConfig(quality=60, max_reduction=5.0)
-            )
+            result = await webp_optimizer.optimize(data, cfg(quality=60, max_reduction=5.0))
     mock_cap.assert_called_once()
     assert result.method == "pillow-m3"
 
@@ -96,7 +96,7 @@ async def test_webp_optimizer_max_reduction_binary_search():
     img.save(buf, format="WEBP", quality=100)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=20, max_reduction=5.0)
+    config = cfg(quality=20, max_reduction=5.0)
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
 
@@ -131,55 +131,28 @@ class TestWebpMethodRouting:
 
 
 @pytest.mark.asyncio
-async def test_high_preset_encode_called_with_method4(webp_optimizer):
-    """optimize() with quality=40 (HIGH) passes method=4 to _encode_webp."""
+@pytest.mark.parametrize(
+    "quality,expected_method",
+    [
+        pytest.param(40, 4, id="high-m4"),
+        pytest.param(60, 3, id="medium-m3"),
+        pytest.param(80, 3, id="low-m3"),
+    ],
+)
+async def test_preset_encode_method(webp_optimizer, quality, expected_method):
+    """optimize() passes the preset-appropriate cwebp method to every _encode_webp call."""
     data = _make_webp(quality=95, size=(100, 100))
 
     with patch.object(
         webp_optimizer, "_encode_webp", wraps=webp_optimizer._encode_webp
     ) as mock_enc:
-        await webp_optimizer.optimize(data, OptimizationConfig(quality=40))
+        await webp_optimizer.optimize(data, cfg(quality=quality))
 
-    # Every _encode_webp call must have method=4
     assert mock_enc.call_count >= 1
     for c in mock_enc.call_args_list:
         assert (
-            c.args[3] == 4 or c.kwargs.get("method") == 4
-        ), f"Expected method=4 for HIGH preset, got call args: {c}"
-
-
-@pytest.mark.asyncio
-async def test_medium_preset_encode_called_with_method3(webp_optimizer):
-    """optimize() with quality=60 (MEDIUM) passes method=3 to _encode_webp."""
-    data = _make_webp(quality=95, size=(100, 100))
-
-    with patch.object(
-        webp_optimizer, "_encode_webp", wraps=webp_optimizer._encode_webp
-    ) as mock_enc:
-        await webp_optimizer.optimize(data, OptimizationConfig(quality=60))
-
-    assert mock_enc.call_count >= 1
-    for c in mock_enc.call_args_list:
-        assert (
-            c.args[3] == 3 or c.kwargs.get("method") == 3
-        ), f"Expected method=3 for MEDIUM preset, got call args: {c}"
-
-
-@pytest.mark.asyncio
-async def test_low_preset_encode_called_with_method3(webp_optimizer):
-    """optimize() with quality=80 (LOW) passes method=3 to _encode_webp."""
-    data = _make_webp(quality=95, size=(100, 100))
-
-    with patch.object(
-        webp_optimizer, "_encode_webp", wraps=webp_optimizer._encode_webp
-    ) as mock_enc:
-        await webp_optimizer.optimize(data, OptimizationConfig(quality=80))
-
-    assert mock_enc.call_count >= 1
-    for c in mock_enc.call_args_list:
-        assert (
-            c.args[3] == 3 or c.kwargs.get("method") == 3
-        ), f"Expected method=3 for LOW preset, got call args: {c}"
+            c.args[3] == expected_method or c.kwargs.get("method") == expected_method
+        ), f"Expected method={expected_method} for quality={quality}, got call args: {c}"
 
 
 @pytest.mark.asyncio
@@ -200,7 +173,7 @@ async def test_max_reduction_path_uses_same_method_as_initial_encode(webp_optimi
     noise_img.save(buf, format="WEBP", quality=100)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=60, max_reduction=5.0)  # will be exceeded for noise img
+    config = cfg(quality=60, max_reduction=5.0)  # will be exceeded for noise img
 
     observed_methods: list[int] = []
 
@@ -225,8 +198,8 @@ async def test_result_method_string_reflects_encode_method(webp_optimizer):
     """OptimizeResult.method includes the libwebp method number for traceability."""
     data = _make_webp(quality=95, size=(100, 100))
 
-    result_high = await webp_optimizer.optimize(data, OptimizationConfig(quality=40))
-    result_med = await webp_optimizer.optimize(data, OptimizationConfig(quality=60))
+    result_high = await webp_optimizer.optimize(data, cfg(quality=40))
+    result_med = await webp_optimizer.optimize(data, cfg(quality=60))
 
     assert result_high.method in (
         "pillow-m4",
@@ -14,215 +14,129 @@ from optimizers.heic import HeicOptimizer
 from optimizers.svg import SvgOptimizer
 from optimizers.tiff import TiffOptimizer
 from optimizers.webp import WebpOptimizer
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
-# --- AVIF Optimizer ---
+# Shared configs — OptimizationConfig is a validated pydantic model and is never
+# mutated by optimizers, so one instance per combination serves the whole module.
+CFG_STRIP = cfg(strip_metadata=True)
+CFG_NO_STRIP = cfg(strip_metadata=False)
+CFG_Q60 = cfg(quality=60)
+CFG_Q80 = cfg(quality=80)
+CFG_Q60_STRIP = cfg(quality=60, strip_metadata=True)
+CFG_Q60_NO_STRIP = cfg(quality=60, strip_metadata=False)
+CFG_Q80_STRIP = cfg(quality=80, strip_metadata=True)
+CFG_Q80_NO_STRIP = cfg(quality=80, strip_metadata=False)
 
+# --- AVIF / HEIC Optimizers (shared metadata-strip + re-encode pipeline) ---
 
-@pytest.fixture
-def avif_optimizer():
-    return AvifOptimizer()
+
+@pytest.fixture(
+    params=[(AvifOptimizer, "avif-reencode"), (HeicOptimizer, "heic-reencode")],
+    ids=["avif", "heic"],
+)
+def iso_optimizer(request):
+    """Optimizer instance plus its re-encode method name; AVIF and HEIC mirror each other."""
+    cls, reencode_method = request.param
+    return cls(), reencode_method
 
 
 def _mock_img():
     """Create a mock Pillow Image for decode-once tests."""
-    img = MagicMock(spec=Image.Image)
-    img.info = {}
-    img.size = (100, 100)  # Small image — uses parallel path in optimizers
-    img.copy.return_value = MagicMock(spec=Image.Image)
-    img.copy.return_value.info = {}
-    img.copy.return_value.size = (100, 100)
+    # Small image — uses parallel path in optimizers
+    copy = MagicMock(spec=Image.Image, info={}, size=(100, 100))
+    img = MagicMock(spec=Image.Image, info={}, size=(100, 100), **{"copy.return_value": copy})
     return img
 
 
 @pytest.mark.asyncio
-async def test_avif_no_strip_metadata(avif_optimizer):
+async def test_iso_no_strip_metadata(iso_optimizer):
     """strip_metadata=False -> returns original."""
-    data = b"fake avif data"
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(
-            avif_optimizer, "_reencode_from_img", return_value=b"larger than original data"
-        ):
-            result = await avif_optimizer.optimize(data, OptimizationConfig(strip_metadata=False))
+    opt, _ = iso_optimizer
+    data = b"fake image data"
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
+        with patch.object(opt, "_reencode_from_img", return_value=b"larger than original data"):
+            result = await opt.optimize(data, CFG_NO_STRIP)
     assert result.method == "none"
     assert result.optimized_bytes == data
 
 
 @pytest.mark.asyncio
-async def test_avif_strip_metadata_failure(avif_optimizer):
+async def test_iso_strip_metadata_failure(iso_optimizer):
     """Metadata stripping exception -> returns original."""
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(
-            avif_optimizer, "_strip_metadata_from_img", side_effect=Exception("decode error")
-        ):
-            with patch.object(avif_optimizer, "_reencode_from_img", side_effect=Exception("fail")):
-                result = await avif_optimizer.optimize(
-                    b"fake", OptimizationConfig(strip_metadata=True)
-                )
+    opt, _ = iso_optimizer
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
+        with patch.object(opt, "_strip_metadata_from_img", side_effect=Exception("decode error")):
+            with patch.object(opt, "_reencode_from_img", side_effect=Exception("fail")):
+                result = await opt.optimize(b"fake", CFG_STRIP)
     assert result.method == "none"
 
 
 @pytest.mark.asyncio
-async def test_avif_strip_metadata_success(avif_optimizer):
+async def test_iso_strip_metadata_success(iso_optimizer):
     """Successful metadata strip -> smaller output."""
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(avif_optimizer, "_strip_metadata_from_img", return_value=b"small"):
-            with patch.object(
-                avif_optimizer, "_reencode_from_img", return_value=b"larger original data"
-            ):
-                result = await avif_optimizer.optimize(
-                    b"larger original", OptimizationConfig(strip_metadata=True)
-                )
+    opt, _ = iso_optimizer
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
+        with patch.object(opt, "_strip_metadata_from_img", return_value=b"small"):
+            with patch.object(opt, "_reencode_from_img", return_value=b"larger original data"):
+                result = await opt.optimize(b"larger original", CFG_STRIP)
     assert result.method == "metadata-strip"
 
 
 @pytest.mark.asyncio
-async def test_avif_strip_metadata_larger(avif_optimizer):
+async def test_iso_strip_metadata_larger(iso_optimizer):
     """Metadata strip produces larger output -> returns original."""
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
+    opt, _ = iso_optimizer
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
         with patch.object(
-            avif_optimizer,
+            opt,
             "_strip_metadata_from_img",
             return_value=b"this is even larger than the original",
         ):
             with patch.object(
-                avif_optimizer,
+                opt,
                 "_reencode_from_img",
                 return_value=b"also larger than original",
             ):
-                result = await avif_optimizer.optimize(
-                    b"short", OptimizationConfig(strip_metadata=True)
-                )
-    assert result.method == "none"
-
-
-@pytest.mark.asyncio
-async def test_avif_reencode_success(avif_optimizer):
-    """Re-encoding produces smaller output."""
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(avif_optimizer, "_reencode_from_img", return_value=b"small"):
-            result = await avif_optimizer.optimize(
-                b"larger original avif", OptimizationConfig(quality=60, strip_metadata=False)
-            )
-    assert result.method == "avif-reencode"
-
-
-@pytest.mark.asyncio
-async def test_avif_reencode_beats_strip(avif_optimizer):
-    """Re-encoding smaller than metadata strip -> picks reencode.
-
-    Uses quality=60 because quality >= 70 + strip_metadata skips reencode.
-    """
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
-        with (
-            patch.object(avif_optimizer, "_strip_metadata_from_img", return_value=b"medium_size"),
-            patch.object(avif_optimizer, "_reencode_from_img", return_value=b"tiny"),
-        ):
-            result = await avif_optimizer.optimize(
-                b"original avif data here",
-                OptimizationConfig(quality=60, strip_metadata=True),
-            )
-    assert result.method == "avif-reencode"
-
-
-@pytest.mark.asyncio
-async def test_avif_both_fail(avif_optimizer):
-    """Both strip and reencode fail -> returns original."""
-    with patch.object(avif_optimizer, "_open_image", return_value=_mock_img()):
-        with (
-            patch.object(avif_optimizer, "_strip_metadata_from_img", side_effect=Exception("fail")),
-            patch.object(avif_optimizer, "_reencode_from_img", side_effect=Exception("fail")),
-        ):
-            result = await avif_optimizer.optimize(
-                b"original", OptimizationConfig(strip_metadata=True)
-            )
-    assert result.method == "none"
-
-
-# --- HEIC Optimizer ---
-
-
-@pytest.fixture
-def heic_optimizer():
-    return HeicOptimizer()
-
-
-@pytest.mark.asyncio
-async def test_heic_no_strip_metadata(heic_optimizer):
-    with patch.object(heic_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(
-            heic_optimizer, "_reencode_from_img", return_value=b"larger than original data"
-        ):
-            result = await heic_optimizer.optimize(
-                b"fake heic", OptimizationConfig(strip_metadata=False)
-            )
-    assert result.method == "none"
-
-
-@pytest.mark.asyncio
-async def test_heic_strip_metadata_failure(heic_optimizer):
-    with patch.object(heic_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(
-            heic_optimizer, "_strip_metadata_from_img", side_effect=Exception("error")
-        ):
-            with patch.object(heic_optimizer, "_reencode_from_img", side_effect=Exception("fail")):
-                result = await heic_optimizer.optimize(
-                    b"fake", OptimizationConfig(strip_metadata=True)
-                )
+                result = await opt.optimize(b"short", CFG_STRIP)
     assert result.method == "none"
 
 
 @pytest.mark.asyncio
-async def test_heic_strip_metadata_success(heic_optimizer):
-    with patch.object(heic_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(heic_optimizer, "_strip_metadata_from_img", return_value=b"sm"):
-            with patch.object(heic_optimizer, "_reencode_from_img", return_value=b"larger output"):
-                result = await heic_optimizer.optimize(
-                    b"larger", OptimizationConfig(strip_metadata=True)
-                )
-    assert result.method == "metadata-strip"
-
-
-@pytest.mark.asyncio
-async def test_heic_reencode_success(heic_optimizer):
+async def test_iso_reencode_success(iso_optimizer):
     """Re-encoding produces smaller output."""
-    with patch.object(heic_optimizer, "_open_image", return_value=_mock_img()):
-        with patch.object(heic_optimizer, "_reencode_from_img", return_value=b"small"):
-            result = await heic_optimizer.optimize(
-                b"larger original heic", OptimizationConfig(quality=60, strip_metadata=False)
-            )
-    assert result.method == "heic-reencode"
+    opt, reencode_method = iso_optimizer
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
+        with patch.object(opt, "_reencode_from_img", return_value=b"small"):
+            result = await opt.optimize(b"larger original image", CFG_Q60_NO_STRIP)
+    assert result.method == reencode_method
 
 
 @pytest.mark.asyncio
-async def test_heic_reencode_beats_strip(heic_optimizer):
+async def test_iso_reencode_beats_strip(iso_optimizer):
     """Re-encoding smaller than metadata strip -> picks reencode.
 
     Uses quality=60 because quality >= 70 + strip_metadata skips reencode.
     """
-    with patch.object(heic_optimizer, "_open_image", return_value=_mock_img()):
+    opt, reencode_method = iso_optimizer
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
         with (
-            patch.object(heic_optimizer, "_strip_metadata_from_img", return_value=b"medium_size"),
-            patch.object(heic_optimizer, "_reencode_from_img", return_value=b"tiny"),
+            patch.object(opt, "_strip_metadata_from_img", return_value=b"medium_size"),
+            patch.object(opt, "_reencode_from_img", return_value=b"tiny"),
         ):
-            result = await heic_optimizer.optimize(
-                b"original heic data here",
-                OptimizationConfig(quality=60, strip_metadata=True),
-            )
-    assert result.method == "heic-reencode"
+            result = await opt.optimize(b"original image data here", CFG_Q60_STRIP)
+    assert result.method == reencode_method
 
 
 @pytest.mark.asyncio
-async def test_heic_both_fail(heic_optimizer):
+async def test_iso_both_fail(iso_optimizer):
     """Both strip and reencode fail -> returns original."""
-    with patch.object(heic_optimizer, "_open_image", return_value=_mock_img()):
+    opt, _ = iso_optimizer
+    with patch.object(opt, "_open_image", return_value=_mock_img()):
         with (
-            patch.object(heic_optimizer, "_strip_metadata_from_img", side_effect=Exception("fail")),
-            patch.object(heic_optimizer, "_reencode_from_img", side_effect=Exception("fail")),
+            patch.object(opt, "_strip_metadata_from_img", side_effect=Exception("fail")),
+            patch.object(opt, "_reencode_from_img", side_effect=Exception("fail")),
         ):
-            result = await heic_optimizer.optimize(
-                b"original", OptimizationConfig(strip_metadata=True)
-            )
+            result = await opt.optimize(b"original", CFG_STRIP)
     assert result.method == "none"
 
 
@@ -241,7 +155,7 @@ async def test_webp_pillow_optimization(webp_optimizer):
     buf = io.BytesIO()
     img.save(buf, format="WEBP", quality=95)
     data = buf.getvalue()
-    result = await webp_optimizer.optimize(data, OptimizationConfig(quality=60))
+    result = await webp_optimizer.optimize(data, CFG_Q60)
     assert result.success
     assert result.optimized_size <= result.original_size
 
@@ -253,7 +167,7 @@ async def test_webp_max_reduction_cap(webp_optimizer):
     buf = io.BytesIO()
     img.save(buf, format="WEBP", quality=95)
     data = buf.getvalue()
-    result = await webp_optimizer.optimize(data, OptimizationConfig(quality=60, max_reduction=5.0))
+    result = await webp_optimizer.optimize(data, cfg(quality=60, max_reduction=5.0))
     assert result.success
 
 
@@ -264,7 +178,7 @@ async def test_webp_max_reduction_no_quality_works(webp_optimizer):
     buf = io.BytesIO()
     img.save(buf, format="WEBP", quality=95)
     data = buf.getvalue()
-    result = await webp_optimizer.optimize(data, OptimizationConfig(quality=60, max_reduction=0.01))
+    result = await webp_optimizer.optimize(data, cfg(quality=60, max_reduction=0.01))
     assert result.success
     # Should either return original or very close to original
 
@@ -292,29 +206,19 @@ def gif_optimizer():
 
 @pytest.mark.asyncio
 @pytest.mark.skipif(not shutil.which("gifsicle"), reason="gifsicle not installed")
-async def test_gif_lossless(gif_optimizer, sample_gif):
-    """quality>=70: lossless gifsicle."""
-    result = await gif_optimizer.optimize(sample_gif, OptimizationConfig(quality=80))
-    assert result.success
-    assert result.method == "gifsicle"
-
-
-@pytest.mark.asyncio
-@pytest.mark.skipif(not shutil.which("gifsicle"), reason="gifsicle not installed")
-async def test_gif_lossy_moderate(gif_optimizer, sample_gif):
-    """quality 50-69: --lossy=30."""
-    result = await gif_optimizer.optimize(sample_gif, OptimizationConfig(quality=60))
+@pytest.mark.parametrize(
+    "quality,expected_method",
+    [
+        pytest.param(80, "gifsicle", id="lossless"),
+        pytest.param(60, "gifsicle --lossy=30 --colors=192", id="moderate"),
+        pytest.param(30, "gifsicle --lossy=80 --colors=128", id="aggressive"),
+    ],
+)
+async def test_gif_quality_tier(gif_optimizer, sample_gif, quality, expected_method):
+    """quality>=70 lossless, 50-69 --lossy=30, <50 --lossy=80."""
+    result = await gif_optimizer.optimize(sample_gif, cfg(quality=quality))
     assert result.success
-    assert result.method == "gifsicle --lossy=30 --colors=192"
-
-
-@pytest.mark.asyncio
-@pytest.mark.skipif(not shutil.which("gifsicle"), reason="gifsicle not installed")
-async def test_gif_lossy_aggressive(gif_optimizer, sample_gif):
-    """quality<50: --lossy=80."""
-    result = await gif_optimizer.optimize(sample_gif, OptimizationConfig(quality=30))
-    assert result.success
-    assert result.method == "gifsicle --lossy=80 --colors=128"
+    assert result.method == expected_method
 
 
 # --- SVG Optimizer ---
@@ -326,25 +230,20 @@ def svg_optimizer():
 
 
 @pytest.mark.asyncio
-async def test_svg_lossless(svg_optimizer, sample_svg):
-    """quality>=70: gentle scour."""
-    result = await svg_optimizer.optimize(sample_svg, OptimizationConfig(quality=80))
-    assert result.success
-    assert result.method == "scour"
-
-
-@pytest.mark.asyncio
-async def test_svg_aggressive(svg_optimizer, sample_svg):
-    """quality<50: aggressive precision=3."""
-    result = await svg_optimizer.optimize(sample_svg, OptimizationConfig(quality=30))
-    assert result.success
-
-
-@pytest.mark.asyncio
-async def test_svg_moderate(svg_optimizer, sample_svg):
-    """quality 50-69: moderate precision=5."""
-    result = await svg_optimizer.optimize(sample_svg, OptimizationConfig(quality=60))
+@pytest.mark.parametrize(
+    "quality,expected_method",
+    [
+        pytest.param(80, "scour", id="lossless"),
+        pytest.param(60, None, id="moderate"),
+        pytest.param(30, None, id="aggressive"),
+    ],
+)
+async def test_svg_quality_tier(svg_optimizer, sample_svg, quality, expected_method):
+    """quality>=70 gentle scour, 50-69 precision=5, <50 precision=3."""
+    result = await svg_optimizer.optimize(sample_svg, cfg(quality=quality))
     assert result.success
+    if expected_method is not None:
+        assert result.method == expected_method
 
 
 @pytest.mark.asyncio
@@ -354,7 +253,7 @@ async def test_svgz_optimization(svg_optimizer):
         b'<svg xmlns="http://www.w3.org/2000/svg"><rect width="100" height="100" fill="red"/></svg>'
     )
     data = gzip.compress(svg)
-    result = await svg_optimizer.optimize(data, OptimizationConfig(quality=30))
+    result = await svg_optimizer.optimize(data, cfg(quality=30))
     assert result.success
     assert result.format == "svgz"
     # Output should be gzip compressed
@@ -365,48 +264,53 @@ async def test_svgz_optimization(svg_optimizer):
 async def test_svg_no_strip_metadata(svg_optimizer):
     """strip_metadata=False: still optimizes but without stripping."""
     svg = b'<svg xmlns="http://www.w3.org/2000/svg"><rect width="100" height="100"/></svg>'
-    result = await svg_optimizer.optimize(svg, OptimizationConfig(quality=80, strip_metadata=False))
+    result = await svg_optimizer.optimize(svg, CFG_Q80_NO_STRIP)
     assert result.success
 
 
 # --- TIFF Optimizer ---
 
 
-@pytest.fixture
-def tiff_optimizer():
-    return TiffOptimizer()
+@pytest.fixture(scope="module")
+def tiff_cache():
+    """Per-module cache of TIFF optimize runs — several tests share a config."""
+    return {}
+
+
+async def _tiff_optimize(cache, data, config):
+    """Memoized optimize: identical (quality, strip_metadata) runs happen once."""
+    key = (config.quality, config.strip_metadata)
+    if key not in cache:
+        cache[key] = await TiffOptimizer().optimize(data, config)
+    return cache[key]
 
 
 @pytest.mark.asyncio
-async def test_tiff_lossless(tiff_optimizer, sample_tiff):
+async def test_tiff_lossless(tiff_cache, sample_tiff):
     """quality>=70: lossless compression only."""
-    result = await tiff_optimizer.optimize(sample_tiff, OptimizationConfig(quality=80))
+    result = await _tiff_optimize(tiff_cache, sample_tiff, CFG_Q80)
     assert result.success
     assert result.method in ("tiff_adobe_deflate", "tiff_lzw", "none")
 
 
 @pytest.mark.asyncio
-async def test_tiff_lossy(tiff_optimizer, sample_tiff):
+async def test_tiff_lossy(tiff_cache, sample_tiff):
     """quality<70: tries JPEG-in-TIFF + lossless, picks smallest."""
-    result = await tiff_optimizer.optimize(sample_tiff, OptimizationConfig(quality=60))
+    result = await _tiff_optimize(tiff_cache, sample_tiff, CFG_Q60)
     assert result.success
 
 
 @pytest.mark.asyncio
-async def test_tiff_strip_metadata(tiff_optimizer, sample_tiff):
-    """Metadata stripping before optimization."""
-    result = await tiff_optimizer.optimize(
-        sample_tiff, OptimizationConfig(quality=80, strip_metadata=True)
-    )
+async def test_tiff_strip_metadata(tiff_cache, sample_tiff):
+    """Metadata stripping before optimization (same run as lossless — shared cache)."""
+    result = await _tiff_optimize(tiff_cache, sample_tiff, CFG_Q80_STRIP)
     assert result.success
 
 
 @pytest.mark.asyncio
-async def test_tiff_no_strip_metadata(tiff_optimizer, sample_tiff):
+async def test_tiff_no_strip_metadata(tiff_cache, sample_tiff):
     """No metadata stripping preserves EXIF/ICC."""
-    result = await tiff_optimizer.optimize(
-        sample_tiff, OptimizationConfig(quality=80, strip_metadata=False)
-    )
+    result = await _tiff_optimize(tiff_cache, sample_tiff, CFG_Q80_NO_STRIP)
     assert result.success
 
 
@@ -418,7 +322,7 @@ async def test_tiff_rgba():
     img.save(buf, format="TIFF")
     data = buf.getvalue()
     opt = TiffOptimizer()
-    result = await opt.optimize(data, OptimizationConfig(quality=60))
+    result = await opt.optimize(data, CFG_Q60)
     assert result.success
     assert result.method != "tiff_jpeg"
 
@@ -539,7 +443,7 @@ async def test_tiff_exif_preservation():
     img.save(buf, format="TIFF", exif=exif_bytes)
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=80, strip_metadata=False)
+    config = CFG_Q80_NO_STRIP
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
 
@@ -554,6 +458,6 @@ async def test_tiff_compression_failure():
     img.save(buf, format="TIFF")
     data = buf.getvalue()
 
-    config = OptimizationConfig(quality=40)
+    config = cfg(quality=40)
     result = await opt.optimize(data, config)
     assert result.original_size == len(data)
@@ -1,13 +1,14 @@
 """Tests for PillowReencodeOptimizer shared base class."""
 
 import io
+from functools import lru_cache
 from unittest.mock import patch
 
 import pytest
 from PIL import Image
 
 from optimizers.pillow_reencode import PillowReencodeOptimizer
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 from utils.format_detect import ImageFormat
 
 
@@ -26,6 +27,7 @@ class FakeReencodeOptimizer(PillowReencodeOptimizer):
         pass  # No plugin needed for PNG
 
 
+@lru_cache(maxsize=None)
 def _make_png(size=(100, 100), color=(128, 64, 32)):
     img = Image.new("RGB", size, color)
     buf = io.BytesIO()
@@ -42,7 +44,7 @@ def fake_optimizer():
 async def test_optimize_returns_valid_result(fake_optimizer):
     """optimize() returns a valid OptimizeResult."""
     data = _make_png()
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await fake_optimizer.optimize(data, config)
     assert result.success
     assert result.optimized_size <= result.original_size
@@ -52,7 +54,7 @@ async def test_optimize_returns_valid_result(fake_optimizer):
 async def test_optimize_with_metadata_strip(fake_optimizer):
     """Both strip and reencode run when strip_metadata=True."""
     data = _make_png()
-    config = OptimizationConfig(quality=60, strip_metadata=True)
+    config = cfg(quality=60, strip_metadata=True)
     result = await fake_optimizer.optimize(data, config)
     assert result.success
     assert result.method in ("test-strip", "test-reencode", "none")
@@ -62,7 +64,7 @@ async def test_optimize_with_metadata_strip(fake_optimizer):
 async def test_optimize_without_metadata_strip(fake_optimizer):
     """Only reencode runs when strip_metadata=False."""
     data = _make_png()
-    config = OptimizationConfig(quality=60, strip_metadata=False)
+    config = cfg(quality=60, strip_metadata=False)
     result = await fake_optimizer.optimize(data, config)
     assert result.success
     assert result.method in ("test-reencode", "none")
@@ -72,7 +74,7 @@ async def test_optimize_without_metadata_strip(fake_optimizer):
 async def test_optimize_both_fail_returns_none(fake_optimizer):
     """When both methods fail, returns method='none'."""
     data = _make_png()
-    config = OptimizationConfig(quality=60, strip_metadata=True)
+    config = cfg(quality=60, strip_metadata=True)
 
     with patch.object(fake_optimizer, "_strip_metadata", side_effect=Exception("fail")):
         with patch.object(fake_optimizer, "_reencode", side_effect=Exception("fail")):
@@ -107,7 +109,7 @@ def test_reencode_uses_clamped_quality(fake_optimizer):
 async def test_optimize_decodes_image_once(fake_optimizer):
     """optimize() should call _open_image exactly once, not once per method."""
     data = _make_png()
-    config = OptimizationConfig(quality=60, strip_metadata=True)
+    config = cfg(quality=60, strip_metadata=True)
 
     with patch.object(fake_optimizer, "_open_image", wraps=fake_optimizer._open_image) as mock_open:
         result = await fake_optimizer.optimize(data, config)
@@ -120,7 +122,7 @@ async def test_optimize_decodes_image_once(fake_optimizer):
 async def test_optimize_decodes_once_without_strip(fake_optimizer):
     """optimize() with strip_metadata=False still decodes only once."""
     data = _make_png()
-    config = OptimizationConfig(quality=60, strip_metadata=False)
+    config = cfg(quality=60, strip_metadata=False)
 
     with patch.object(fake_optimizer, "_open_image", wraps=fake_optimizer._open_image) as mock_open:
         result = await fake_optimizer.optimize(data, config)
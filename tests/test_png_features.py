@@ -84,11 +84,19 @@ class TestHappyPathModes:
         assert feat is not None
         assert abs(feat.input_bpp - 8.0) < 1e-9
 
-    def test_rgba_has_alpha(self):
-        img = _make_rgba()
-        feat = extract_png_features(img, 32, 32, quality=60)
+    @pytest.mark.parametrize(
+        "maker,expected_alpha",
+        [
+            pytest.param(_make_rgba, True, id="rgba"),
+            pytest.param(_make_la, True, id="la"),
+            pytest.param(lambda: _make_palette(with_trns=False), False, id="palette"),
+            pytest.param(lambda: _make_palette(with_trns=True), True, id="palette-trns"),
+        ],
+    )
+    def test_mode_alpha_flag(self, maker, expected_alpha):
+        feat = extract_png_features(maker(), 32, 32, quality=80)
         assert feat is not None
-        assert feat.has_alpha is True
+        assert feat.has_alpha is expected_alpha
 
     def test_l_mode(self):
         img = _make_l()
@@ -98,24 +106,6 @@ class TestHappyPathModes:
         # Gradient should produce non-zero Sobel
         assert feat.mean_sobel > 0
 
-    def test_la_mode_has_alpha(self):
-        img = _make_la()
-        feat = extract_png_features(img, 32, 32, quality=80)
-        assert feat is not None
-        assert feat.has_alpha is True
-
-    def test_palette_without_trns(self):
-        img = _make_palette(with_trns=False)
-        feat = extract_png_features(img, 32, 32, quality=80)
-        assert feat is not None
-        assert feat.has_alpha is False
-
-    def test_palette_with_trns_has_alpha(self):
-        img = _make_palette(with_trns=True)
-        feat = extract_png_features(img, 32, 32, quality=80)
-        assert feat is not None
-        assert feat.has_alpha is True
-
 
 # ---------------------------------------------------------------------------
 # Unsupported mode → None
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import struct
+from functools import lru_cache
 
 import pytest
 
@@ -15,13 +16,17 @@ from estimation.png_header import PngHeader, parse_png_header
 _PNG_SIG = b"\x89PNG\r\n\x1a\n"
 
 
+@lru_cache(maxsize=None)
 def _make_png_header(
     width: int = 100,
     height: int = 80,
     bit_depth: int = 8,
     color_type: int = 2,  # RGB
 ) -> bytes:
-    """Build a synthetic 33-byte PNG header (signature + IHDR chunk)."""
+    """Build a synthetic 33-byte PNG header (signature + IHDR chunk).
+
+    Memoized — returns shared immutable bytes, so repeated tests hit a dict lookup.
+    """
     ihdr_data = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
     # IHDR chunk: length(4) + type(4) + data(13) + CRC(4) = 25 bytes
     length = struct.pack(">I", 13)
@@ -106,64 +111,57 @@ class TestValidHeaders:
 # ---------------------------------------------------------------------------
 
 
-class TestInvalidHeaders:
-    def test_too_short_returns_none(self):
-        data = b"\x89PNG\r\n\x1a\n" + b"\x00" * 10  # only 18 bytes
-        assert parse_png_header(data) is None
-
-    def test_empty_returns_none(self):
-        assert parse_png_header(b"") is None
+def _corrupt_ihdr_type() -> bytes:
+    # Overwrite bytes 12-15 (IHDR type) with garbage
+    data_ba = bytearray(_make_png_header())
+    data_ba[12:16] = b"XXXX"
+    return bytes(data_ba)
 
-    def test_exactly_32_bytes_returns_none(self):
-        data = _make_png_header()[:32]
-        assert parse_png_header(data) is None
 
-    def test_wrong_signature_returns_none(self):
-        bad = b"\x89PNX\r\n\x1a\n" + b"\x00" * 25
-        assert parse_png_header(bad) is None
+def _corrupt_ihdr_length() -> bytes:
+    # Overwrite chunk length (bytes 8-11) with 14
+    data_ba = bytearray(_make_png_header())
+    data_ba[8:12] = struct.pack(">I", 14)
+    return bytes(data_ba)
 
-    def test_all_zeros_returns_none(self):
-        assert parse_png_header(b"\x00" * 33) is None
 
-    def test_wrong_ihdr_type_returns_none(self):
-        data = _make_png_header()
-        # Overwrite bytes 12-15 (IHDR type) with garbage
-        data_ba = bytearray(data)
-        data_ba[12:16] = b"XXXX"
-        assert parse_png_header(bytes(data_ba)) is None
-
-    def test_ihdr_length_not_13_returns_none(self):
-        data = _make_png_header()
-        data_ba = bytearray(data)
-        # Overwrite chunk length (bytes 8-11) with 14
-        data_ba[8:12] = struct.pack(">I", 14)
-        assert parse_png_header(bytes(data_ba)) is None
-
-    def test_invalid_color_type_returns_none(self):
-        # color_type = 1 is not valid
-        data = _make_png_header(color_type=1)
-        assert parse_png_header(data) is None
-
-    def test_invalid_color_type_5_returns_none(self):
-        data = _make_png_header(color_type=5)
-        assert parse_png_header(data) is None
-
-    def test_invalid_bit_depth_returns_none(self):
-        data = _make_png_header(bit_depth=3)
-        assert parse_png_header(data) is None
-
-    def test_zero_width_returns_none(self):
-        data = _make_png_header(width=0)
-        assert parse_png_header(data) is None
-
-    def test_zero_height_returns_none(self):
-        data = _make_png_header(height=0)
-        assert parse_png_header(data) is None
-
-    def test_max_dimension_returns_none(self):
-        # 2^31 is exactly the threshold — should be rejected (>= check)
-        data = _make_png_header(width=2**31)
-        assert parse_png_header(data) is None
+class TestInvalidHeaders:
+    @pytest.mark.parametrize(
+        "build",
+        [
+            lambda: b"\x89PNG\r\n\x1a\n" + b"\x00" * 10,  # only 18 bytes
+            lambda: b"",
+            lambda: _make_png_header()[:32],
+            lambda: b"\x89PNX\r\n\x1a\n" + b"\x00" * 25,  # wrong signature
+            lambda: b"\x00" * 33,
+            _corrupt_ihdr_type,
+            _corrupt_ihdr_length,
+            lambda: _make_png_header(color_type=1),  # color_type 1 is not valid
+            lambda: _make_png_header(color_type=5),
+            lambda: _make_png_header(bit_depth=3),
+            lambda: _make_png_header(width=0),
+            lambda: _make_png_header(height=0),
+            # 2^31 is exactly the threshold — should be rejected (>= check)
+            lambda: _make_png_header(width=2**31),
+        ],
+        ids=[
+            "too_short",
+            "empty",
+            "exactly_32_bytes",
+            "wrong_signature",
+            "all_zeros",
+            "wrong_ihdr_type",
+            "ihdr_length_not_13",
+            "invalid_color_type_1",
+            "invalid_color_type_5",
+            "invalid_bit_depth",
+            "zero_width",
+            "zero_height",
+            "max_dimension",
+        ],
+    )
+    def test_invalid_input_returns_none(self, build):
+        assert parse_png_header(build()) is None
 
     def test_large_but_valid_dimension(self):
         # 2^31 - 1 is the largest valid dimension
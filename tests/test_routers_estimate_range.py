@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import io
 import shutil
+from functools import lru_cache
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -24,6 +25,7 @@ def _copy_real_model(tmp_path: Path, filename: str) -> None:
 # ---------------------------------------------------------------------------
 
 
+@lru_cache(maxsize=None)
 def _make_large_png(width: int = 500, height: int = 500) -> bytes:
     import numpy as np
     from PIL import Image
@@ -36,6 +38,7 @@ def _make_large_png(width: int = 500, height: int = 500) -> bytes:
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_large_jpeg(width: int = 800, height: int = 600) -> bytes:
     import numpy as np
     from PIL import Image
@@ -489,7 +492,7 @@ async def test_multipart_header_only_returns_result_directly(
     assert resp.status_code == 200
     data = resp.json()
     assert data["path"] == "png_header_only"
-    assert data["estimated_reduction_percent"] == pytest.approx(40.0)
+    assert abs(data["estimated_reduction_percent"] - 40.0) <= 1e-6
 
     models_mod.load_png_header_model.cache_clear()
 
@@ -567,7 +570,7 @@ async def test_url_range_header_only_returns_result_directly(
     assert resp.status_code == 200
     data = resp.json()
     assert data["path"] == "png_header_only"
-    assert data["estimated_reduction_percent"] == pytest.approx(35.0)
+    assert abs(data["estimated_reduction_percent"] - 35.0) <= 1e-6
 
     models_mod.load_png_header_model.cache_clear()
 
@@ -2,6 +2,7 @@
 
 import io
 import json
+from functools import lru_cache
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -16,6 +17,7 @@ def client():
     return TestClient(app, raise_server_exceptions=False)
 
 
+@lru_cache(maxsize=None)
 def _make_png_bytes(size=(50, 50)):
     img = Image.new("RGB", size, (128, 64, 32))
     buf = io.BytesIO()
@@ -23,6 +25,7 @@ def _make_png_bytes(size=(50, 50)):
     return buf.getvalue()
 
 
+@lru_cache(maxsize=None)
 def _make_jpeg_bytes(size=(50, 50)):
     img = Image.new("RGB", size)
     buf = io.BytesIO()
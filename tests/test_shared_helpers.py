@@ -0,0 +1,40 @@
+"""Guard tests for the shared test-helper modules (tests/_cfg.py, tests/_headers.py).
+
+These helpers hand out shared, process-local objects (one per xdist worker);
+the tests below pin the invariants the rest of the suite relies on.
+"""
+
+import dataclasses
+
+import pytest
+
+from tests._cfg import cfg
+from tests._headers import jpeg_header, png_header
+
+
+def test_cfg_returns_shared_instance_per_kwargs():
+    """Equal kwarg combinations must resolve to the same cached instance."""
+    assert cfg(quality=60, png_lossy=True) is cfg(quality=60, png_lossy=True)
+    assert cfg(quality=60) is not cfg(quality=80)
+
+
+def test_cfg_defaults_match_explicit_defaults():
+    """cfg() with defaulted kwargs is semantically identical to spelling them out."""
+    assert cfg(quality=80) == cfg(quality=80, strip_metadata=True)
+
+
+def test_header_prototypes_are_frozen():
+    """Header clones must reject mutation so shared prototypes cannot be corrupted."""
+    header = jpeg_header(width=100)
+    assert header.width == 100
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        header.width = 200  # type: ignore[misc]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        png_header().width = 200  # type: ignore[misc]
+
+
+def test_header_clones_are_independent():
+    """replace() clones must not share identity with the module prototypes."""
+    assert jpeg_header() is not jpeg_header()
+    assert jpeg_header(progressive=True).progressive
+    assert not jpeg_header().progressive
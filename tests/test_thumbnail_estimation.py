@@ -1,19 +1,14 @@
 """Tests for the large-image thumbnail estimation path."""
 
-import io
-
 import pytest
-from PIL import Image
 
 from estimation.estimator import estimate_from_thumbnail
-from schemas import OptimizationConfig
+from tests._cfg import cfg
+from tests._img_cache import encoded
 
 
 def _make_jpeg(width: int, height: int, quality: int = 95) -> bytes:
-    img = Image.new("RGB", (width, height), color=(100, 150, 200))
-    buf = io.BytesIO()
-    img.save(buf, format="JPEG", quality=quality)
-    return buf.getvalue()
+    return encoded("JPEG", (width, height), (100, 150, 200), quality=quality)
 
 
 @pytest.mark.asyncio
@@ -28,7 +23,7 @@ async def test_thumbnail_estimation_returns_valid_result():
         original_file_size=len(original_data),
         original_width=3000,
         original_height=2000,
-        config=OptimizationConfig(quality=40),
+        config=cfg(quality=40),
     )
     assert result.original_format == "jpeg"
     assert result.original_size == len(original_data)
@@ -48,7 +43,7 @@ async def test_thumbnail_estimation_confidence_is_medium():
         original_file_size=len(original_data),
         original_width=3000,
         original_height=2000,
-        config=OptimizationConfig(quality=40),
+        config=cfg(quality=40),
     )
     assert result.confidence == "medium"
     assert result.estimated_optimized_size <= result.original_size
@@ -44,6 +44,7 @@ async def test_run_tool_stdin():
     assert stdout == b"input data"
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_run_tool_timeout():
     """Tool timeout -> ToolTimeoutError."""
@@ -37,6 +37,11 @@ MIME_TYPES = {
 }
 
 
+# Pre-compiled big-endian uint32 reader shared by the chunk/box scanners below;
+# unpack_from avoids both the per-call format-string parse and the slice copy.
+_UINT32 = struct.Struct(">I")
+
+
 def detect_format(data: bytes) -> ImageFormat:
     """Detect image format from magic bytes.
 
@@ -134,7 +139,7 @@ def is_apng(data: bytes) -> bool:
             data
         ):  # pragma: no cover — unreachable: while guard ensures offset+8 <= len
             break  # pragma: no cover
-        chunk_length = struct.unpack(">I", data[offset : offset + 4])[0]
+        chunk_length = _UINT32.unpack_from(data, offset)[0]
         chunk_type = data[offset + 4 : offset + 8]
 
         if chunk_type == b"acTL":
@@ -175,7 +180,7 @@ def _detect_isobmff(data: bytes) -> ImageFormat:
         return ImageFormat.HEIC
 
     # Check compatible brands list if major brand doesn't match
-    box_size = struct.unpack(">I", data[:4])[0]
+    box_size = _UINT32.unpack_from(data)[0]
     # Clamp to available data
     box_end = min(box_size, len(data))
     offset = 16  # Skip size + ftyp + major_brand + minor_version
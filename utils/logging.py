@@ -17,19 +17,23 @@ class StructuredFormatter(logging.Formatter):
     - context: Additional structured data
     """
 
+    # Keyed by levelno: an int dict lookup per record instead of going through
+    # the levelname string. Cloud Logging names happen to match Python's.
     SEVERITY_MAP = {
-        "DEBUG": "DEBUG",
-        "INFO": "INFO",
-        "WARNING": "WARNING",
-        "ERROR": "ERROR",
-        "CRITICAL": "CRITICAL",
+        logging.DEBUG: "DEBUG",
+        logging.INFO: "INFO",
+        logging.WARNING: "WARNING",
+        logging.ERROR: "ERROR",
+        logging.CRITICAL: "CRITICAL",
     }
 
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "severity": self.SEVERITY_MAP.get(record.levelname, "DEFAULT"),
+            "severity": self.SEVERITY_MAP.get(record.levelno, "DEFAULT"),
             "message": record.getMessage(),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # record.created is the record's own timestamp — no second clock
+            # read, and the logged time matches when the event happened.
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
         }
 
         if hasattr(record, "request_id"):
@@ -41,7 +45,8 @@ class StructuredFormatter(logging.Formatter):
         if record.exc_info and record.exc_info[0]:
             log_entry["traceback"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_entry)
+        # Compact separators: fewer bytes per line on a per-request hot path
+        return json.dumps(log_entry, separators=(",", ":"))
 
 
 def setup_logging() -> logging.Logger:
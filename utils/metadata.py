@@ -10,6 +10,10 @@ _ORIENTATION_TAG = 0x0112
 # EXIF IFD pointers to strip entirely
 _GPS_IFD = 0x8825
 
+# Pre-compiled big-endian uint32 reader for the PNG chunk walk below;
+# unpack_from avoids both the per-chunk format-string parse and the slice copy.
+_UINT32 = struct.Struct(">I")
+
 
 def strip_metadata_selective(
     data: bytes,
@@ -90,25 +94,37 @@ def _strip_png_metadata(data: bytes, preserve_icc: bool) -> bytes:
     if not preserve_icc:
         strip_types.add(b"iCCP")
 
-    output = bytearray(data[:8])  # PNG signature
+    # Fast path: one C-level substring scan per tag (memchr under the hood).
+    # A miss proves there is nothing to strip, so the input is returned without
+    # copying a byte. A hit can be a false positive inside compressed IDAT data,
+    # so it only routes into the exact chunk walk below.
+    if not any(tag in data for tag in strip_types):
+        return data
+
+    output = bytearray()
+    keep_start = 0  # start of the current run of kept bytes (includes signature)
     offset = 8
+    data_len = len(data)
 
-    while offset + 8 <= len(data):
-        chunk_length = struct.unpack(">I", data[offset : offset + 4])[0]
+    while offset + 8 <= data_len:
+        chunk_length = _UINT32.unpack_from(data, offset)[0]
         chunk_type = data[offset + 4 : offset + 8]
         # Full chunk: length(4) + type(4) + data(chunk_length) + CRC(4)
         chunk_end = offset + 4 + 4 + chunk_length + 4
 
-        if chunk_end > len(data):
-            # Incomplete chunk — keep remaining data as-is
-            output.extend(data[offset:])
+        if chunk_end > data_len:
+            # Incomplete chunk — keep remaining data as-is (tail flush below)
             break
 
-        if chunk_type not in strip_types:
-            output.extend(data[offset:chunk_end])
+        if chunk_type in strip_types:
+            # Flush the run of kept chunks preceding this one; runs coalesce, so
+            # the rebuild costs one copy per stripped chunk, not one per chunk.
+            output.extend(data[keep_start:offset])
+            keep_start = chunk_end
 
         offset = chunk_end
 
+    output.extend(data[keep_start:])
     return bytes(output)
 
 
@@ -1,6 +1,8 @@
 import asyncio
 import contextvars
+import shutil
 import time
+from functools import cache
 from typing import Callable
 
 from config import settings
@@ -18,6 +20,17 @@ run_tool_probe: contextvars.ContextVar[RunToolProbe | None] = contextvars.Contex
 )
 
 
+@cache
+def tool_available(binary: str) -> bool:
+    """Whether a CLI tool is on PATH, cached for the life of the process.
+
+    Lets best-effort callers skip a doomed fork/exec attempt when an optional
+    tool (e.g. jpegtran) is not installed. Tools cannot appear or disappear
+    mid-process in the container image, so caching the lookup is safe.
+    """
+    return shutil.which(binary) is not None
+
+
 async def run_tool(
     cmd: list[str],
     input_data: bytes,